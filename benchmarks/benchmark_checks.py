@@ -0,0 +1,388 @@
+"""
+    Benchmarks of the checks on synthetic granules.
+
+    Each check on one granule is timed at several numbers of variables, and
+    each collection check at several numbers of granules. The results are
+    written to a json file, which can be compared with the one of a previous
+    run to find performance regressions:
+
+        python -m benchmarks.benchmark_checks --output reports/benchmark.json
+        python -m benchmarks.benchmark_checks --baseline reports/benchmark.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from osgeo import gdal
+from diwg_dataset.common.dataset_handle_pool import DatasetHandlePool
+from diwg_dataset.common.dataset_metadata_snapshot import DatasetMetadataSnapshot
+from diwg_dataset.data.dataset_collection_not_a_number_value import (
+    DatasetCollectionNotANumberValue
+)
+from diwg_dataset.data.dataset_not_a_number_value import DatasetNotANumberValue
+from diwg_dataset.dataname.filename_dataset_adopt_semantically_rich_dataset_release_identifiers import (
+    FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers
+)
+from diwg_dataset.dataname.filename_dataset_collection_adopt_semantically_rich_dataset_release_identifiers import (
+    FilenameDatasetCollectionAdoptSemanticallyRichDatasetReleaseIdentifiers
+)
+from diwg_dataset.dataname.filename_dataset_collection_date_time_information_in_granule_filenames import (
+    FilenameDatasetCollectionDateTimeInformationInGranuleFilenames
+)
+from diwg_dataset.dataname.filename_dataset_collection_ensure_granule_filename_uniqueness_across_different_dataset_releases import (
+    FilenameDatasetCollectionEnsureGranuleFilenameUniqueness
+)
+from diwg_dataset.dataname.filename_dataset_collection_standardize_file_extensions import (
+    FilenameDatasetCollectionStandardizeFileExtensions
+)
+from diwg_dataset.dataname.filename_dataset_date_time_information_in_granule_filenames import (
+    FilenameDatasetDateTimeInformationInGranuleFilenames
+)
+from diwg_dataset.dataname.filename_dataset_ensure_granule_filename_uniqueness_across_different_dataset_releases import (
+    FilenameDatasetEnsureGranuleFilenameUniqueness
+)
+from diwg_dataset.dataname.filename_dataset_standardize_file_extensions import (
+    FilenameDatasetStandardizeFileExtensions
+)
+from diwg_dataset.metadata.dataset_collection_data_packing import DatasetCollectionMetaPacking
+from diwg_dataset.metadata.dataset_collection_group_variable_attribute_name import (
+    DatasetCollectionGroupVariableAttributeName
+)
+from diwg_dataset.metadata.dataset_collection_include_georeference_information import (
+    DatasetCollectionIncludeGeoreferenceInformation
+)
+from diwg_dataset.metadata.dataset_collection_include_time_coord_in_swath import (
+    DatasetCollectionIncludeTimeCoordInSwath
+)
+from diwg_dataset.metadata.dataset_collection_keep_coordinate_values_in_coordinate_variables import (
+    DatasetCollectionKeepCoordValuesInCoordVariables
+)
+from diwg_dataset.metadata.dataset_collection_variable_physical_units import (
+    DatasetCollectionVariablePhysicalUnits
+)
+from diwg_dataset.metadata.dataset_collection_variable_units_consistency import (
+    DatasetCollectionVariableUnitsConsistency
+)
+from diwg_dataset.metadata.dataset_data_packing import DatasetMetaPacking
+from diwg_dataset.metadata.dataset_group_variable_attribute_name import (
+    DatasetGroupVariableAttributeName
+)
+from diwg_dataset.metadata.dataset_include_georeference_information import (
+    DatasetIncludeGeoreferenceInformation
+)
+from diwg_dataset.metadata.dataset_include_time_coord_in_swath import (
+    DatasetIncludeTimeCoordInSwath
+)
+from diwg_dataset.metadata.dataset_keep_coordinate_values_in_coordinate_variables import (
+    DatasetKeepCoordValuesInCoordVariables
+)
+from diwg_dataset.metadata.dataset_variable_physical_units import DatasetVariablePhysicalUnits
+from benchmarks.synthetic_granule import SyntheticGranule
+
+# patterns of the filename partitions of the synthetic granules
+_partitions = {
+    "dataset_id": r"^SYNTH_L2",
+    "dataset_crid": r"V[0-9]+\.[0-9]+\.[0-9]+",
+    "dataset_datetime": r"[0-9]{8}T[0-9]{6}",
+}
+_crid_partitions = {
+    "dataset_crid": _partitions["dataset_crid"],
+    "dataset_crid_major": r"V(?P<major>[0-9]+)",
+    "dataset_crid_minor": r"\.(?P<minor>[0-9]+)\.",
+    "dataset_crid_minor_group": "minor",
+    "dataset_crid_patch": r"\.(?P<patch>[0-9]+)$",
+}
+
+# (checker class, method name, kwargs) of the checks on one granule
+granule_cases = [
+    (DatasetGroupVariableAttributeName, "get_group_variable_attribute_names", {}),
+    (DatasetMetaPacking, "get_packing_metadata", {}),
+    (DatasetIncludeGeoreferenceInformation, "get_variables", {"georeference_mode": "band"}),
+    (DatasetIncludeGeoreferenceInformation, "get_variables",
+     {"georeference_mode": "multidim"}),
+    (DatasetIncludeTimeCoordInSwath, "get_variables_with_dims", {}),
+    (DatasetKeepCoordValuesInCoordVariables,
+     "get_coordinates_values_in_groups_variables_attributes", {}),
+    (DatasetVariablePhysicalUnits, "get_variable_units", {"units_mode": "band"}),
+    (DatasetVariablePhysicalUnits, "get_variable_units", {"units_mode": "multidim"}),
+    (DatasetNotANumberValue, "get_nan_values", {}),
+    (FilenameDatasetStandardizeFileExtensions, "get_dataname_extension", {}),
+    (FilenameDatasetStandardizeFileExtensions, "get_dataname_extension",
+     {"extension_mode": "signature"}),
+    (FilenameDatasetDateTimeInformationInGranuleFilenames,
+     "get_dataname_date_time_information", {}),
+    (FilenameDatasetEnsureGranuleFilenameUniqueness, "get_dataname_partitions", _partitions),
+    (FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers,
+     "get_dataname_crid_partitions", _crid_partitions),
+]
+
+# (collection class, method name, kwargs) of the checks on a collection
+collection_cases = [
+    (DatasetCollectionGroupVariableAttributeName, "get_group_variable_attribute_names", {}),
+    (DatasetCollectionMetaPacking, "get_packing_metadata", {}),
+    (DatasetCollectionIncludeGeoreferenceInformation, "get_variables", {}),
+    (DatasetCollectionIncludeTimeCoordInSwath, "get_variables_with_dims", {}),
+    (DatasetCollectionKeepCoordValuesInCoordVariables,
+     "get_coordinates_values_in_groups_variables_attributes", {}),
+    (DatasetCollectionVariablePhysicalUnits, "get_variable_units", {}),
+    (DatasetCollectionVariableUnitsConsistency, "get_units_consistency", {}),
+    (DatasetCollectionNotANumberValue, "get_nan_values", {}),
+    (FilenameDatasetCollectionStandardizeFileExtensions, "get_dataname_extension", {}),
+    (FilenameDatasetCollectionDateTimeInformationInGranuleFilenames,
+     "get_validate_dataname_date_time_information", {}),
+    (FilenameDatasetCollectionEnsureGranuleFilenameUniqueness,
+     "get_dataname_uniqueness", _partitions),
+    (FilenameDatasetCollectionAdoptSemanticallyRichDatasetReleaseIdentifiers,
+     "get_dataname_crid_partitions", _crid_partitions),
+]
+
+class DatasetBenchmark:
+    """
+        Time the checks on synthetic granules generated in a work directory.
+
+        The metadata snapshots are dropped before each run, so every run
+        reads the granules again (from the system file cache).
+    """
+    results_version = 1
+
+    def __init__(
+            self, workdir:str, repeat:int=3, swath:bool=False,
+            groups:int=0, attributes:int=2, dataset_workers:int=1,
+            keyword:str=None):
+        """
+            @param keyword: only run the cases whose name contains it.
+        """
+        self.workdir = workdir
+        self.repeat = repeat
+        self.swath = swath
+        self.groups = groups
+        self.attributes = attributes
+        self.dataset_workers = dataset_workers
+        self.keyword = keyword
+
+    def run_granule_checks(self, variables_points:list)->list:
+        """
+            Time the checks on one granule of each number of variables.
+            @return: list of results, see _time_case.
+        """
+        _the_ret = list()
+        for _the_variables in variables_points:
+            _the_generator = SyntheticGranule(
+                groups=self.groups, variables=_the_variables,
+                attributes=self.attributes, swath=self.swath)
+            _the_dir = os.path.join(self.workdir, f"granule_{_the_variables}")
+            os.makedirs(_the_dir, exist_ok=True)
+            _the_name = os.path.join(_the_dir, _the_generator.get_filename(0))
+            _the_generator.create(_the_name)
+            for _the_class, _the_method, _the_kwargs in granule_cases:
+                _the_result = self._time_case(
+                    "granule", _the_class, _the_method, _the_name, _the_kwargs)
+                if _the_result is not None:
+                    _the_result["variables"] = _the_variables
+                    _the_result["granules"] = 1
+                    _the_ret.append(_the_result)
+        return _the_ret
+
+    def run_collection_checks(
+            self, granules_points:list, variables:int=10)->list:
+        """
+            Time the collection checks on collections of each number of
+            granules.
+            @return: list of results, see _time_case.
+        """
+        _the_ret = list()
+        _the_generator = SyntheticGranule(
+            groups=self.groups, variables=variables,
+            attributes=self.attributes, swath=self.swath)
+        for _the_granules in granules_points:
+            _the_list = _the_generator.create_collection(
+                os.path.join(self.workdir, f"collection_{_the_granules}"),
+                _the_granules)
+            for _the_class, _the_method, _the_kwargs in collection_cases:
+                _the_kwargs = dict(_the_kwargs, dataset_workers=self.dataset_workers)
+                _the_result = self._time_case(
+                    "collection", _the_class, _the_method, _the_list, _the_kwargs)
+                if _the_result is not None:
+                    _the_result["variables"] = variables
+                    _the_result["granules"] = _the_granules
+                    _the_ret.append(_the_result)
+        return _the_ret
+
+    def _time_case(
+            self, scope:str, checker_class:type, method_name:str,
+            dataset_name:str, kwargs:dict)->dict:
+        """
+            Time repeated runs of one case.
+            @return: None if the case is filtered out, or
+            {
+                "scope": "granule",
+                "case": "DatasetMetaPacking.get_packing_metadata",
+                "kwargs": {},
+                "seconds": 0.021,
+                "mean_seconds": 0.023,
+                "repeat": 3,
+                "error": "error returned by the check, if any"
+            }
+            seconds is the fastest run.
+        """
+        _the_case = f"{checker_class.__name__}.{method_name}"
+        _the_options = {_k: _v for _k, _v in kwargs.items()
+                        if _k not in _partitions and _k not in _crid_partitions}
+        if _the_options:
+            _the_case = _the_case + "[" + ",".join(
+                f"{_k}={_v}" for _k, _v in sorted(_the_options.items())) + "]"
+        if self.keyword and self.keyword not in _the_case:
+            return None
+        _the_times = list()
+        _the_error = None
+        for _ in range(self.repeat):
+            DatasetMetadataSnapshot.clear()
+            DatasetHandlePool.clear()
+            _the_start = time.perf_counter()
+            try:
+                _the_ret = getattr(checker_class(), method_name)(dataset_name, **kwargs)
+                if isinstance(_the_ret, dict) and _the_ret.get("error"):
+                    _the_error = _the_ret["error"]
+            except Exception as err:
+                _the_error = str(err)
+            _the_times.append(time.perf_counter() - _the_start)
+        _the_result = {
+            "scope": scope, "case": _the_case, "kwargs": _the_options,
+            "seconds": min(_the_times),
+            "mean_seconds": sum(_the_times) / len(_the_times),
+            "repeat": self.repeat}
+        if _the_error:
+            _the_result["error"] = _the_error
+        print(f"{scope:10} {_the_case:90} {min(_the_times):10.4f} s", flush=True)
+        return _the_result
+
+    @classmethod
+    def get_environment(cls)->dict:
+        """
+            Versions and machine of the run, to tell comparable results.
+        """
+        return {
+            "python": platform.python_version(),
+            "gdal": gdal.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        }
+
+    @staticmethod
+    def compare(results:list, baseline:list, tolerance:float=1.2)->list:
+        """
+            Compare results with the ones of a baseline run.
+            @param tolerance: a case is a regression if it is slower than the
+                baseline by more than this factor.
+            @return: the cases in both runs, with their ratio to the baseline
+            [
+                {"scope": "granule", "case": "...", "variables": 10,
+                 "granules": 1, "seconds": 0.03, "baseline_seconds": 0.02,
+                 "ratio": 1.5, "regression": True}
+            ]
+        """
+        def _key(result):
+            return (result["scope"], result["case"],
+                    result["variables"], result["granules"])
+
+        _the_baseline = {_key(_r): _r for _r in baseline}
+        _the_ret = list()
+        for _r in results:
+            _the_base = _the_baseline.get(_key(_r))
+            if _the_base is None:
+                continue
+            _the_ratio = (_r["seconds"] / _the_base["seconds"]
+                          if _the_base["seconds"] > 0 else 1.0)
+            _the_ret.append({
+                "scope": _r["scope"], "case": _r["case"],
+                "variables": _r["variables"], "granules": _r["granules"],
+                "seconds": _r["seconds"],
+                "baseline_seconds": _the_base["seconds"],
+                "ratio": _the_ratio,
+                "regression": _the_ratio > tolerance})
+        return _the_ret
+
+def _get_points(value:str)->list:
+    return [int(_v) for _v in value.split(",") if _v.strip()]
+
+def main(argv:list=None)->int:
+    """
+        Run the benchmarks from the command line.
+        @return: exit status, 1 if a regression is found against the baseline.
+    """
+    _the_parser = argparse.ArgumentParser(
+        description="Time the checks on synthetic granules.")
+    _the_parser.add_argument("--variables", default="10,100,1000",
+                             help="numbers of variables of the granule checks. ")
+    _the_parser.add_argument("--granules", default="1,100,10000",
+                             help="numbers of granules of the collection checks. ")
+    _the_parser.add_argument("--collection-variables", type=int, default=10,
+                             help="number of variables of the collection granules. ")
+    _the_parser.add_argument("--groups", type=int, default=0,
+                             help="number of groups holding the variables. ")
+    _the_parser.add_argument("--attributes", type=int, default=2,
+                             help="number of extra attributes of each variable. ")
+    _the_parser.add_argument("--swath", action="store_true",
+                             help="swath granules instead of regular grids. ")
+    _the_parser.add_argument("--repeat", type=int, default=3,
+                             help="runs of each case; the fastest is kept. ")
+    _the_parser.add_argument("--dataset-workers", type=int, default=1,
+                             help="worker processes of the collection checks. ")
+    _the_parser.add_argument("-k", dest="keyword", default=None,
+                             help="only run the cases whose name contains this. ")
+    _the_parser.add_argument("--workdir", default=None,
+                             help="directory of the synthetic granules. Default: "
+                             "a temporary directory. ")
+    _the_parser.add_argument("--output", default=None,
+                             help="json file for the results. ")
+    _the_parser.add_argument("--baseline", default=None,
+                             help="json results of a previous run to compare with. ")
+    _the_parser.add_argument("--tolerance", type=float, default=1.2,
+                             help="slowdown factor reported as a regression. ")
+    _the_args = _the_parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as _the_tmp:
+        _the_bench = DatasetBenchmark(
+            _the_args.workdir or _the_tmp, repeat=_the_args.repeat,
+            swath=_the_args.swath, groups=_the_args.groups,
+            attributes=_the_args.attributes,
+            dataset_workers=_the_args.dataset_workers,
+            keyword=_the_args.keyword)
+        _the_results = _the_bench.run_granule_checks(
+            _get_points(_the_args.variables))
+        _the_results += _the_bench.run_collection_checks(
+            _get_points(_the_args.granules),
+            variables=_the_args.collection_variables)
+
+    _the_report = {
+        "version": DatasetBenchmark.results_version,
+        "environment": DatasetBenchmark.get_environment(),
+        "parameters": vars(_the_args),
+        "results": _the_results,
+    }
+    if _the_args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(_the_args.output)), exist_ok=True)
+        with open(_the_args.output, "w", encoding="utf-8") as _the_file:
+            json.dump(_the_report, _the_file, indent=2)
+
+    if not _the_args.baseline:
+        return 0
+    with open(_the_args.baseline, "r", encoding="utf-8") as _the_file:
+        _the_baseline = json.load(_the_file)
+    _the_comparison = DatasetBenchmark.compare(
+        _the_results, _the_baseline["results"], _the_args.tolerance)
+    _the_regressions = 0
+    for _c in _the_comparison:
+        _the_flag = "REGRESSION" if _c["regression"] else ""
+        print(f'{_c["scope"]:10} {_c["case"]:90} v={_c["variables"]:<5} '
+              f'g={_c["granules"]:<6} x{_c["ratio"]:6.2f} {_the_flag}')
+        _the_regressions += _c["regression"]
+    print(f"{_the_regressions} regressions in {len(_the_comparison)} cases "
+          f"(tolerance x{_the_args.tolerance})")
+    return 1 if _the_regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
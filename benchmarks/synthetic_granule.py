@@ -0,0 +1,190 @@
+"""
+    Synthetic granules for the benchmarks.
+
+    The granules are created with the GDAL multidimensional API (netCDF-4
+    driver), with a configurable number of groups, variables, attributes and
+    coordinates, in a swath or a regular grid layout.
+"""
+import os
+import shutil
+from datetime import datetime, timedelta
+import numpy as np
+from osgeo import gdal, osr
+
+class SyntheticGranule:
+    """
+        Generator of synthetic granules and collections of granules.
+
+        Grid granules have 1-D lat/lon coordinate variables, a time dimension
+        of size 1 and a "crs" grid mapping variable. Swath granules have 2-D
+        lat/lon and a time coordinate along the track. The data variables
+        are spread over the groups (the root group if there are none) and
+        have units, long_name, coordinates and _FillValue attributes; every
+        other variable is packed (scale_factor, add_offset).
+    """
+    # filename of the n-th granule of a collection
+    filename_format = "SYNTH_L2_{time:%Y%m%dT%H%M%S}_V{major}.{minor}.{patch}.nc"
+    # date-time of the first granule, and time between granules
+    start_time = datetime(2023, 5, 12)
+    time_step = timedelta(minutes=30)
+
+    def __init__(
+            self, groups:int=0, variables:int=10, attributes:int=2,
+            swath:bool=False, xsize:int=36, ysize:int=18,
+            nan_fraction:float=0.0):
+        """
+            @param groups: number of groups holding the data variables.
+            @param variables: number of data variables.
+            @param attributes: number of extra attributes of each variable.
+            @param swath: swath layout instead of regular grid.
+            @param xsize, ysize: size of the horizontal dimensions.
+            @param nan_fraction: fraction of the values of each variable set
+                to NaN (at the start of the variable).
+        """
+        self.groups = groups
+        self.variables = variables
+        self.attributes = attributes
+        self.swath = swath
+        self.xsize = xsize
+        self.ysize = ysize
+        self.nan_fraction = nan_fraction
+
+    def get_filename(self, index:int, release:tuple=(1, 0, 0))->str:
+        """
+            Filename of the index-th granule of a collection, e.g.
+            SYNTH_L2_20230512T003000_V1.0.0.nc
+        """
+        return self.filename_format.format(
+            time=self.start_time + index * self.time_step,
+            major=release[0], minor=release[1], patch=release[2])
+
+    def create(self, filename:str):
+        """
+            Create one granule file.
+        """
+        gdal.UseExceptions()
+        _the_driver = gdal.GetDriverByName("netCDF")
+        _the_ds = _the_driver.CreateMultiDimensional(filename)
+        _the_root = _the_ds.GetRootGroup()
+        _the_float = gdal.ExtendedDataType.Create(gdal.GDT_Float32)
+        _the_double = gdal.ExtendedDataType.Create(gdal.GDT_Float64)
+        _the_root.CreateAttribute(
+            "Conventions", [], gdal.ExtendedDataType.CreateString()).Write("CF-1.10")
+
+        if self.swath:
+            _the_y = _the_root.CreateDimension(
+                "along_track", gdal.DIM_TYPE_HORIZONTAL_Y, None, self.ysize)
+            _the_x = _the_root.CreateDimension(
+                "cross_track", gdal.DIM_TYPE_HORIZONTAL_X, None, self.xsize)
+            self._create_coordinate(
+                _the_root, "time", [_the_y], _the_double,
+                "seconds since 1993-01-01 00:00:00",
+                np.arange(self.ysize, dtype="f8"))
+            _the_lats, _the_lons = np.meshgrid(
+                np.linspace(-60, 60, self.ysize), np.linspace(-120, 120, self.xsize),
+                indexing="ij")
+            self._create_coordinate(
+                _the_root, "lat", [_the_y, _the_x], _the_float,
+                "degrees_north", _the_lats.astype("f4"))
+            self._create_coordinate(
+                _the_root, "lon", [_the_y, _the_x], _the_float,
+                "degrees_east", _the_lons.astype("f4"))
+            _the_dims = [_the_y, _the_x]
+            _the_coordinates = "time lat lon"
+            _the_grid_mapping = None
+        else:
+            _the_t = _the_root.CreateDimension(
+                "time", gdal.DIM_TYPE_TEMPORAL, None, 1)
+            _the_y = _the_root.CreateDimension(
+                "lat", gdal.DIM_TYPE_HORIZONTAL_Y, None, self.ysize)
+            _the_x = _the_root.CreateDimension(
+                "lon", gdal.DIM_TYPE_HORIZONTAL_X, None, self.xsize)
+            _the_t.SetIndexingVariable(self._create_coordinate(
+                _the_root, "time", [_the_t], _the_double,
+                "seconds since 1993-01-01 00:00:00", np.zeros(1, dtype="f8")))
+            _the_y.SetIndexingVariable(self._create_coordinate(
+                _the_root, "lat", [_the_y], _the_double, "degrees_north",
+                np.linspace(-89.5, 89.5, self.ysize)))
+            _the_x.SetIndexingVariable(self._create_coordinate(
+                _the_root, "lon", [_the_x], _the_double, "degrees_east",
+                np.linspace(-179.5, 179.5, self.xsize)))
+            _the_crs = _the_root.CreateMDArray(
+                "crs", [], gdal.ExtendedDataType.Create(gdal.GDT_Int32))
+            self._write_string_attribute(_the_crs, "grid_mapping_name", "latitude_longitude")
+            self._write_string_attribute(
+                _the_crs, "crs_wkt", osr.SRS_WKT_WGS84_LAT_LONG)
+            _the_dims = [_the_t, _the_y, _the_x]
+            _the_coordinates = "time lat lon"
+            _the_grid_mapping = "crs"
+
+        _the_groups = [_the_root]
+        for _g in range(self.groups):
+            _the_groups.append(_the_root.CreateGroup(f"group_{_g:04d}"))
+        if self.groups:
+            _the_groups = _the_groups[1:]
+
+        _the_shape = [_d.GetSize() for _d in _the_dims]
+        _the_data = np.full(_the_shape, 280.0, dtype="f4")
+        _the_nans = int(_the_data.size * self.nan_fraction)
+        if _the_nans:
+            _the_data.reshape(-1)[:_the_nans] = np.nan
+        for _v in range(self.variables):
+            _the_group = _the_groups[_v % len(_the_groups)]
+            _the_array = _the_group.CreateMDArray(
+                f"variable_{_v:05d}", _the_dims, _the_float)
+            _the_array.SetUnit("K")
+            _the_array.SetNoDataValueDouble(-9999.0)
+            self._write_string_attribute(_the_array, "long_name", f"variable {_v}")
+            self._write_string_attribute(_the_array, "coordinates", _the_coordinates)
+            if _the_grid_mapping:
+                self._write_string_attribute(_the_array, "grid_mapping", _the_grid_mapping)
+            if _v % 2:
+                self._write_number_attribute(_the_array, "scale_factor", 0.01)
+                self._write_number_attribute(_the_array, "add_offset", 100.0)
+            for _a in range(self.attributes):
+                self._write_string_attribute(
+                    _the_array, f"attribute_{_a:03d}", f"value {_a}")
+            _the_array.Write(_the_data)
+        _the_ds = None
+
+    def create_collection(
+            self, directory:str, granules:int,
+            list_filename:str=None, release:tuple=(1, 0, 0))->str:
+        """
+            Create a collection of granules in directory, and its list file.
+            Only the first granule is generated; the others are copies with
+            the filenames of the next date-times.
+            @return: the collection list filename.
+        """
+        os.makedirs(directory, exist_ok=True)
+        _the_first = os.path.join(directory, self.get_filename(0, release))
+        self.create(_the_first)
+        _the_names = [_the_first]
+        for _i in range(1, granules):
+            _the_name = os.path.join(directory, self.get_filename(_i, release))
+            shutil.copyfile(_the_first, _the_name)
+            _the_names.append(_the_name)
+        if not list_filename:
+            list_filename = os.path.join(directory, "collection.lst")
+        with open(list_filename, "w", encoding="utf-8") as _the_file:
+            for _the_name in _the_names:
+                _the_file.write(f"{_the_name}\n")
+        return list_filename
+
+    def _create_coordinate(
+            self, group, name:str, dims:list, data_type,
+            units:str, values):
+        _the_array = group.CreateMDArray(name, dims, data_type)
+        _the_array.SetUnit(units)
+        self._write_string_attribute(_the_array, "standard_name", {
+            "lat": "latitude", "lon": "longitude"}.get(name, name))
+        _the_array.Write(values)
+        return _the_array
+
+    def _write_string_attribute(self, array, name:str, value:str):
+        array.CreateAttribute(
+            name, [], gdal.ExtendedDataType.CreateString()).Write(value)
+
+    def _write_number_attribute(self, array, name:str, value:float):
+        array.CreateAttribute(
+            name, [], gdal.ExtendedDataType.Create(gdal.GDT_Float64)).Write(value)
@@ -2,6 +2,10 @@
     pytest session configuration.
 """
 import pytest
+from diwg_dataset.common.dataset_handle_pool import DatasetHandlePool
+from diwg_dataset.common.dataset_io_profile import DatasetIOProfile
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.common.units_validation import UnitsValidation
 
 def pytest_addoption(parser):
     """
@@ -17,6 +21,32 @@ def pytest_addoption(parser):
                      help="filename for dataset list. In the list file, each line "
                      "can be a single sub-dataset (in GDAL nomination), a dataset file, "
                      "or files with wildcards (e.g. /some/path/files*.nc)")
+    parser.addoption("--dataset-workers",
+                     dest="dataset_workers",
+                     action="store", type=int, default=1,
+                     help="number of worker processes for the granules in the dataset "
+                     "list. Default 1 processes the granules one by one.")
+    parser.addoption("--dataset-cache",
+                     dest="dataset_cache",
+                     action="store", default=None,
+                     help="SQLite file to cache the results of the granules in the dataset "
+                     "list. Only new or changed granules are processed in a repeated run.")
+    parser.addoption("--dataset-cache-hash",
+                     dest="dataset_cache_hash",
+                     action="store_true",
+                     help="add the content hash of each granule to the cache key, "
+                     "in addition to path, size and modification time. ")
+    parser.addoption("--dataset-uniqueness-db",
+                     dest="dataset_uniqueness_db",
+                     action="store", default=None,
+                     help="SQLite file for screening duplicated granule filenames out of "
+                     "memory, for very large dataset lists. ")
+    parser.addoption("--dataset-batch",
+                     dest="dataset_batch",
+                     action="store_true",
+                     help="analyze all the granule filenames of the dataset list together "
+                     "in columns for the filename checks (uniqueness, release identifiers, "
+                     "date-time information and file extensions), without workers and cache. ")
     parser.addoption("--dataset-is-swath",
                      dest="dataset_is_swath",
                      action="store_true",
@@ -25,6 +55,93 @@ def pytest_addoption(parser):
                      dest="dataset_is_grid",
                      action="store_true",
                      help="dataset or all dataset in the collection are regular grid. ")    
+    parser.addoption("--dataset-extension-mode",
+                     dest="dataset_extension_mode",
+                     action="store", default="info",
+                     choices=["info", "signature"],
+                     help="how the format of a granule is found for the file extension test. "
+                     "'info' uses gdal.Info; 'signature' reads only the signature bytes of "
+                     "the file. ")
+    parser.addoption("--dataset-chunk-memory",
+                     dest="dataset_chunk_memory",
+                     action="store", type=int, default=None,
+                     help="maximum bytes of a variable read at once by the tests on data "
+                     "values. Default 64 MiB. ")
+    parser.addoption("--dataset-sample-granules",
+                     dest="dataset_sample_granules",
+                     action="store", type=float, default=None,
+                     help="fraction of the granules of the dataset list read by the tests "
+                     "on data values, stratified by the date-time in the filenames. ")
+    parser.addoption("--dataset-sample-chunks",
+                     dest="dataset_sample_chunks",
+                     action="store", type=float, default=None,
+                     help="fraction of the chunks of each variable read by the tests on "
+                     "data values. Results are given with confidence bounds. ")
+    parser.addoption("--dataset-sample-escalate",
+                     dest="dataset_sample_escalate",
+                     action="store_true",
+                     help="read all the chunks of a variable if its sample is suspicious "
+                     "(e.g. NaN values found). ")
+    parser.addoption("--dataset-units-mode",
+                     dest="dataset_units_mode",
+                     action="store", default="band",
+                     choices=["band", "multidim"],
+                     help="how units attributes of variables are read. 'band' reads the band "
+                     "metadata of each variable; 'multidim' reads all variables from one "
+                     "multidimensional traversal of the granule. ")
+    parser.addoption("--dataset-units-reference",
+                     dest="dataset_units_reference",
+                     action="store", default="first",
+                     choices=["first", "majority"],
+                     help="reference units of variables for units consistency across the "
+                     "collection. 'first' uses the first dataset; 'majority' uses the units "
+                     "of most datasets. ")
+    parser.addoption("--dataset-units-cache",
+                     dest="dataset_units_cache",
+                     action="store", default=None,
+                     help="json file to keep the UDUNITS-2 validation results of units "
+                     "strings across runs. ")
+    parser.addoption("--dataset-georeference-mode",
+                     dest="dataset_georeference_mode",
+                     action="store", default="band",
+                     choices=["band", "multidim"],
+                     help="how grid_mapping attributes of variables are read. 'band' reads "
+                     "the metadata of each subdataset; 'multidim' reads all variables from "
+                     "one multidimensional traversal of the granule. ")
+    parser.addoption("--dataset-group-date-search",
+                     dest="dataset_group_date_search",
+                     action="store", default="fast",
+                     choices=["fast", "dateparser"],
+                     help="how dates are detected in group paths for the coordinate values "
+                     "test. 'fast' matches common date patterns (e.g. 2010-12-10, 20101210, "
+                     "Day_001); 'dateparser' also tries dateparser on the other paths (slow). ")
+    parser.addoption("--import-time-budget",
+                     dest="import_time_budget",
+                     action="store", type=float, default=None,
+                     help="seconds allowed to import the test modules (python -X importtime). "
+                     "Runs the start time tests. ")
+    parser.addoption("--dataset-max-open-files",
+                     dest="dataset_max_open_files",
+                     action="store", type=int, default=16,
+                     help="maximum number of GDAL dataset handles kept open and shared by "
+                     "the tests (in each worker process). ")
+    parser.addoption("--dataset-io-profile",
+                     dest="dataset_io_profile",
+                     action="store", default="default",
+                     choices=sorted(DatasetIOProfile.profiles),
+                     help="GDAL/HDF5 I/O settings of the tests. 'metadata-only' for tests on "
+                     "metadata; 'full-scan' for tests reading all data values; 'network-fs' "
+                     "for granules on network or parallel file systems (e.g. Lustre). ")
+    parser.addoption("--dataset-io-option",
+                     dest="dataset_io_option",
+                     action="append", default=None,
+                     help="extra GDAL configuration option KEY=VALUE applied with the I/O "
+                     "profile, e.g. GDAL_NUM_THREADS=4. Can be repeated. ")
+    parser.addoption("--dataset-profile",
+                     dest="dataset_profile",
+                     action="store", default=None,
+                     help="json or csv file for the time spent in GDAL, regex, dateparser and "
+                     "cfunits calls, per checker, per granule and per operation. ")
 
     parser.addoption("--dataset-id",
                      dest="dataset_id",
@@ -96,6 +213,70 @@ def pytest_configure(config):
                             "test as dataset-is-swath to run")
     config.addinivalue_line("markers", "skip_dataset_is_grid_noneexistence: mark "
                             "test as dataset-is-grid to run")
+    config.addinivalue_line("markers", "skip_import_time_budget_noneexistence: mark "
+                            "test as import-time-budget to run")
+    DatasetHandlePool.max_handles = config.getoption("--dataset-max-open-files")
+    DatasetIOProfile.enable(
+        config.getoption("--dataset-io-profile"),
+        config.getoption("--dataset-io-option"))
+    if config.getoption("--dataset-profile"):
+        DatasetProfiler.reset()
+        DatasetProfiler.enable()
+
+def pytest_report_header(config):
+    """
+        Report the I/O settings in force.
+    """
+    _the_report = DatasetIOProfile.get_report()
+    _the_settings = ", ".join(
+        f"{_k}={_v}" for _k, _v in _the_report["settings"].items() if _v is not None)
+    return f"dataset io profile: {_the_report['profile']} ({_the_settings or 'GDAL defaults'})"
+
+@pytest.fixture(scope="session")
+def units_validation(request):
+    """
+        Memoized units validation, shared by the units tests of the session.
+    """
+    #setup - session
+    the_units_cache=request.config.getoption("--dataset-units-cache")
+    the_units_validation = UnitsValidation(the_units_cache)
+    yield the_units_validation
+    # teardown - session
+    the_units_validation.save()
+    the_units_validation = None
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """
+        Apply the I/O profile to the fixtures and the call of each test, and
+        attribute their profiled operations to the test module and dataset:
+        the single-granule checks run in the class-scoped fixtures.
+        The collection checks attribute theirs to the checker and granule.
+    """
+    with DatasetIOProfile.applied():
+        with DatasetProfiler.checker(
+                item.module.__name__.rsplit(".", 1)[-1],
+                item.config.getoption("--dataset-name")
+                or item.config.getoption("--dataset-name-list")):
+            yield
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+        Close the dataset handles and write the profile.
+    """
+    DatasetHandlePool.clear()
+    _the_profile = session.config.getoption("--dataset-profile")
+    if _the_profile and DatasetProfiler.enabled:
+        DatasetProfiler.export(_the_profile)
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_json_modifyreport(json_report):
+    """
+        Add the I/O settings and the profile to the report of pytest-json-report.
+    """
+    json_report["dataset_io_profile"] = DatasetIOProfile.get_report()
+    if DatasetProfiler.enabled:
+        json_report["dataset_profile"] = DatasetProfiler.get_report()
 
 def pytest_collection_modifyitems(config, items):
     """
@@ -109,6 +290,8 @@ def pytest_collection_modifyitems(config, items):
     _pytest_collection_modifyitems3(config, items)
     # --dataset-is-grid
     _pytest_collection_modifyitems4(config, items)
+    # --import-time-budget
+    _pytest_collection_modifyitems5(config, items)
 
 
 def _pytest_collection_modifyitems1(config, items):
@@ -153,3 +336,14 @@ def _pytest_collection_modifyitems4(config, items):
     for item in items:
         if "skip_dataset_is_grid_noneexistence" in item.keywords:
             item.add_marker(skip_dataset_is_grid_noneexistence)
+
+def _pytest_collection_modifyitems5(config, items):
+    # --import-time-budget
+    if config.getoption("--import-time-budget") is not None:
+        # --import-time-budget given in cli: do not skip start time tests
+        return
+    skip_import_time_budget_noneexistence = pytest.mark.skip(reason="need --import-time-budget "
+                                                             "option to run")
+    for item in items:
+        if "skip_import_time_budget_noneexistence" in item.keywords:
+            item.add_marker(skip_import_time_budget_noneexistence)
@@ -0,0 +1,234 @@
+"""
+    Process the datasets (granules) listed in a dataset collection list file.
+
+    Each line of the list file can be a single sub-dataset (in GDAL nomination),
+    a dataset file, or files with wildcards (e.g. /some/path/files*.nc).
+"""
+import glob
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from diwg_dataset.common.dataset_handle_pool import DatasetHandlePool
+from diwg_dataset.common.dataset_io_profile import DatasetIOProfile
+from diwg_dataset.common.dataset_result_cache import DatasetResultCache
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.common.dataset_sampling import DatasetSampling
+
+def init_worker(io_profile:str, io_options:list, max_handles:int):
+    """
+        Set up a worker process with the settings of the parent process, which
+        are not inherited when workers are spawned (e.g. macOS, Windows).
+        The handles of the pool inherited when workers are forked (e.g. Linux)
+        are dropped, not closed: they belong to the parent process.
+        @param io_profile: name of the DatasetIOProfile.
+        @param io_options: DatasetIOProfile.get_options() of the parent.
+        @param max_handles: DatasetHandlePool.max_handles of the parent.
+    """
+    DatasetIOProfile.enable(io_profile, io_options)
+    DatasetHandlePool.max_handles = max_handles
+    DatasetHandlePool.discard()
+
+def process_one_dataset(
+        checker_class:type, method_name:str,
+        dataset_name:str, kwargs:dict)->dict:
+    """
+        Run one check on one dataset, with the settings of the I/O profile.
+        It is at module level so that it can be sent to a worker process.
+        @return: the dict returned by the check, or
+            {
+                "dataset_name": "example.nc",
+                "error": "message for error"
+            }
+    """
+    try:
+        with DatasetIOProfile.applied():
+            with DatasetProfiler.checker(checker_class.__name__, dataset_name):
+                _the_checker = checker_class()
+                return getattr(_the_checker, method_name)(dataset_name, **kwargs)
+    except Exception as err:
+        _the_ret = dict()
+        _the_ret["dataset_name"] = dataset_name
+        _the_ret["error"] = str(err)
+        return _the_ret
+
+def profile_one_dataset(
+        checker_class:type, method_name:str,
+        dataset_name:str, kwargs:dict)->tuple:
+    """
+        Run one check on one dataset in a worker process with the profiler.
+        @return:
+        (result of process_one_dataset, DatasetProfiler records of the check)
+    """
+    DatasetProfiler.enable()
+    DatasetProfiler.reset()
+    _the_ret = process_one_dataset(checker_class, method_name, dataset_name, kwargs)
+    return _the_ret, DatasetProfiler.get_records()
+
+class DatasetCollection:
+    """
+        Datasets in a dataset collection list file.
+
+        GDAL dataset handles are not thread-safe, so datasets are processed in a
+        pool of processes when more than one worker is requested. Results are
+        always returned in the order of the datasets in the list file.
+
+        With a cache file, the results of unchanged datasets are taken from the
+        cache of a previous run instead of being processed again.
+
+        With a sample fraction, only a sample of the datasets stratified by the
+        date-time in their filenames is processed (see DatasetSampling).
+
+        With the profiler enabled, the timings of the worker processes are
+        merged into the DatasetProfiler of the main process.
+    """
+    # number of pending datasets per worker
+    pending_per_worker = 4
+
+    def __init__(
+            self, dataset_name_listfile:str, dataset_workers:int=1,
+            dataset_cache:str=None, dataset_cache_hash:bool=False,
+            dataset_sample_fraction:float=None):
+        self.dataset_name_listfile = dataset_name_listfile
+        self.dataset_workers = dataset_workers if dataset_workers else 1
+        self.dataset_cache = dataset_cache
+        self.dataset_cache_hash = dataset_cache_hash
+        self.dataset_sample_fraction = dataset_sample_fraction
+        # {"datasets_total": 100, "datasets_sampled": 10} once sampled
+        self.sampling = None
+
+    def get_dataset_names(self)->list:
+        """
+            Expand the lines of the list file to dataset names.
+        """
+        return list(self.iter_dataset_names())
+
+    def iter_dataset_names(self):
+        """
+            Expand the lines of the list file to dataset names lazily. The list
+            file is read line by line and wildcards are expanded with iglob, so
+            the first datasets are available before the whole list is expanded.
+            @return: generator of dataset names.
+        """
+        with open(self.dataset_name_listfile, "r",encoding="utf-8") as _the_file:
+            for _line in _the_file:
+                _the_line = _line.strip()
+                if not _the_line:
+                    continue
+                _the_sfiles = glob.iglob(_the_line)
+                _the_first = next(_the_sfiles, None)
+                # in case of a single GDAL dataset
+                if _the_first is None:
+                    yield _the_line
+                    continue
+                yield _the_first
+                yield from _the_sfiles
+
+    def iter_sampled_dataset_names(self):
+        """
+            Dataset names to process: all of them, or a sample if a sample
+            fraction is set. Sampling needs the whole list of names first.
+            @return: generator of dataset names.
+        """
+        if (not self.dataset_sample_fraction
+            or self.dataset_sample_fraction >= 1):
+            yield from self.iter_dataset_names()
+            return
+        _the_names = self.get_dataset_names()
+        _the_sample = DatasetSampling(
+            self.dataset_name_listfile).sample_dataset_names(
+                _the_names, self.dataset_sample_fraction)
+        self.sampling = {"datasets_total": len(_the_names),
+                         "datasets_sampled": len(_the_sample)}
+        yield from _the_sample
+
+    def process_datasets(
+            self, checker_class:type, method_name:str, **kwargs):
+        """
+            Run checker_class().method_name(dataset_name, **kwargs) on each dataset
+            in the collection.
+            @return: generator of the results in the order of datasets. An error
+                while processing one dataset is returned as the result of that
+                dataset.
+        """
+        _the_cache = None
+        if self.dataset_cache:
+            _the_cache = DatasetResultCache(
+                self.dataset_cache, use_content_hash=self.dataset_cache_hash)
+        try:
+            yield from self._process_datasets(
+                _the_cache, checker_class, method_name, kwargs)
+        finally:
+            if _the_cache is not None:
+                _the_cache.close()
+
+    def _process_datasets(
+            self, cache:DatasetResultCache,
+            checker_class:type, method_name:str, kwargs:dict):
+        _the_names = self.iter_sampled_dataset_names()
+        if self.dataset_workers <= 1:
+            for _the_name in _the_names:
+                _the_key, _the_ret = self._get_cached(
+                    cache, checker_class, method_name, _the_name, kwargs)
+                if _the_ret is None:
+                    _the_ret = process_one_dataset(
+                        checker_class, method_name, _the_name, kwargs)
+                    if _the_key is not None:
+                        cache.put(_the_key, checker_class, _the_ret)
+                yield _the_ret
+            return
+
+        # pending entries: (dataset_name, cache key, future or cached result)
+        _the_pending = deque()
+        _the_max_pending = self.dataset_workers * self.pending_per_worker
+        with ProcessPoolExecutor(
+                max_workers=self.dataset_workers,
+                initializer=init_worker,
+                initargs=(DatasetIOProfile.name,
+                          DatasetIOProfile.get_options(),
+                          DatasetHandlePool.max_handles)) as _the_pool:
+            for _the_name in _the_names:
+                _the_key, _the_ret = self._get_cached(
+                    cache, checker_class, method_name, _the_name, kwargs)
+                if _the_ret is None:
+                    _the_ret = _the_pool.submit(
+                        profile_one_dataset if DatasetProfiler.enabled
+                        else process_one_dataset,
+                        checker_class, method_name, _the_name, kwargs)
+                _the_pending.append((_the_name, _the_key, _the_ret))
+                if len(_the_pending) >= _the_max_pending:
+                    yield self._get_result(
+                        cache, checker_class, *_the_pending.popleft())
+            while _the_pending:
+                yield self._get_result(
+                    cache, checker_class, *_the_pending.popleft())
+
+    def _get_cached(
+            self, cache:DatasetResultCache, checker_class:type,
+            method_name:str, dataset_name:str, kwargs:dict)->tuple:
+        """
+            return:
+            (cache key, cached result)
+            None will be the fill value for each field.
+        """
+        if cache is None:
+            return None, None
+        _the_key = cache.get_key(checker_class, method_name, dataset_name, kwargs)
+        return _the_key, cache.get(_the_key)
+
+    def _get_result(
+            self, cache:DatasetResultCache, checker_class:type,
+            dataset_name:str, key:str, future)->dict:
+        if isinstance(future, dict):
+            return future
+        try:
+            _the_ret = future.result()
+        except Exception as err:
+            _the_ret = dict()
+            _the_ret["dataset_name"] = dataset_name
+            _the_ret["error"] = str(err)
+            return _the_ret
+        if isinstance(_the_ret, tuple):
+            _the_ret, _the_records = _the_ret
+            DatasetProfiler.merge(_the_records)
+        if key is not None:
+            cache.put(key, checker_class, _the_ret)
+        return _the_ret
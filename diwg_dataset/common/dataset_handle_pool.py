@@ -0,0 +1,86 @@
+"""
+    Shared pool of open GDAL dataset handles.
+
+    The checks open the same granule and subdatasets again and again (testing
+    candidate variables, reading bands and arrays). The pool keeps a bounded
+    number of handles open, so repeated opens are served from the pool and long
+    collection runs do not exhaust file descriptors or HDF5 memory.
+"""
+from collections import OrderedDict
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
+
+class DatasetHandlePool:
+    """
+        Session-wide LRU of open gdal datasets keyed by the dataset or
+        subdataset name and the open mode (classic raster or multidimensional).
+
+        A handle evicted from the pool is only released by the pool: GDAL closes
+        the file when the last reference is gone, so a check still using it is
+        not affected. clear() closes all the handles explicitly.
+        Handles must not be used as context managers (with ... as ds), which
+        would close them in the pool.
+    """
+    # maximum number of dataset handles held open by the pool
+    max_handles = 16
+    _handles = OrderedDict()
+
+    @classmethod
+    def open(cls, dataset_name:str, multidim:bool=False):
+        """
+            Open a dataset read-only, or get it from the pool.
+            @param multidim: open with the multidimensional API
+                (gdal.OF_MULTIDIM_RASTER) instead of classic raster mode.
+            @return: the gdal.Dataset. Exceptions from GDAL are raised to the
+                caller and nothing is kept in the pool.
+        """
+        _the_key = (dataset_name, multidim)
+        if _the_key in cls._handles:
+            cls._handles.move_to_end(_the_key)
+            return cls._handles[_the_key]
+        gdal.UseExceptions()
+        if multidim:
+            _the_ds = DatasetProfiler.call(
+                "gdal.OpenEx", gdal.OpenEx,
+                dataset_name, gdal.OF_MULTIDIM_RASTER)
+        else:
+            _the_ds = DatasetProfiler.call(
+                "gdal.Open", gdal.Open, dataset_name, gdal.GA_ReadOnly)
+        if _the_ds is None:
+            return None
+        cls._handles[_the_key] = _the_ds
+        while len(cls._handles) > max(cls.max_handles, 1):
+            cls._handles.popitem(last=False)
+        return _the_ds
+
+    @classmethod
+    def get_open_count(cls)->int:
+        """
+            Number of handles held by the pool.
+        """
+        return len(cls._handles)
+
+    @classmethod
+    def discard(cls):
+        """
+            Drop all the handles of the pool without closing them, e.g. in a
+            forked worker process, where the handles inherited belong to the
+            parent process and closing them would flush or close its files.
+        """
+        cls._handles = OrderedDict()
+
+    @classmethod
+    def clear(cls):
+        """
+            Close all the handles in the pool.
+        """
+        while cls._handles:
+            _the_key, _the_ds = cls._handles.popitem(last=False)
+            _the_close = getattr(_the_ds, "Close", None)
+            if _the_close is not None:
+                try:
+                    _the_close()
+                except Exception:
+                    pass
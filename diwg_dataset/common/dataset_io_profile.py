@@ -0,0 +1,148 @@
+"""
+    GDAL and HDF5 I/O tuning profiles.
+
+    The block cache, the worker threads, the directory listing on open and the
+    VSI cache of GDAL matter a lot for granules on network or parallel file
+    systems (e.g. Lustre). A profile is a named set of GDAL configuration
+    options, applied with gdal.SetConfigOption around each check.
+"""
+import contextlib
+import os
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
+
+class DatasetIOProfile:
+    """
+        Process-wide I/O profile of the checks.
+
+        The "default" profile changes nothing. Options in environment_options
+        are read by the libraries from the environment (e.g. HDF5), so they are
+        set in os.environ instead of the GDAL configuration. A profile applied
+        with applied() is restored at the end of the block.
+    """
+    profiles = {
+        "default": {},
+        # checks on metadata: small block cache, no directory listing
+        "metadata-only": {
+            "GDAL_CACHEMAX": "64",
+            "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+            "VSI_CACHE": "FALSE",
+        },
+        # checks reading all data values (e.g. NaN): large block cache, all CPUs
+        "full-scan": {
+            "GDAL_CACHEMAX": "2048",
+            "GDAL_NUM_THREADS": "ALL_CPUS",
+            "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+            "VSI_CACHE": "TRUE",
+            "VSI_CACHE_SIZE": "268435456",
+        },
+        # network or parallel file systems: avoid listing large directories,
+        # cache reads, no HDF5 file locking (often not supported by the mount)
+        "network-fs": {
+            "GDAL_CACHEMAX": "512",
+            "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+            "VSI_CACHE": "TRUE",
+            "VSI_CACHE_SIZE": "67108864",
+            "HDF5_USE_FILE_LOCKING": "FALSE",
+        },
+    }
+    # options read from the environment by the libraries
+    environment_options = ("HDF5_USE_FILE_LOCKING",)
+    name = "default"
+    _settings = dict()
+
+    @classmethod
+    def enable(cls, name:str="default", options:list=None):
+        """
+            Select the profile of the checks.
+            @param name: one of profiles.
+            @param options: extra "KEY=VALUE" options, overriding the profile.
+        """
+        if name not in cls.profiles:
+            raise ValueError(
+                f"Unknown I/O profile '{name}', expected one of {sorted(cls.profiles)}")
+        _the_settings = dict(cls.profiles[name])
+        for _the_option in options or []:
+            if "=" not in _the_option:
+                raise ValueError(f"I/O option '{_the_option}' is not KEY=VALUE")
+            _the_key, _the_value = _the_option.split("=", 1)
+            _the_settings[_the_key.strip()] = _the_value.strip()
+        cls.name = name
+        cls._settings = _the_settings
+
+    @classmethod
+    def get_options(cls)->list:
+        """
+            Settings of the selected profile as "KEY=VALUE" options, e.g. to
+            enable the same settings in a worker process:
+                DatasetIOProfile.enable(
+                    DatasetIOProfile.name, DatasetIOProfile.get_options())
+        """
+        return [f"{_k}={_v}" for _k, _v in cls._settings.items()]
+
+    @classmethod
+    @contextlib.contextmanager
+    def applied(cls):
+        """
+            Apply the settings of the profile in the block, e.g.
+                with DatasetIOProfile.applied():
+                    ...
+            The previous values are restored at the end of the block.
+        """
+        if not cls._settings:
+            yield
+            return
+        _the_previous = dict()
+        _the_cache_max = None
+        for _the_key, _the_value in cls._settings.items():
+            if _the_key in cls.environment_options:
+                _the_previous[_the_key] = os.environ.get(_the_key)
+                os.environ[_the_key] = _the_value
+                continue
+            _the_previous[_the_key] = gdal.GetConfigOption(_the_key)
+            gdal.SetConfigOption(_the_key, _the_value)
+            # the block cache size is only read from the option at first use
+            if _the_key == "GDAL_CACHEMAX" and _the_value.isdigit():
+                _the_cache_max = gdal.GetCacheMax()
+                _the_size = int(_the_value)
+                # values below 100000 are megabytes, as for the option
+                gdal.SetCacheMax(
+                    _the_size * 1024 * 1024 if _the_size < 100000 else _the_size)
+        try:
+            yield
+        finally:
+            for _the_key, _the_value in _the_previous.items():
+                if _the_key in cls.environment_options:
+                    if _the_value is None:
+                        os.environ.pop(_the_key, None)
+                    else:
+                        os.environ[_the_key] = _the_value
+                else:
+                    gdal.SetConfigOption(_the_key, _the_value)
+            if _the_cache_max is not None:
+                gdal.SetCacheMax(_the_cache_max)
+
+    @classmethod
+    def get_report(cls)->dict:
+        """
+            Settings in force in the checks.
+            @return:
+            {
+                "profile": "network-fs",
+                "settings": {
+                    "GDAL_CACHEMAX": "512",
+                    "GDAL_NUM_THREADS": None,
+                    ...
+                }
+            }
+            A setting is the value of the profile, or else the value from the
+            environment (None if unset: GDAL or library default).
+        """
+        _the_keys = sorted(
+            {_k for _p in cls.profiles.values() for _k in _p} | set(cls._settings))
+        _the_settings = dict()
+        for _the_key in _the_keys:
+            _the_settings[_the_key] = cls._settings.get(
+                _the_key, os.environ.get(_the_key))
+        return {"profile": cls.name, "settings": _the_settings}
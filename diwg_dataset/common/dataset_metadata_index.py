@@ -0,0 +1,50 @@
+"""
+    Sorted-key index of a flattened metadata dict.
+
+    Metadata of gdal (e.g. netCDF 'variable#attribute' keys) is a flat dict in
+    which the attributes of one variable share a key prefix. The index finds
+    them with a binary search on the sorted keys, instead of scanning every key.
+"""
+from bisect import bisect_left
+
+class DatasetMetadataIndex:
+    """
+        Prefix range lookup in a flat metadata dict, e.g.
+            the_index = DatasetMetadataIndex(
+                {"crs#grid_mapping_name": "latitude_longitude",
+                 "crs#crs_wkt": "GEOGCRS[...]",
+                 "sst#grid_mapping": "crs"})
+            the_index.get_prefix("crs#")
+            -> {"grid_mapping_name": "latitude_longitude", "crs_wkt": "GEOGCRS[...]"}
+    """
+    def __init__(self, metadata:dict):
+        self._metadata = metadata
+        self._keys = sorted(metadata)
+
+    def __len__(self)->int:
+        return len(self._keys)
+
+    def __contains__(self, key:str)->bool:
+        return key in self._metadata
+
+    def get(self, key:str, default=None):
+        """
+            Value of one key.
+        """
+        return self._metadata.get(key, default)
+
+    def get_prefix(self, prefix:str)->dict:
+        """
+            All the entries with keys starting with prefix.
+            @return: {key-without-prefix: value}
+        """
+        _the_ret = dict()
+        if not prefix:
+            return _the_ret
+        _the_len = len(prefix)
+        _the_keys = self._keys
+        _i = bisect_left(_the_keys, prefix)
+        while _i < len(_the_keys) and _the_keys[_i].startswith(prefix):
+            _the_ret[_the_keys[_i][_the_len:]] = self._metadata[_the_keys[_i]]
+            _i += 1
+        return _the_ret
@@ -0,0 +1,226 @@
+"""
+    Shared metadata snapshot of a dataset (granule).
+
+    gdal.Info and gdal.MultiDimInfo are expensive on large granules. The snapshot
+    retrieves them once per granule and shares the results with every compliance
+    check in the same pytest session.
+"""
+from collections import OrderedDict
+from diwg_dataset.common.dataset_metadata_index import DatasetMetadataIndex
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
+
+class DatasetMetadataSnapshot:
+    """
+        Metadata snapshot of one granule file, including:
+            - gdal.Info (json, listMDD=True, extraMDDomains=['all'], reportProj4=True)
+              for the granule and each of its subdatasets,
+            - gdal.MultiDimInfo (json) of the granule file.
+
+        Snapshots are kept in a session-wide LRU registry keyed by the granule
+        filename, so a subdataset name (e.g. 'NETCDF:"file.nc"://group/var') shares
+        the snapshot of its file.
+    """
+    # maximum number of granule snapshots held in the registry
+    max_snapshots = 4
+    _snapshots = OrderedDict()
+
+    def __init__(self, filename:str):
+        self.filename = filename
+        self._infos = dict()
+        self._multidim_info = None
+        self._array_index = None
+        self._attribute_index = None
+        self._metadata_indexes = dict()
+
+    @classmethod
+    def get_snapshot(cls, dataset_name:str)->"DatasetMetadataSnapshot":
+        """
+            Retrieve the snapshot for the granule of a dataset or subdataset name.
+            A new snapshot is created (and the least recently used one evicted) if
+            the granule has not been seen yet.
+        """
+        gdal.UseExceptions()
+        _the_format, _the_filename, _the_gv = cls.parse_dataset_name(
+            dataset_name)
+        if not _the_filename:
+            _the_filename = dataset_name
+        if _the_filename in cls._snapshots:
+            cls._snapshots.move_to_end(_the_filename)
+            return cls._snapshots[_the_filename]
+        _the_snapshot = cls(_the_filename)
+        cls._snapshots[_the_filename] = _the_snapshot
+        while len(cls._snapshots) > cls.max_snapshots:
+            cls._snapshots.popitem(last=False)
+        return _the_snapshot
+
+    @classmethod
+    def clear(cls):
+        """
+            Drop all the snapshots in the registry.
+        """
+        cls._snapshots.clear()
+
+    def get_info(self, dataset_name:str)->dict:
+        """
+            gdal.Info in json of the granule or one of its subdatasets.
+            Exceptions from GDAL are raised to the caller and not cached.
+        """
+        if dataset_name not in self._infos:
+            self._infos[dataset_name] = DatasetProfiler.call(
+                "gdal.Info", gdal.Info,
+                dataset_name, format="json",
+                listMDD=True, extraMDDomains=['all'],
+                reportProj4=True)
+        return self._infos[dataset_name]
+
+    def get_multidim_info(self)->dict:
+        """
+            gdal.MultiDimInfo in json of the granule file.
+            Exceptions from GDAL are raised to the caller and not cached.
+        """
+        if self._multidim_info is None:
+            self._multidim_info = DatasetProfiler.call(
+                "gdal.MultiDimInfo", gdal.MultiDimInfo, self.filename)
+        return self._multidim_info
+
+    def has_multidim_info(self)->bool:
+        """
+            True if gdal.MultiDimInfo of the granule file is already retrieved.
+        """
+        return self._multidim_info is not None
+
+    def get_driver_name(self)->str:
+        """
+            Short name of the driver (upper case, e.g. NETCDF, HDF5) from the
+            gdal.MultiDimInfo of the granule file.
+        """
+        return self.get_multidim_info()['driver'].upper()
+
+    def get_array_index(self)->dict:
+        """
+            Index of the arrays with dimensions in gdal.MultiDimInfo of the
+            granule file, keyed by the array path in gdal subdataset names
+            without the leading '/', e.g. 'Data_Fields/var1'. White spaces in
+            group names (e.g. HDFEOS 'Data Fields') are replaced by '_'.
+            @return:
+            {
+                "group1/variable1": {"dimensions": [...], "attributes": {...}}
+            }
+        """
+        if self._array_index is None:
+            _the_index = dict()
+            self._add_arrays_to_index(
+                _the_index, "", self.get_multidim_info())
+            self._array_index = _the_index
+        return self._array_index
+
+    def _add_arrays_to_index(
+            self, array_index:dict, group:str, group_info:dict):
+        if "arrays" in group_info:
+            for ar in group_info['arrays']:
+                if group_info['arrays'][ar].get('dimensions'):
+                    array_index[f"{group}{ar}"] = group_info['arrays'][ar]
+        if "groups" in group_info:
+            for grp in group_info['groups']:
+                the_sgrp = grp.replace(" ", "_")
+                self._add_arrays_to_index(
+                    array_index, f"{group}{the_sgrp}/",
+                    group_info['groups'][grp])
+
+    def get_attribute_index(self)->DatasetMetadataIndex:
+        """
+            Sorted-key index of the attributes of all the arrays (including the
+            arrays without dimensions, e.g. grid mapping variables) in
+            gdal.MultiDimInfo of the granule file, built in one traversal.
+            The keys are 'array-path#attribute', with the array paths of
+            get_array_index(), e.g.
+            {
+                "group1/variable1#grid_mapping": "crs",
+                "group1/crs#grid_mapping_name": "latitude_longitude"
+            }
+        """
+        if self._attribute_index is None:
+            _the_attributes = dict()
+            self._add_attributes_to_index(
+                _the_attributes, "", self.get_multidim_info())
+            self._attribute_index = DatasetMetadataIndex(_the_attributes)
+        return self._attribute_index
+
+    def _add_attributes_to_index(
+            self, attributes:dict, group:str, group_info:dict):
+        if "arrays" in group_info:
+            for ar in group_info['arrays']:
+                for att, value in group_info['arrays'][ar].get(
+                        'attributes', {}).items():
+                    attributes[f"{group}{ar}#{att}"] = value
+        if "groups" in group_info:
+            for grp in group_info['groups']:
+                the_sgrp = grp.replace(" ", "_")
+                self._add_attributes_to_index(
+                    attributes, f"{group}{the_sgrp}/",
+                    group_info['groups'][grp])
+
+    def get_metadata_index(self, dataset_name:str)->DatasetMetadataIndex:
+        """
+            Sorted-key index of the default metadata domain in gdal.Info of the
+            granule or one of its subdatasets, e.g. netCDF
+            {
+                "crs#grid_mapping_name": "latitude_longitude",
+                "sst#grid_mapping": "crs"
+            }
+        """
+        if dataset_name not in self._metadata_indexes:
+            _the_metadata = self.get_info(dataset_name).get('metadata', {})
+            if '' in _the_metadata:
+                _the_metadata = _the_metadata['']
+            self._metadata_indexes[dataset_name] = DatasetMetadataIndex(
+                _the_metadata)
+        return self._metadata_indexes[dataset_name]
+
+    def get_subdataset_names(self, dataset_name:str)->list:
+        """
+            Names of the subdatasets listed in gdal.Info of the dataset.
+        """
+        _the_info = self.get_info(dataset_name)
+        _the_ret = []
+        if "metadata" not in _the_info:
+            return _the_ret
+        if "SUBDATASETS" not in _the_info["metadata"]:
+            return _the_ret
+        _sd_keys = [k for k in _the_info[
+            "metadata"]["SUBDATASETS"] if "_NAME" in k]
+        _the_ret = [_the_info["metadata"][
+            "SUBDATASETS"][k] for k in _sd_keys]
+        return _the_ret
+
+    @staticmethod
+    def parse_dataset_name(dataset_name:str)->tuple:
+        """
+            return:
+            (format, filename, group_variable)
+            Empty string will be the fill value for each field.
+        """
+        _the_format = ''
+        _the_filename = ''
+        _the_group_variable = ''
+        if dataset_name is None:
+            return _the_format, _the_filename, _the_group_variable
+        if ':"' in dataset_name:
+            _the_strs = dataset_name.split(':"', 1)
+            _the_format = _the_strs[0]
+            if '":' in _the_strs[1]:
+                _the_strs2 = _the_strs[1].rsplit('":', 1)
+                _the_filename = _the_strs2[0]
+                _the_group_variable = _the_strs2[1]
+            else:
+                if _the_strs[1].endswith('"'):
+                    _the_filename = _the_strs[1][:-1]
+                else:
+                    _the_format = ''
+                    _the_filename = dataset_name
+        else:
+            _the_filename = dataset_name
+        return _the_format, _the_filename, _the_group_variable
@@ -0,0 +1,202 @@
+"""
+    Timing of the expensive operations of the checks (gdal.Open, gdal.Info,
+    gdal.MultiDimInfo, reading arrays, regex matching, dateparser, cfunits).
+
+    The times are aggregated per checker, per granule and per operation, and
+    exported as a json or csv profile, to find which recommendation dominates
+    the run time of a collection.
+"""
+import contextlib
+import csv
+import json
+import os
+import time
+
+class _DatasetProfilerTimer:
+    """
+        Context manager adding the time spent in its block to one record.
+    """
+    __slots__ = ("_key", "_start")
+
+    def __init__(self, key:tuple):
+        self._key = key
+        self._start = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        DatasetProfiler._add(self._key, time.perf_counter() - self._start)
+        return False
+
+class DatasetProfiler:
+    """
+        Process-wide registry of timers and counters.
+
+        The profiler is disabled by default: timer() is then a shared no-op
+        context manager, so the instrumentation costs almost nothing in a
+        normal run.
+
+        A record is keyed by (checker, granule, operation) and holds the number
+        of calls and the seconds spent. The checker and the granule are the
+        ones of the innermost checker() block. The "check" operation is the
+        whole time of a checker on a granule, including its other operations.
+    """
+    enabled = False
+    # operation of the whole time of a checker on a granule
+    check_operation = "check"
+    _records = dict()
+    _checker = ""
+    _granule = ""
+    _null_timer = contextlib.nullcontext()
+
+    @classmethod
+    def enable(cls, enabled:bool=True):
+        """
+            Switch the profiler on or off. The records are kept.
+        """
+        cls.enabled = enabled
+
+    @classmethod
+    def reset(cls):
+        """
+            Drop all the records.
+        """
+        cls._records = dict()
+
+    @classmethod
+    def timer(cls, operation:str):
+        """
+            Time a block as one call of an operation, e.g.
+                with DatasetProfiler.timer("gdal.Info"):
+                    ...
+        """
+        if not cls.enabled:
+            return cls._null_timer
+        return _DatasetProfilerTimer((cls._checker, cls._granule, operation))
+
+    @classmethod
+    def call(cls, operation:str, func, *args, **kwargs):
+        """
+            Time one call of func as an operation.
+            @return: the return value of func.
+        """
+        if not cls.enabled:
+            return func(*args, **kwargs)
+        with _DatasetProfilerTimer((cls._checker, cls._granule, operation)):
+            return func(*args, **kwargs)
+
+    @classmethod
+    @contextlib.contextmanager
+    def checker(cls, checker_name:str, dataset_name:str):
+        """
+            Attribute the operations in the block to a checker and a granule,
+            and time the block as the "check" operation.
+        """
+        if not cls.enabled:
+            yield
+            return
+        _the_previous = (cls._checker, cls._granule)
+        cls._checker = checker_name
+        cls._granule = dataset_name or ""
+        try:
+            with cls.timer(cls.check_operation):
+                yield
+        finally:
+            cls._checker, cls._granule = _the_previous
+
+    @classmethod
+    def _add(cls, key:tuple, seconds:float):
+        _the_record = cls._records.get(key)
+        if _the_record is None:
+            _the_record = cls._records[key] = [0, 0.0]
+        _the_record[0] += 1
+        _the_record[1] += seconds
+
+    @classmethod
+    def get_records(cls)->list:
+        """
+            @return: records, in a form that can be sent across processes.
+            [
+                ["DatasetNotANumberValue", "/some/path/example.nc", "gdal.ReadAsArray", 12, 3.52],
+                ...
+            ]
+        """
+        return [[*_k, _v[0], _v[1]] for _k, _v in cls._records.items()]
+
+    @classmethod
+    def merge(cls, records:list):
+        """
+            Add records from get_records() of another process.
+        """
+        for _checker, _granule, _operation, _count, _seconds in records:
+            _the_record = cls._records.setdefault(
+                (_checker, _granule, _operation), [0, 0.0])
+            _the_record[0] += _count
+            _the_record[1] += _seconds
+
+    @classmethod
+    def get_report(cls)->dict:
+        """
+            Profile of the records, by decreasing time.
+            @return:
+            {
+                "records": [
+                    {"checker": "DatasetNotANumberValue",
+                     "granule": "/some/path/example.nc",
+                     "operation": "gdal.ReadAsArray",
+                     "count": 12, "seconds": 3.52},
+                    ...
+                ],
+                "checkers": {
+                    "DatasetNotANumberValue": {
+                        "check": {"count": 10, "seconds": 40.1},
+                        "gdal.ReadAsArray": {"count": 120, "seconds": 35.2}
+                    }
+                },
+                "granules": {
+                    "/some/path/example.nc": {
+                        "check": {"count": 5, "seconds": 4.4}
+                    }
+                },
+                "operations": {
+                    "gdal.ReadAsArray": {"count": 120, "seconds": 35.2}
+                }
+            }
+        """
+        _the_ret = {"records": [], "checkers": {}, "granules": {}, "operations": {}}
+        for (_checker, _granule, _operation), (_count, _seconds) in sorted(
+                cls._records.items(), key=lambda _r: -_r[1][1]):
+            _the_ret["records"].append(
+                {"checker": _checker, "granule": _granule,
+                 "operation": _operation, "count": _count, "seconds": _seconds})
+            for _the_total in (
+                    _the_ret["checkers"].setdefault(_checker, {}).setdefault(
+                        _operation, {"count": 0, "seconds": 0.0}),
+                    _the_ret["granules"].setdefault(_granule, {}).setdefault(
+                        _operation, {"count": 0, "seconds": 0.0}),
+                    _the_ret["operations"].setdefault(
+                        _operation, {"count": 0, "seconds": 0.0})):
+                _the_total["count"] += _count
+                _the_total["seconds"] += _seconds
+        return _the_ret
+
+    @classmethod
+    def export(cls, filename:str):
+        """
+            Write the profile to a csv file (one line per record) if the
+            filename ends with .csv, otherwise to a json file (get_report).
+        """
+        if os.path.splitext(filename)[1].lower() == ".csv":
+            with open(filename, "w", encoding="utf-8", newline="") as _the_file:
+                _the_writer = csv.writer(_the_file)
+                _the_writer.writerow(
+                    ["checker", "granule", "operation", "count", "seconds"])
+                for _r in cls.get_report()["records"]:
+                    _the_writer.writerow(
+                        [_r["checker"], _r["granule"], _r["operation"],
+                         _r["count"], f'{_r["seconds"]:.6f}'])
+            return
+        with open(filename, "w", encoding="utf-8") as _the_file:
+            json.dump(cls.get_report(), _the_file, indent=2)
@@ -0,0 +1,209 @@
+"""
+    On-disk cache of the results of the checks on datasets (granules).
+
+    A result is keyed by the granule file (path, size, mtime and optionally
+    a content hash), the checker (class, method, a hash of the source of the
+    diwg_dataset package and the GDAL and cfunits versions) and the arguments
+    of the check. Repeated runs on a collection only
+    process the new or changed granules.
+"""
+import hashlib
+import importlib.metadata
+import json
+import os
+import sqlite3
+import sys
+import time
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
+
+class DatasetResultCache:
+    """
+        SQLite cache of the result dicts returned by the get_* methods.
+
+        The cache is only accessed from the main process. Results with a
+        general "error" are not cached, so that a failed granule (e.g. not yet
+        fully transferred) is processed again in the next run. The volatile
+        entries of a result (volatile_keys, e.g. "timing") are not stored, and
+        sets are stored so that a cached result has the types of a new one.
+    """
+    # bump to invalidate all existing entries when the key or value changes
+    cache_version = 2
+    # entries of the results that describe a run, not the granule
+    volatile_keys = ("timing",)
+    # hash of the source of the package and the library versions, per process
+    _package_version = None
+    # size of the chunks read for the content hash
+    hash_chunk_size = 1024*1024
+    # number of results stored between commits
+    commit_every = 100
+
+    def __init__(self, cache_file:str, use_content_hash:bool=False):
+        self.cache_file = cache_file
+        self.use_content_hash = use_content_hash
+        self._checker_versions = dict()
+        self._pending = 0
+        self._connection = sqlite3.connect(cache_file)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, "
+            "dataset_name TEXT, "
+            "checker TEXT, "
+            "result TEXT, "
+            "created REAL)")
+        self._connection.commit()
+
+    def close(self):
+        """
+            Commit the pending results and close the cache file.
+        """
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+
+    def get_key(
+            self, checker_class:type, method_name:str,
+            dataset_name:str, kwargs:dict)->str:
+        """
+            Key of a result.
+            @return: None if the granule file cannot be found (e.g. a remote
+                GDAL dataset), such results are not cached.
+        """
+        _the_filename = DatasetMetadataSnapshot.parse_dataset_name(
+            dataset_name)[1] or dataset_name
+        try:
+            _the_stat = os.stat(_the_filename)
+        except OSError:
+            return None
+        _the_parts = [
+            self.cache_version,
+            os.path.abspath(_the_filename),
+            dataset_name,
+            _the_stat.st_size,
+            _the_stat.st_mtime_ns,
+            self._get_content_hash(_the_filename) if self.use_content_hash else "",
+            f"{checker_class.__module__}.{checker_class.__qualname__}",
+            method_name,
+            self._get_checker_version(checker_class),
+            self._get_package_version(),
+            json.dumps(kwargs, sort_keys=True, default=str)]
+        return hashlib.sha256(
+            json.dumps(_the_parts).encode("utf-8")).hexdigest()
+
+    def get(self, key:str)->dict:
+        """
+            Cached result of a key.
+            @return: None if there is no result for the key.
+        """
+        if key is None:
+            return None
+        _the_row = self._connection.execute(
+            "SELECT result FROM results WHERE key = ?", (key,)).fetchone()
+        if _the_row is None:
+            return None
+        return json.loads(_the_row[0], object_hook=self._json_object_hook)
+
+    def put(self, key:str, checker_class:type, result:dict):
+        """
+            Store a result. Results with a general error or that cannot be
+            serialized are skipped.
+        """
+        if key is None or not isinstance(result, dict) or "error" in result:
+            return
+        _the_result = {
+            _k: _v for _k, _v in result.items() if _k not in self.volatile_keys}
+        try:
+            _the_value = json.dumps(_the_result, default=self._json_default)
+        except (TypeError, ValueError):
+            return
+        self._connection.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+            (key, result.get("dataset_name"),
+             checker_class.__qualname__, _the_value, time.time()))
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._connection.commit()
+            self._pending = 0
+
+    def _get_checker_version(self, checker_class:type)->str:
+        """
+            sha1 of the source of the module of the checker. Any change of the
+            checker invalidates its cached results.
+        """
+        _the_module = checker_class.__module__
+        if _the_module not in self._checker_versions:
+            _the_version = ""
+            _the_file = getattr(sys.modules.get(_the_module), "__file__", None)
+            if _the_file:
+                with open(_the_file, "rb") as _the_source:
+                    _the_version = hashlib.sha1(_the_source.read()).hexdigest()
+            self._checker_versions[_the_module] = _the_version
+        return self._checker_versions[_the_module]
+
+    @classmethod
+    def _get_package_version(cls)->str:
+        """
+            sha1 of the source of all the modules of the diwg_dataset package,
+            with the GDAL and cfunits versions. A change of shared code (e.g.
+            the metadata snapshot) or of the libraries invalidates all the
+            cached results.
+        """
+        if cls._package_version is None:
+            _the_hash = hashlib.sha1()
+            _the_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            for _the_dir, _the_subdirs, _the_files in os.walk(_the_root):
+                _the_subdirs.sort()
+                for _the_name in sorted(_the_files):
+                    if not _the_name.endswith(".py"):
+                        continue
+                    _the_path = os.path.join(_the_dir, _the_name)
+                    _the_hash.update(
+                        os.path.relpath(_the_path, _the_root).encode("utf-8"))
+                    with open(_the_path, "rb") as _the_source:
+                        _the_hash.update(_the_source.read())
+            for _the_version in (cls._get_gdal_version(), cls._get_cfunits_version()):
+                _the_hash.update(f"|{_the_version}".encode("utf-8"))
+            cls._package_version = _the_hash.hexdigest()
+        return cls._package_version
+
+    @staticmethod
+    def _get_gdal_version()->str:
+        try:
+            return gdal.__version__
+        except ImportError:
+            return ""
+
+    @staticmethod
+    def _get_cfunits_version()->str:
+        # from the package metadata: importing cfunits initializes UDUNITS-2
+        try:
+            return importlib.metadata.version("cfunits")
+        except importlib.metadata.PackageNotFoundError:
+            return ""
+
+    def _get_content_hash(self, filename:str)->str:
+        _the_hash = hashlib.sha256()
+        with open(filename, "rb") as _the_file:
+            for _the_chunk in iter(
+                    lambda: _the_file.read(self.hash_chunk_size), b""):
+                _the_hash.update(_the_chunk)
+        return _the_hash.hexdigest()
+
+    @staticmethod
+    def _json_default(value):
+        if isinstance(value, (set, frozenset)):
+            return {"__set__": sorted(value, key=str)}
+        if isinstance(value, bytes):
+            return value.decode("utf-8", errors="replace")
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+    @staticmethod
+    def _json_object_hook(value:dict):
+        if len(value) == 1 and "__set__" in value:
+            return set(value["__set__"])
+        return value
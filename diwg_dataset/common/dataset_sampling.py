@@ -0,0 +1,155 @@
+"""
+    Sampling of granules and chunks for the checks on data values.
+
+    Reading every value of a large collection is expensive. A fraction of
+    the granules (stratified by the date-time in their filenames) and a
+    fraction of the chunks of each variable are read instead, and the
+    results are given with confidence bounds.
+"""
+import math
+import random
+import zlib
+from diwg_dataset.dataname.filename_dataset_batch_analysis import (
+    FilenameDatasetBatchAnalysis
+)
+
+class DatasetSampling:
+    """
+        Reproducible sampling: the random choices are seeded from the name of
+        what is sampled (collection list file, variable), so a repeated run
+        reads the same granules and chunks (and can use the result cache).
+    """
+    # confidence level of the bounds, and its two-sided normal quantile
+    confidence = 0.95
+    z_score = 1.959963984540054
+
+    def __init__(self, seed_name:str=""):
+        self._rng = random.Random(zlib.crc32(seed_name.encode("utf-8")))
+
+    def sample_dataset_names(
+            self, dataset_names:list, fraction:float)->list:
+        """
+            Sample the granules of a collection, stratified by time: the
+            granules are ordered by the first date-time token of their
+            filenames (then by name) and cut into as many strata of equal size
+            as the granules sampled. One granule is sampled in each stratum.
+            @return: the sampled names, in the order of dataset_names.
+        """
+        _the_count = len(dataset_names)
+        _the_n = self.get_sample_size(_the_count, fraction)
+        if _the_n >= _the_count:
+            return list(dataset_names)
+        _the_batch = FilenameDatasetBatchAnalysis()
+        _the_filenames = _the_batch.get_filenames(dataset_names)["filename"]
+        _the_tokens = _the_batch.get_iso8601_tokens(_the_filenames)
+        # first date-time token of each filename, by start
+        _the_first = [""] * _the_count
+        for _the_row, _the_token in zip(
+                reversed(_the_tokens["row"]), reversed(_the_tokens["token"])):
+            _the_first[_the_row] = _the_token
+        _the_keys = list()
+        for _i, _the_filename in enumerate(_the_filenames):
+            _the_token = _the_first[_i]
+            # names without date-time token come after the others
+            _the_keys.append((_the_token == "", _the_token, _the_filename, _i))
+        _the_keys.sort()
+        _the_rows = list()
+        for _s in range(_the_n):
+            _the_begin = _s * _the_count // _the_n
+            _the_end = (_s + 1) * _the_count // _the_n
+            _the_rows.append(
+                _the_keys[self._rng.randrange(_the_begin, _the_end)][3])
+        return [dataset_names[_i] for _i in sorted(_the_rows)]
+
+    def sample_chunks(self, chunk_count:int, fraction:float)->list:
+        """
+            Systematic sample of chunk indexes: evenly spaced over the
+            variable, from a random start.
+            @return: sorted indexes.
+        """
+        _the_n = self.get_sample_size(chunk_count, fraction)
+        if _the_n >= chunk_count:
+            return list(range(chunk_count))
+        _the_step = chunk_count / _the_n
+        _the_start = self._rng.random() * _the_step
+        return [int(_the_start + _i * _the_step) for _i in range(_the_n)]
+
+    @staticmethod
+    def get_sample_size(count:int, fraction:float)->int:
+        """
+            Number of units sampled: at least one when count > 0.
+        """
+        if not fraction or fraction >= 1:
+            return count
+        # round first, e.g. 100 * 0.07 is 7.000000000000001
+        return min(count, max(1, math.ceil(round(count * fraction, 9))))
+
+    def get_ratio_bounds(
+            self, hits:list, sizes:list, unit_total:int)->dict:
+        """
+            Estimate of the proportion of values with a property (e.g. NaN)
+            from a sample of units (chunks) of different sizes, with the
+            ratio estimator of cluster sampling and a finite population
+            correction.
+            @param hits: number of values with the property in each sampled unit.
+            @param sizes: number of values in each sampled unit.
+            @param unit_total: number of units in the population.
+            @return:
+            {
+                "estimate": 0.0012,
+                "lower": 0.0,
+                "upper": 0.0031,
+                "confidence": 0.95
+            }
+            If no value with the property is found, the upper bound is the
+            one of the fraction of units holding any (zero-count binomial bound).
+        """
+        _the_n = len(sizes)
+        _the_ret = {"estimate": 0.0, "lower": 0.0, "upper": 0.0,
+                    "confidence": self.confidence}
+        _the_size = sum(sizes)
+        if _the_n == 0 or _the_size == 0:
+            _the_ret["upper"] = 1.0
+            return _the_ret
+        _the_hits = sum(hits)
+        _the_p = _the_hits / _the_size
+        _the_ret["estimate"] = _the_p
+        _the_fpc = max(0.0, 1.0 - _the_n / unit_total) if unit_total else 0.0
+        if _the_hits == 0:
+            if _the_fpc > 0:
+                _the_ret["upper"] = 1.0 - (1.0 - self.confidence) ** (1.0 / _the_n)
+            return _the_ret
+        if _the_n < 2:
+            _the_ret["upper"] = 1.0 if _the_fpc > 0 else _the_p
+            _the_ret["lower"] = 0.0 if _the_fpc > 0 else _the_p
+            return _the_ret
+        _the_mean_size = _the_size / _the_n
+        _the_var = sum((_h - _the_p * _s) ** 2 for _h, _s in zip(hits, sizes)) / (
+            (_the_n - 1) * _the_n * _the_mean_size ** 2) * _the_fpc
+        _the_half = self.z_score * math.sqrt(_the_var)
+        _the_ret["lower"] = max(0.0, _the_p - _the_half)
+        _the_ret["upper"] = min(1.0, _the_p + _the_half)
+        return _the_ret
+
+    def get_proportion_bounds(self, hits:int, n:int, total:int)->dict:
+        """
+            Wilson score interval of a proportion (e.g. of the granules with
+            NaN values) from a simple random sample of n units of total.
+            @return: same as get_ratio_bounds.
+        """
+        _the_ret = {"estimate": 0.0, "lower": 0.0, "upper": 1.0,
+                    "confidence": self.confidence}
+        if n == 0:
+            return _the_ret
+        _the_p = hits / n
+        _the_ret["estimate"] = _the_p
+        if n >= total:
+            _the_ret["lower"] = _the_ret["upper"] = _the_p
+            return _the_ret
+        _the_z2 = self.z_score ** 2
+        _the_center = (_the_p + _the_z2 / (2 * n)) / (1 + _the_z2 / n)
+        _the_half = (self.z_score / (1 + _the_z2 / n)) * math.sqrt(
+            _the_p * (1 - _the_p) / n + _the_z2 / (4 * n * n))
+        _the_ret["lower"] = max(0.0, _the_center - _the_half)
+        _the_ret["upper"] = min(1.0, _the_center + _the_half)
+        return _the_ret
@@ -0,0 +1,92 @@
+"""
+    Format of a granule file from its signature bytes, without GDAL.
+
+    Only the signature (or the HDF5 superblock) and bounded parts at the
+    head and tail of the file are read, so the format of the granules of a
+    large archive is found at about the speed of listing the directory.
+"""
+import os
+import re
+
+class DatasetSignature:
+    """
+        Sniff the format of a granule file, in the terms of GDAL driver short
+        names: "HDF5", "netCDF" and "HDF4", with the HDF-EOS version if any.
+
+        A netCDF-4 file is an HDF5 file; it is recognized by the _NCProperties
+        attribute of its root group (written since netCDF 4.4.1), found in the
+        bytes read. The markers are only looked for at the head and the tail of
+        the file: an HDF5 file without any of them may still be netCDF-4 or
+        HDF-EOS5, and is reported as not complete.
+    """
+    hdf5_signature = b"\x89HDF\r\n\x1a\n"
+    hdf4_signature = b"\x0e\x03\x13\x01"
+    netcdf_classic_signatures = (b"CDF\x01", b"CDF\x02", b"CDF\x05")
+    netcdf4_marker = b"_NCProperties"
+    hdfeos_version_pattern = re.compile(rb"HDFEOS_V?[0-9][0-9.]*[0-9]")
+    # the HDF5 superblock can be at 0, 512, 1024, 2048, ... after a user block
+    hdf5_first_user_block = 512
+    # size of the parts read at the head and the tail of the file for markers
+    marker_bytes = 1024*1024
+
+    def get_signature(self, filename:str)->dict:
+        """
+            Format of a granule file.
+            @return:
+            {
+                "driver_short_name": "HDF5",
+                "HDFEOSVersion": "HDFEOS_5.1.15",
+                "complete": True
+            }
+            driver_short_name is "" if the format is not recognized.
+            complete is False if the file is HDF5 and no netCDF-4 or HDF-EOS
+            marker is found: the format must then be found with GDAL.
+        """
+        _the_ret = {"driver_short_name": "", "HDFEOSVersion": "", "complete": True}
+        with open(filename, "rb") as _the_file:
+            _the_head = _the_file.read(self.marker_bytes)
+            _the_size = os.fstat(_the_file.fileno()).st_size
+            if _the_head[:4] in self.netcdf_classic_signatures:
+                _the_ret["driver_short_name"] = "netCDF"
+                return _the_ret
+            if _the_head[:4] == self.hdf4_signature:
+                _the_ret["driver_short_name"] = "HDF4"
+            elif self._find_hdf5_superblock(_the_file, _the_head, _the_size) >= 0:
+                _the_ret["driver_short_name"] = "HDF5"
+            else:
+                return _the_ret
+            _the_tail = b""
+            if _the_size > len(_the_head):
+                _the_file.seek(max(len(_the_head), _the_size - self.marker_bytes))
+                _the_tail = _the_file.read(self.marker_bytes)
+        if (_the_ret["driver_short_name"] == "HDF5"
+            and (self.netcdf4_marker in _the_head
+                 or self.netcdf4_marker in _the_tail)):
+            _the_ret["driver_short_name"] = "netCDF"
+        for _the_bytes in (_the_head, _the_tail):
+            _m = self.hdfeos_version_pattern.search(_the_bytes)
+            if _m:
+                _the_ret["HDFEOSVersion"] = _m.group().decode("ascii")
+                break
+        if (_the_ret["driver_short_name"] == "HDF5"
+            and not _the_ret["HDFEOSVersion"]):
+            _the_ret["complete"] = False
+        return _the_ret
+
+    def _find_hdf5_superblock(self, file, head:bytes, size:int)->int:
+        """
+            @return: offset of the HDF5 superblock, -1 if not found.
+        """
+        _the_offset = 0
+        _the_sig_len = len(self.hdf5_signature)
+        while _the_offset + _the_sig_len <= size:
+            if _the_offset + _the_sig_len <= len(head):
+                _the_sig = head[_the_offset:_the_offset+_the_sig_len]
+            else:
+                file.seek(_the_offset)
+                _the_sig = file.read(_the_sig_len)
+            if _the_sig == self.hdf5_signature:
+                return _the_offset
+            _the_offset = (self.hdf5_first_user_block if _the_offset == 0
+                           else _the_offset * 2)
+        return -1
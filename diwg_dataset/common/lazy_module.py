@@ -0,0 +1,31 @@
+"""
+    Lazy import of the heavy dependencies (GDAL, NumPy, cfunits, dateutil).
+
+    Importing osgeo.gdal, cfunits (UDUNITS-2 initialization) and the others
+    takes a large part of the start time of a pytest session, although most
+    tests are skipped or deselected in a typical run. A module is imported
+    only when one of its attributes is first used.
+"""
+import importlib
+
+class LazyModule:
+    """
+        Stand-in for a module, e.g.
+            gdal = LazyModule("osgeo.gdal")
+        and then gdal.Open(...) as usual. The module is imported on the first
+        attribute access.
+    """
+    def __init__(self, module_name:str):
+        self._module_name = module_name
+        self._module = None
+
+    def __getattr__(self, name:str):
+        # only called for the attributes of the module
+        _the_module = self._module
+        if _the_module is None:
+            _the_module = importlib.import_module(self._module_name)
+            self._module = _the_module
+        return getattr(_the_module, name)
+
+    def __repr__(self)->str:
+        return f"<lazy module '{self._module_name}'>"
@@ -0,0 +1,48 @@
+"""
+    Validation of user-defined group, variable and attribute names against the
+    character set of the recommendation (a letter, then letters, digits or '_').
+
+    A collection reuses the same few hundred names in every granule. Each
+    distinct name is classified once per process.
+"""
+import re
+from functools import lru_cache
+
+# character set for user-defined names (CF conventions)
+name_pattern = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+
+# (type of the names, key of the names in the results of the checker)
+name_types = (
+    ("group", "group_names"),
+    ("variable", "variable_names"),
+    ("attribute", "attribute_names"),
+)
+
+@lru_cache(maxsize=65536)
+def is_valid_name(name:str)->bool:
+    """
+        True if the name only uses the character set of the recommendation.
+    """
+    return name_pattern.fullmatch(name) is not None
+
+def get_invalid_names(group_variable_attribute:dict)->list:
+    """
+        Classify all the names of a dataset.
+        @param group_variable_attribute: result of
+            DatasetGroupVariableAttributeName.get_group_variable_attribute_names
+        @return: one entry per type with invalid names, e.g.
+        [
+            {
+                "type": "variable",
+                "invalid_values": ["var-2"]
+            }
+        ]
+    """
+    _the_ret = list()
+    for _the_type, _the_key in name_types:
+        _the_invalid = [
+            _n for _n in group_variable_attribute.get(_the_key, ())
+            if not is_valid_name(_n)]
+        if _the_invalid:
+            _the_ret.append({"type": _the_type, "invalid_values": _the_invalid})
+    return _the_ret
@@ -0,0 +1,113 @@
+"""
+    Validation of units attribute values against UDUNITS-2 (through cfunits).
+
+    A collection has typically a few dozen distinct units strings. Each distinct
+    string is parsed once per process (and once across runs with a cache file).
+"""
+import json
+import os
+from functools import lru_cache
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.common.lazy_module import LazyModule
+
+cfunits = LazyModule("cfunits")
+
+@lru_cache(maxsize=4096)
+def parse_units(units:str)->tuple:
+    """
+        Parse one units string with cfunits.
+        return:
+        (isvalid, canonical)
+        canonical is None if the units is not valid.
+    """
+    _the_units = DatasetProfiler.call("cfunits.Units", cfunits.Units, units)
+    if not _the_units.isvalid:
+        return False, None
+    try:
+        return True, _the_units.formatted()
+    except Exception:
+        return True, units
+
+class UnitsValidation:
+    """
+        Memoized validity and canonical form of units strings.
+
+        With a cache file (json), the results of previous runs are loaded at
+        start and the new results are written back by save(). The cache file is
+        ignored if it was written with a different version of cfunits.
+    """
+    cache_version = 1
+
+    def __init__(self, cache_file:str=None):
+        self.cache_file = cache_file
+        self._units = dict()
+        self._changed = False
+        if cache_file and os.path.exists(cache_file):
+            try:
+                with open(cache_file, "r", encoding="utf-8") as _the_file:
+                    _the_cache = json.load(_the_file)
+                if (_the_cache.get("version") == self.cache_version
+                    and _the_cache.get("cfunits") == cfunits.__version__):
+                    self._units = _the_cache.get("units", dict())
+            except (OSError, ValueError):
+                self._units = dict()
+
+    def validate(self, units:str)->dict:
+        """
+            Validity and canonical form of a units string.
+            @return:
+            {
+                "units": "m/s",
+                "isvalid": True,
+                "canonical": "m s-1"
+            }
+        """
+        if isinstance(units, str) and units in self._units:
+            _the_ret = self._units[units]
+        else:
+            _the_isvalid, _the_canonical = parse_units(units)
+            _the_ret = {
+                "isvalid": _the_isvalid,
+                "canonical": _the_canonical
+            }
+            # json keys of the cache file can only be strings
+            if isinstance(units, str):
+                self._units[units] = _the_ret
+                self._changed = True
+        return {"units": units, **_the_ret}
+
+    def is_valid(self, units:str)->bool:
+        """
+            Whether the units string is supported by UDUNITS-2.
+        """
+        return self.validate(units)["isvalid"]
+
+    def get_canonical(self, units:str)->str:
+        """
+            Canonical form of the units string, None if it is not valid.
+        """
+        return self.validate(units)["canonical"]
+
+    def is_equivalent(self, units1:str, units2:str)->bool:
+        """
+            Whether two valid units strings have the same canonical form,
+            e.g. 'm/s' and 'm s-1'.
+        """
+        _the_canonical1 = self.get_canonical(units1)
+        return (_the_canonical1 is not None
+                and _the_canonical1 == self.get_canonical(units2))
+
+    def save(self):
+        """
+            Write the results to the cache file if there are new results.
+        """
+        if not self.cache_file or not self._changed:
+            return
+        _the_cache = {
+            "version": self.cache_version,
+            "cfunits": cfunits.__version__,
+            "units": self._units
+        }
+        with open(self.cache_file, "w", encoding="utf-8") as _the_file:
+            json.dump(_the_cache, _the_file, indent=1, sort_keys=True)
+        self._changed = False
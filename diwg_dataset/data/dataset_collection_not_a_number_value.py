@@ -0,0 +1,105 @@
+"""
+    Count the NaN values in the floating-point variables of the datasets
+    in a collection.
+"""
+from diwg_dataset.common.dataset_collection import DatasetCollection
+from diwg_dataset.common.dataset_sampling import DatasetSampling
+from diwg_dataset.data.dataset_not_a_number_value import (
+    DatasetNotANumberValue
+)
+class DatasetCollectionNotANumberValue:
+    """
+        This class is for testing:
+            Not-a-Number (NaN) Value
+
+            https://wiki.earthdata.nasa.gov/display/ESDSWG/Not-a-Number+%28NaN%29+Value
+    """
+    def get_nan_values(
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            max_chunk_memory:int=None,
+            dataset_sample_fraction:float=None,
+            sample_fraction:float=None,
+            sample_escalate:bool=False)->dict:
+        """
+            Count NaN values (and fill values) in the floating-point variables.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
+            @param max_chunk_memory: maximum bytes read at once for a variable,
+                see DatasetNotANumberValue.get_nan_values.
+            @param dataset_sample_fraction: fraction of the datasets read, stratified
+                by the date-time in their filenames. None or 1 reads all the datasets.
+            @param sample_fraction: fraction of the chunks read in each variable.
+            @param sample_escalate: read all the chunks of a variable if NaN values
+                are found in its sample.
+            @return:
+            {
+            collection_name: "thecollection_list.file",
+            error: "Error message if there is error",
+            datasets: [{
+                "dataset_name": "test_dataset.nc",
+                "error": "add error here if there is a general error",
+                "variables":[{
+                    "fullname":"/group1/variable1",
+                    "error":"message for error if error exists",
+                    "data_type": "Float32",
+                    "_FillValue": -9999.0,
+                    "missing_value": None,
+                    "count": 1036800,
+                    "nan_count": 12,
+                    "fill_value_count": 3400,
+                    "chunk_count": 4
+                }]
+            }],
+            sampling: {
+                "datasets_total": 100,
+                "datasets_sampled": 10,
+                "nan_datasets": {
+                    "estimate": 0.1,
+                    "lower": 0.018,
+                    "upper": 0.404,
+                    "confidence": 0.95
+                }
+            }
+            }
+            sampling is only given if a sample of the datasets was read.
+            nan_datasets is the fraction of the datasets with NaN values.
+        """
+        _the_ret = dict()
+        _the_ret["collection_name"] = dataset_name_listfile
+        _the_ret["datasets"] = list()
+
+        try:
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash,
+                dataset_sample_fraction=dataset_sample_fraction)
+            for _the_ds in _the_collection.process_datasets(
+                    DatasetNotANumberValue, "get_nan_values",
+                    max_chunk_memory=max_chunk_memory,
+                    sample_fraction=sample_fraction,
+                    sample_escalate=sample_escalate):
+                _the_ret["datasets"].append(_the_ds)
+            if _the_collection.sampling is not None:
+                _the_ret["sampling"] = self._get_sampling(
+                    _the_collection.sampling, _the_ret["datasets"])
+        except Exception as err:
+            _the_ret["error"]=str(err)
+
+        return _the_ret
+
+    def _get_sampling(self, sampling:dict, datasets:list)->dict:
+        _the_ok = [_ds for _ds in datasets if "error" not in _ds]
+        _the_nan = sum(
+            1 for _ds in _the_ok
+            if any(_v.get("nan_count", 0) > 0 for _v in _ds["variables"]))
+        _the_ret = dict(sampling)
+        _the_ret["nan_datasets"] = DatasetSampling().get_proportion_bounds(
+            _the_nan, len(_the_ok),
+            sampling["datasets_total"] - (len(datasets) - len(_the_ok)))
+        return _the_ret
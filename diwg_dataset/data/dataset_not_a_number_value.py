@@ -0,0 +1,370 @@
+"""
+    For recommendation:
+
+    Not-a-Number (NaN) Value
+
+    Count the NaN values in the floating-point variables of a dataset.
+    The variables are read chunk by chunk, so the memory used is bounded
+    by max_chunk_memory whatever the size of the variables. Optionally only
+    a sample of the chunks is read.
+"""
+import math
+from diwg_dataset.common.dataset_handle_pool import DatasetHandlePool
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.common.dataset_sampling import DatasetSampling
+from diwg_dataset.common.lazy_module import LazyModule
+
+np = LazyModule("numpy")
+gdal = LazyModule("osgeo.gdal")
+
+class DatasetNotANumberValue:
+    """
+        This class is for testing:
+            Not-a-Number (NaN) Value
+
+            https://wiki.earthdata.nasa.gov/display/ESDSWG/Not-a-Number+%28NaN%29+Value
+    """
+    # default bytes read at once for a variable
+    max_chunk_memory = 64*1024*1024
+    # names of the floating-point data types (gdal.GetDataTypeName)
+    float_data_type_names = ("Float32", "Float64", "CFloat32", "CFloat64")
+
+    def get_nan_values(
+            self, dataset_name:str,
+            max_chunk_memory:int=None,
+            sample_fraction:float=None,
+            sample_escalate:bool=False)->dict:
+        """
+            Count NaN values (and fill values) in the floating-point variables.
+            @param dataset_name: a granule file or a subdataset (in GDAL nomination).
+            @param max_chunk_memory: maximum bytes read at once for a variable.
+                A chunk is made of whole native blocks (HDF5/netCDF chunks) of the
+                variable, as many as fit.
+            @param sample_fraction: fraction of the chunks of each variable read
+                (at least one chunk). None or 1 reads all the chunks. The counts are
+                then those of the chunks read, and "sampling" gives the estimate of
+                the fraction of NaN values in the variable with confidence bounds.
+            @param sample_escalate: read all the chunks of a variable if NaN values
+                are found in its sample.
+            @return:
+            {
+            "dataset_name": "test_dataset.nc",
+            "error": "add error here if there is a general error",
+            "variables":[{
+                "fullname":"/group1/variable1",
+                "error":"message for error if error exists",
+                "data_type": "Float32",
+                "_FillValue": -9999.0,
+                "missing_value": None,
+                "count": 1036800,
+                "nan_count": 12,
+                "fill_value_count": 3400,
+                "chunk_count": 4,
+                "sampling": {
+                    "chunk_total": 40,
+                    "escalated": False,
+                    "nan_fraction": {
+                        "estimate": 0.0012,
+                        "lower": 0.0,
+                        "upper": 0.0031,
+                        "confidence": 0.95
+                    }
+                }
+            }]
+            }
+            _FillValue and missing_value are "NaN" if they are NaN.
+            "sampling" is only given if a sample of the chunks was read, with
+            "escalated" True (and no estimate) if all the chunks were read after
+            NaN values were found in the sample.
+        """
+        gdal.UseExceptions()
+        if not max_chunk_memory:
+            max_chunk_memory = self.max_chunk_memory
+        _the_sample = (dataset_name, sample_fraction, sample_escalate)
+        _the_ret = dict()
+        _the_ret["dataset_name"] = dataset_name
+        _the_ret["variables"] = list()
+        try:
+            _the_ds = None
+            if ':"' not in dataset_name:
+                try:
+                    _the_ds = DatasetHandlePool.open(
+                        dataset_name, multidim=True)
+                except Exception:
+                    _the_ds = None
+            if _the_ds is not None:
+                self._gdal_scan_group(
+                    _the_ret["variables"], _the_ds.GetRootGroup(),
+                    max_chunk_memory, _the_sample)
+            else:
+                self._gdal_scan_dataset_bands(
+                    _the_ret["variables"], dataset_name, max_chunk_memory,
+                    _the_sample)
+        except Exception as err:
+            _the_ret["error"]=str(err)
+        return _the_ret
+
+    def _gdal_scan_group(
+            self, variables:list, group, max_chunk_memory:int,
+            sample:tuple):
+        for _the_name in group.GetMDArrayNames() or []:
+            _the_var = dict()
+            _the_var["fullname"] = f"{group.GetFullName().rstrip('/')}/{_the_name}"
+            try:
+                _the_array = group.OpenMDArray(_the_name)
+                _the_dt = _the_array.GetDataType()
+                if (_the_dt.GetClass() != gdal.GEDTC_NUMERIC
+                    or gdal.GetDataTypeName(_the_dt.GetNumericDataType())
+                       not in self.float_data_type_names):
+                    continue
+                _the_var["fullname"] = _the_array.GetFullName()
+                _the_var["data_type"] = gdal.GetDataTypeName(
+                    _the_dt.GetNumericDataType())
+                _the_var["_FillValue"] = self._gdal_read_attribute(
+                    _the_array, "_FillValue")
+                _the_var["missing_value"] = self._gdal_read_attribute(
+                    _the_array, "missing_value")
+                self._count_nan_in_array(
+                    _the_var, _the_array, max_chunk_memory, sample)
+            except Exception as err:
+                _the_var["error"] = str(err)
+            variables.append(_the_var)
+        for _the_name in group.GetGroupNames() or []:
+            self._gdal_scan_group(
+                variables, group.OpenGroup(_the_name), max_chunk_memory,
+                sample)
+
+    def _gdal_read_attribute(self, array, name:str):
+        _the_attr = array.GetAttribute(name)
+        if _the_attr is None:
+            return None
+        _the_value = _the_attr.Read()
+        if isinstance(_the_value, (list, tuple)):
+            _the_value = _the_value[0] if _the_value else None
+        return self._to_json_value(_the_value)
+
+    def _count_nan_in_array(
+            self, variable:dict, array, max_chunk_memory:int,
+            sample:tuple):
+        _the_sizes = [_d.GetSize() for _d in array.GetDimensions()]
+        _the_blocks = array.GetBlockSize() or [0]*len(_the_sizes)
+        _the_itemsize = array.GetDataType().GetSize()
+        _the_chunk = self._get_chunk_shape(
+            _the_sizes, _the_blocks, _the_itemsize, max_chunk_memory)
+
+        def _read_chunk(index:int):
+            if not _the_sizes:
+                return DatasetProfiler.call("gdal.ReadAsArray", array.ReadAsArray)
+            _the_start, _the_count = self._get_chunk(index, _the_sizes, _the_chunk)
+            return DatasetProfiler.call(
+                "gdal.ReadAsArray", array.ReadAsArray,
+                array_start_idx=_the_start, count=_the_count)
+
+        self._scan_chunks(
+            variable, self._get_chunk_total(_the_sizes, _the_chunk), _read_chunk,
+            sample)
+
+    def _gdal_scan_dataset_bands(
+            self, variables:list, dataset_name:str, max_chunk_memory:int,
+            sample:tuple):
+        """
+            Scan the bands of a dataset or subdataset opened in classic
+            raster mode, e.g. for the drivers without multidimensional API.
+        """
+        _the_ds = DatasetHandlePool.open(dataset_name)
+        if _the_ds.RasterCount == 0:
+            for _the_sd_name, _the_desc in _the_ds.GetSubDatasets():
+                _the_var = dict()
+                _the_var["fullname"] = _the_sd_name
+                try:
+                    _the_sd = DatasetHandlePool.open(_the_sd_name)
+                    self._gdal_scan_bands(
+                        variables, _the_var, _the_sd, max_chunk_memory, sample)
+                except Exception as err:
+                    _the_var["error"] = str(err)
+                    variables.append(_the_var)
+            return
+        _the_var = dict()
+        _the_var["fullname"] = dataset_name
+        self._gdal_scan_bands(
+            variables, _the_var, _the_ds, max_chunk_memory, sample)
+
+    def _gdal_scan_bands(
+            self, variables:list, variable:dict, dataset,
+            max_chunk_memory:int, sample:tuple):
+        """
+            All bands of a (sub)dataset as one variable.
+        """
+        _the_band = dataset.GetRasterBand(1)
+        if gdal.GetDataTypeName(_the_band.DataType) not in self.float_data_type_names:
+            return
+        _the_md = dataset.GetMetadata() or dict()
+        _the_band_md = _the_band.GetMetadata() or dict()
+        variable["data_type"] = gdal.GetDataTypeName(_the_band.DataType)
+        variable["_FillValue"] = self._to_json_value(
+            self._get_metadata_number(_the_band_md, _the_md, "_FillValue",
+                                      _the_band.GetNoDataValue()))
+        variable["missing_value"] = self._to_json_value(
+            self._get_metadata_number(_the_band_md, _the_md, "missing_value"))
+        _the_xsize = dataset.RasterXSize
+        _the_ysize = dataset.RasterYSize
+        _the_bx, _the_by = _the_band.GetBlockSize()
+        _the_chunk = self._get_chunk_shape(
+            [_the_ysize, _the_xsize], [_the_by, _the_bx],
+            gdal.GetDataTypeSize(_the_band.DataType) // 8, max_chunk_memory)
+        _the_band_total = self._get_chunk_total([_the_ysize, _the_xsize], _the_chunk)
+
+        def _read_chunk(index:int):
+            _the_b = dataset.GetRasterBand(index // _the_band_total + 1)
+            _the_start, _the_count = self._get_chunk(
+                index % _the_band_total, [_the_ysize, _the_xsize], _the_chunk)
+            return DatasetProfiler.call(
+                "gdal.ReadAsArray", _the_b.ReadAsArray,
+                _the_start[1], _the_start[0], _the_count[1], _the_count[0])
+
+        self._scan_chunks(
+            variable, _the_band_total * dataset.RasterCount, _read_chunk,
+            sample)
+        variables.append(variable)
+
+    def _scan_chunks(
+            self, variable:dict, chunk_total:int, read_chunk, sample:tuple):
+        """
+            Count in all the chunks of a variable, or in a sample of them.
+            @param read_chunk: function reading the chunk of an index.
+            @param sample: (dataset_name, sample_fraction, sample_escalate).
+                The sample is seeded from the dataset and variable names, so
+                the granules of a collection sample different chunks, and a
+                run is reproducible.
+        """
+        _the_dataset_name, _the_fraction, _the_escalate = sample
+        _the_fills = self._get_fill_values(variable)
+        _the_indexes = list(range(chunk_total))
+        _the_sampling = None
+        if _the_fraction and _the_fraction < 1:
+            _the_sampling = DatasetSampling(
+                f'{_the_dataset_name}|{variable["fullname"]}')
+            _the_indexes = _the_sampling.sample_chunks(
+                chunk_total, _the_fraction)
+        _the_counts = self._new_counts()
+        _the_hits = list()
+        _the_sizes = list()
+        for _i in _the_indexes:
+            _the_count = _the_counts["count"]
+            _the_hits.append(
+                self._add_counts(_the_counts, read_chunk(_i), _the_fills))
+            _the_sizes.append(_the_counts["count"] - _the_count)
+        if _the_sampling is not None and len(_the_indexes) < chunk_total:
+            if _the_escalate and _the_counts["nan_count"] > 0:
+                _the_counts = self._new_counts()
+                for _i in range(chunk_total):
+                    self._add_counts(_the_counts, read_chunk(_i), _the_fills)
+                _the_counts["sampling"] = {
+                    "chunk_total": chunk_total, "escalated": True}
+            else:
+                _the_counts["sampling"] = {
+                    "chunk_total": chunk_total, "escalated": False,
+                    "nan_fraction": _the_sampling.get_ratio_bounds(
+                        _the_hits, _the_sizes, chunk_total)}
+        variable.update(_the_counts)
+
+    def _get_metadata_number(
+            self, band_metadata:dict, metadata:dict, name:str, default=None):
+        for _the_md in (band_metadata, metadata):
+            for _k, _v in _the_md.items():
+                if _k == name or _k.endswith("#"+name):
+                    try:
+                        return float(_v.strip("{}").split(",")[0])
+                    except ValueError:
+                        return default
+        return default
+
+    def _get_fill_values(self, variable:dict)->list:
+        """
+            _FillValue and missing_value that are numbers (not NaN).
+        """
+        _the_fills = list()
+        for _k in ("_FillValue", "missing_value"):
+            _the_value = variable.get(_k)
+            if isinstance(_the_value, (int, float)):
+                _the_fills.append(_the_value)
+        return _the_fills
+
+    def _new_counts(self)->dict:
+        return {"count": 0, "nan_count": 0, "fill_value_count": 0,
+                "chunk_count": 0}
+
+    def _add_counts(self, counts:dict, data, fills:list)->int:
+        """
+            @return: number of NaN values in the data.
+        """
+        _the_nan = int(np.count_nonzero(np.isnan(data)))
+        counts["count"] += data.size
+        counts["nan_count"] += _the_nan
+        if fills:
+            counts["fill_value_count"] += int(np.count_nonzero(
+                np.isin(data, fills)))
+        counts["chunk_count"] += 1
+        return _the_nan
+
+    def _get_chunk_shape(
+            self, sizes:list, blocks:list, itemsize:int,
+            max_chunk_memory:int)->list:
+        """
+            Shape of the chunks read, made of whole native blocks, growing from
+            the fastest varying (last) dimension while it fits in max_chunk_memory.
+            A block size of 0 (unknown) is taken as 1. Blocks larger than
+            max_chunk_memory are cut, from the slowest varying dimension.
+        """
+        if not sizes:
+            return []
+        _the_chunk = [min(_b, _s) if _b else 1 for _b, _s in zip(blocks, sizes)]
+        _the_budget = max(1, max_chunk_memory // max(1, itemsize))
+        for _i in range(len(sizes)):
+            _the_others = math.prod(_the_chunk) // _the_chunk[_i]
+            _the_chunk[_i] = max(1, min(_the_chunk[_i], _the_budget // _the_others))
+        for _i in reversed(range(len(sizes))):
+            _the_others = math.prod(_the_chunk) // _the_chunk[_i]
+            _the_max = _the_budget // _the_others
+            if _the_max >= sizes[_i]:
+                _the_chunk[_i] = sizes[_i]
+                continue
+            _the_base = _the_chunk[_i]
+            _the_chunk[_i] = max(_the_base, (_the_max // _the_base) * _the_base)
+            break
+        return _the_chunk
+
+    def _get_chunk_total(self, sizes:list, chunk:list)->int:
+        """
+            Number of chunks of a variable. A scalar is one chunk.
+        """
+        return math.prod(-(-_s // _c) if _c else 0
+                         for _s, _c in zip(sizes, chunk))
+
+    def _get_chunk(self, index:int, sizes:list, chunk:list)->tuple:
+        """
+            (start, count) of the chunk of an index, in row-major order.
+        """
+        _the_start = [0]*len(sizes)
+        _the_count = [0]*len(sizes)
+        for _i in reversed(range(len(sizes))):
+            _the_n = -(-sizes[_i] // chunk[_i])
+            _the_start[_i] = (index % _the_n) * chunk[_i]
+            _the_count[_i] = min(chunk[_i], sizes[_i] - _the_start[_i])
+            index //= _the_n
+        return _the_start, _the_count
+
+    @staticmethod
+    def _to_json_value(value):
+        """
+            Number for json, with NaN given as "NaN".
+        """
+        if value is None:
+            return None
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return str(value)
+        if math.isnan(value):
+            return "NaN"
+        return value
@@ -8,6 +8,7 @@
 """
 import re
 import os
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
 
 class FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers:
     """
@@ -67,17 +68,30 @@ class FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers:
             dataset_crid_minor_group=dataset_crid_minor_group,
             dataset_crid_patch=dataset_crid_patch,
             dataset_crid_patch_group=dataset_crid_patch_group)
-        _the_ret['valid']=dict()
-        _the_ret["valid"]["message"]=""
         if (not dataset_crid or
             not dataset_crid_major or
             not dataset_crid_minor or 
             not dataset_crid_patch):
+            _the_ret['valid']=dict()
+            _the_ret["valid"]["message"]=""
             _the_ret["valid"]["skip"]=True
-        else:
-            _the_ret["valid"]["skip"]=False
-            self._validate(_the_ret)
-        return _the_ret
+            return _the_ret
+        return self.validate_dataname_crid_partition(_the_ret)
+
+    def validate_dataname_crid_partition(
+            self,
+            crid_partition:dict)->dict:
+        """
+            Verify the partition of a filename from get_dataname_crid_partitions
+            (or from FilenameDatasetBatchAnalysis.get_crid_partitions), with all
+            the crid patterns set.
+            @return: crid_partition, with "valid" as in valid_dataname_crid_partitions.
+        """
+        crid_partition['valid']=dict()
+        crid_partition["valid"]["message"]=""
+        crid_partition["valid"]["skip"]=False
+        self._validate(crid_partition)
+        return crid_partition
 
     def _validate(
             self,
@@ -154,7 +168,8 @@ class FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers:
         # check order of major, minor, patch
         _s = ".*" + _p["major"] + ".*" + _p["minor"] + ".*" + _p["patch"] + ".*"
         _pattern = re.compile(_s)
-        _m = re.match(_pattern, _p["crid"])
+        with DatasetProfiler.timer("regex"):
+            _m = re.match(_pattern, _p["crid"])
         if not _m:
             _the_message = _the_message + "Incorrect order of major, minor, and patch in CRID."
             _v["status"] = False
@@ -242,7 +257,8 @@ class FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers:
     def _gdal_extract_from_filename_using_regex(
             self, pattern:str, filename:str)->str:
         _p = re.compile(pattern)
-        _f = re.findall(_p,filename)
+        with DatasetProfiler.timer("regex"):
+            _f = re.findall(_p,filename)
         if _f:
             if len(_f) > 1:
                 print("Warning: ambiguous pattern for id: pattern="+
@@ -256,7 +272,8 @@ class FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers:
             group_name:str,
             substring:str)->str:
         _p = re.compile(pattern)
-        _f = re.search(_p,substring)
+        with DatasetProfiler.timer("regex"):
+            _f = re.search(_p,substring)
         if (_f and 
             group_name in _f.groupdict()):
             return _f[group_name]
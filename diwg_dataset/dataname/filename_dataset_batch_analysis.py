@@ -0,0 +1,252 @@
+"""
+    Batch analysis of granule filenames.
+
+    The filename checks never open the granules. For large collections the
+    filenames are analyzed together and the results are returned in columns
+    (one list per field, one row per filename or per token) instead of one
+    dict per granule. It is used by the collection checks on filenames with
+    --dataset-batch (uniqueness, CRID partitions, date-time fields and file
+    extensions).
+"""
+import os
+import re
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.dataname.filename_dataset_date_time_information_in_granule_filenames import (
+    FilenameDatasetDateTimeInformationInGranuleFilenames
+)
+
+class FilenameDatasetBatchAnalysis:
+    """
+        Columnar results of the filename checks for a list of dataset names.
+    """
+    # separator of the filenames scanned together, never part of a token
+    row_separator = "\n"
+
+    def get_filenames(self, dataset_names:list)->dict:
+        """
+            Granule filenames of dataset or subdataset names.
+            @return:
+            {
+                "dataset_name": ['NETCDF:"/some/path/example.nc"://group/var', ...],
+                "filename": ["example.nc", ...]
+            }
+        """
+        _the_names = list(dataset_names)
+        return {
+            "dataset_name": _the_names,
+            "filename": [os.path.basename(self._get_file(_n)) for _n in _the_names]
+        }
+
+    def get_extensions(self, dataset_names:list)->dict:
+        """
+            Extensions of the granule filenames.
+            @return:
+            {
+                "dataset_name": ['NETCDF:"/some/path/example.nc"://group/var', ...],
+                "file": ["/some/path/example.nc", ...],
+                "filename": ["example.nc", ...],
+                "extension": [".nc", ...]
+            }
+        """
+        _the_ret = self.get_filenames(dataset_names)
+        _the_ret["file"] = [self._get_file(_n) for _n in _the_ret["dataset_name"]]
+        _the_ret["extension"] = [
+            os.path.splitext(_f)[1] for _f in _the_ret["filename"]]
+        return _the_ret
+
+    def get_partitions(
+            self, dataset_names:list,
+            dataset_id:str=None,
+            dataset_crid:str=None,
+            dataset_datetime:str=None,
+            dataset_pdt:str=None)->dict:
+        """
+            Partitions of the granule filenames, as in
+            FilenameDatasetEnsureGranuleFilenameUniqueness.get_dataname_partitions.
+            A column is only given for a pattern that is set.
+            @return:
+            {
+                "dataset_name": ["/some/path/SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5", ...],
+                "filename": ["SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5", ...],
+                "id": ["SMAP_L4_SM_gph", ...],
+                "crid": ["Vv5014_001", ...],
+                "datetime": ["20200915T193000", ...],
+                "pdt": ["__.h5", ...]
+            }
+        """
+        _the_ret = self.get_filenames(dataset_names)
+        for _the_key, _the_pattern in (("id", dataset_id),
+                                       ("crid", dataset_crid),
+                                       ("datetime", dataset_datetime),
+                                       ("pdt", dataset_pdt)):
+            if _the_pattern:
+                _the_ret[_the_key] = self._extract_first_match(
+                    _the_pattern, _the_ret["filename"], _the_key)
+        return _the_ret
+
+    def get_crid_partitions(
+            self, dataset_names:list,
+            dataset_crid:str,
+            dataset_crid_major:str,
+            dataset_crid_major_group:str,
+            dataset_crid_minor:str,
+            dataset_crid_minor_group:str,
+            dataset_crid_patch:str,
+            dataset_crid_patch_group:str)->dict:
+        """
+            CRID partitions of the granule filenames, as in
+            FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers.get_dataname_crid_partitions.
+            @return:
+            {
+                "dataset_name": ["/some/path/SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5", ...],
+                "filename": ["SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5", ...],
+                "crid": ["Vv5014_001", ...],
+                "major": ["v5014", ...],
+                "minor": ["001", ...],
+                "patch": ["", ...]
+            }
+            major, minor and patch are None if no crid is found in the filename.
+        """
+        _the_ret = self.get_filenames(dataset_names)
+        _the_ret["crid"] = self._extract_first_match(
+            dataset_crid, _the_ret["filename"], "crid")
+        for _the_key, _the_pattern, _the_group in (
+                ("major", dataset_crid_major, dataset_crid_major_group),
+                ("minor", dataset_crid_minor, dataset_crid_minor_group),
+                ("patch", dataset_crid_patch, dataset_crid_patch_group)):
+            _the_search = re.compile(_the_pattern).search
+            _the_column = list()
+            for _the_crid in _the_ret["crid"]:
+                if not _the_crid:
+                    _the_column.append(None)
+                    continue
+                with DatasetProfiler.timer("regex"):
+                    _m = _the_search(_the_crid)
+                if _m and _the_group in _m.groupdict():
+                    _the_column.append(_m[_the_group])
+                else:
+                    _the_column.append("")
+            _the_ret[_the_key] = _the_column
+        return _the_ret
+
+    def get_iso8601_tokens(self, filenames:list)->dict:
+        """
+            ISO 8601 date-time tokens auto-detected in the filenames, as in
+            FilenameDatasetDateTimeInformationInGranuleFilenames, for all the
+            filenames in one scan.
+            @return: one row per token, by filename (row) and start.
+            {
+                "row": [0, 0, ...],
+                "token": ["20101210T135954Z", "20130525T172725Z", ...],
+                "start": [20, 42, ...],
+                "end": [36, 58, ...],
+                "format": [1, 1, ...]
+            }
+            format is the order number in iso8601_regs.
+        """
+        _the_checker = FilenameDatasetDateTimeInformationInGranuleFilenames()
+        _the_ret = {"row": [], "token": [], "start": [], "end": [], "format": []}
+        if not filenames:
+            return _the_ret
+        _the_text = self.row_separator.join(filenames)
+        # offsets of the first character of each filename in the text
+        _the_offsets = list()
+        _the_offset = 0
+        for _f in filenames:
+            _the_offsets.append(_the_offset)
+            _the_offset += len(_f) + len(self.row_separator)
+        _the_offsets.append(_the_offset)
+
+        # the tokens are found by start, so the filenames are met in order
+        _the_row = 0
+        _the_tokens = list()
+        for _start, _end, _format in _the_checker.scan_iso8601_tokens(_the_text):
+            if _start >= _the_offsets[_the_row+1]:
+                self._add_row_tokens(
+                    _the_ret, _the_checker, filenames, _the_row, _the_tokens)
+                while _start >= _the_offsets[_the_row+1]:
+                    _the_row += 1
+                _the_tokens = list()
+            _the_tokens.append(
+                (_start - _the_offsets[_the_row],
+                 _end - _the_offsets[_the_row], _format))
+        self._add_row_tokens(
+            _the_ret, _the_checker, filenames, _the_row, _the_tokens)
+        return _the_ret
+
+    def get_row_tokens(self, tokens:dict, row_count:int)->list:
+        """
+            Tokens of each filename, from get_iso8601_tokens.
+            @return: one list of (start, end, format) per filename, e.g. for the
+                iso8601_tokens of
+                FilenameDatasetDateTimeInformationInGranuleFilenames.validate_dataname_date_time_information.
+        """
+        _the_ret = [list() for _ in range(row_count)]
+        for _the_row, _start, _end, _format in zip(
+                tokens["row"], tokens["start"], tokens["end"], tokens["format"]):
+            _the_ret[_the_row].append((_start, _end, _format))
+        return _the_ret
+
+    def get_duplicate_rows(self, values:list)->dict:
+        """
+            Rows of the values found more than once, e.g. for the "filename"
+            column.
+            @return:
+            {
+                "SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5": [0, 7],
+                ...
+            }
+            in the order of the first row of each value.
+        """
+        _the_rows = dict()
+        for _i, _v in enumerate(values):
+            _the_rows.setdefault(_v, []).append(_i)
+        return {_v: _r for _v, _r in _the_rows.items() if len(_r) > 1}
+
+    def _add_row_tokens(
+            self, ret:dict,
+            checker:FilenameDatasetDateTimeInformationInGranuleFilenames,
+            filenames:list, row:int, tokens:list):
+        """
+            Add the tokens of a filename selected as its date-time information.
+        """
+        for _start, _end, _format in checker.select_iso8601_tokens(tokens):
+            ret["row"].append(row)
+            ret["token"].append(filenames[row][_start:_end])
+            ret["start"].append(_start)
+            ret["end"].append(_end)
+            ret["format"].append(_format)
+
+    def _extract_first_match(
+            self, pattern:str, filenames:list, key:str)->list:
+        """
+            First match of the pattern in each filename, "" if none.
+            Filenames with more than one match are reported in one warning.
+        """
+        _the_findall = re.compile(pattern).findall
+        _the_ret = list()
+        _the_ambiguous = 0
+        for _f in filenames:
+            with DatasetProfiler.timer("regex"):
+                _the_found = _the_findall(_f)
+            if not _the_found:
+                _the_ret.append("")
+                continue
+            if len(_the_found) > 1:
+                _the_ambiguous += 1
+            _the_ret.append(_the_found[0])
+        if _the_ambiguous:
+            print(f"Warning: ambiguous pattern for {key}: pattern={pattern} "
+                  f"in {_the_ambiguous} filenames")
+        return _the_ret
+
+    def _get_file(self, dataset_name:str)->str:
+        """
+            Granule file of a dataset or subdataset name
+            (e.g. 'NETCDF:"/some/path/test.nc"://group/variable1').
+        """
+        return DatasetMetadataSnapshot.parse_dataset_name(
+            dataset_name)[1] or dataset_name
@@ -5,7 +5,10 @@
 
     Partition of CRID & verify valid.
 """
-import glob
+from diwg_dataset.common.dataset_collection import DatasetCollection
+from diwg_dataset.dataname.filename_dataset_batch_analysis import (
+    FilenameDatasetBatchAnalysis
+)
 from diwg_dataset.dataname.filename_dataset_adopt_semantically_rich_dataset_release_identifiers import (
     FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers
 )
@@ -24,9 +27,19 @@ class FilenameDatasetCollectionAdoptSemanticallyRichDatasetReleaseIdentifiers:
             dataset_crid_minor:str=None,
             dataset_crid_minor_group:str="major",
             dataset_crid_patch:str=None,
-            dataset_crid_patch_group:str="patch")->dict:
+            dataset_crid_patch_group:str="patch",
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            dataset_batch:bool=False)->dict:
         """
             Parition of CRID & verify if it has all Major, Minor, & Patch components.
+            @param dataset_batch: partition the CRID of all the filenames together in
+                columns, without workers and cache.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @return: 
             {
             collection_name: "thecollection_list.file",
@@ -65,7 +78,11 @@ class FilenameDatasetCollectionAdoptSemanticallyRichDatasetReleaseIdentifiers:
             dataset_crid_minor=dataset_crid_minor,
             dataset_crid_minor_group=dataset_crid_minor_group,
             dataset_crid_patch=dataset_crid_patch,
-            dataset_crid_patch_group=dataset_crid_patch_group)
+            dataset_crid_patch_group=dataset_crid_patch_group,
+            dataset_workers=dataset_workers,
+            dataset_cache=dataset_cache,
+            dataset_cache_hash=dataset_cache_hash,
+            dataset_batch=dataset_batch)
         _datasets = _ret['datasets']
         _new_ds = list()
         _ret['datasets'] = _new_ds
@@ -92,9 +109,19 @@ class FilenameDatasetCollectionAdoptSemanticallyRichDatasetReleaseIdentifiers:
             dataset_crid_minor:str=None,
             dataset_crid_minor_group:str="major",
             dataset_crid_patch:str=None,
-            dataset_crid_patch_group:str="patch")->dict:
+            dataset_crid_patch_group:str="patch",
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            dataset_batch:bool=False)->dict:
         """
             Parition of CRID & verify if it has all Major, Minor, & Patch components.
+            @param dataset_batch: partition the CRID of all the filenames together in
+                columns, without workers and cache.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @return: 
             {
             collection_name: "thecollection_list.file",
@@ -135,33 +162,68 @@ class FilenameDatasetCollectionAdoptSemanticallyRichDatasetReleaseIdentifiers:
         else:
             _the_ret["valid"]["skip"] = False
 
+        if dataset_batch:
+            try:
+                self._get_crid_partitions_batch(
+                    _the_ret,
+                    DatasetCollection(dataset_name_listfile).get_dataset_names(),
+                    dataset_crid=dataset_crid,
+                    dataset_crid_major=dataset_crid_major,
+                    dataset_crid_major_group=dataset_crid_major_group,
+                    dataset_crid_minor=dataset_crid_minor,
+                    dataset_crid_minor_group=dataset_crid_minor_group,
+                    dataset_crid_patch=dataset_crid_patch,
+                    dataset_crid_patch_group=dataset_crid_patch_group)
+            except Exception as err:
+                _the_ret["error"]=str(err)
+            return _the_ret
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dmp = FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers()
-                        _the_ds = dmp.valid_dataname_crid_partitions(
-                            dataset_name=_the_sfile,
-                            dataset_crid=dataset_crid,
-                            dataset_crid_major=dataset_crid_major,
-                            dataset_crid_major_group=dataset_crid_major_group,
-                            dataset_crid_minor=dataset_crid_minor,
-                            dataset_crid_minor_group=dataset_crid_minor_group,
-                            dataset_crid_patch=dataset_crid_patch,
-                            dataset_crid_patch_group=dataset_crid_patch_group)
-                        if _the_ds["valid"]["skip"]:
-                            continue
-                        if _the_ds["valid"]["status"]:
-                            continue
-                        _the_ret["datasets"].append(_the_ds)
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers,
+                    "valid_dataname_crid_partitions",
+                    dataset_crid=dataset_crid,
+                    dataset_crid_major=dataset_crid_major,
+                    dataset_crid_major_group=dataset_crid_major_group,
+                    dataset_crid_minor=dataset_crid_minor,
+                    dataset_crid_minor_group=dataset_crid_minor_group,
+                    dataset_crid_patch=dataset_crid_patch,
+                    dataset_crid_patch_group=dataset_crid_patch_group):
+                if "valid" not in _the_ds:
+                    _the_ret["datasets"].append(_the_ds)
+                    continue
+                if _the_ds["valid"]["skip"]:
+                    continue
+                if _the_ds["valid"]["status"]:
+                    continue
+                _the_ret["datasets"].append(_the_ds)
         except Exception as err:
             _the_ret["error"]=str(err)
 
         return _the_ret
+
+    def _get_crid_partitions_batch(
+            self, ret:dict, dataset_names:list, **patterns):
+        """
+            Validate the CRID partitions of all the filenames in columns.
+            Only the invalid datasets are kept, as in get_dataname_crid_partitions.
+        """
+        _the_columns = FilenameDatasetBatchAnalysis().get_crid_partitions(
+            dataset_names, **patterns)
+        _the_checker = FilenameDatasetAdoptSemanticallyRichDatasetReleaseIdentifiers()
+        for _the_row, _the_name in enumerate(_the_columns["dataset_name"]):
+            _the_ds = dict()
+            _the_ds["dataset_name"] = _the_name
+            _the_ds["partition"] = {
+                "filename": _the_columns["filename"][_the_row],
+                "crid": _the_columns["crid"][_the_row]}
+            if _the_ds["partition"]["crid"]:
+                for _the_key in ("major", "minor", "patch"):
+                    _the_ds["partition"][_the_key] = _the_columns[_the_key][_the_row]
+            _the_checker.validate_dataname_crid_partition(_the_ds)
+            if _the_ds["valid"]["skip"] or _the_ds["valid"]["status"]:
+                continue
+            ret["datasets"].append(_the_ds)
@@ -5,7 +5,10 @@
 
     verify if the dataset (granule) filename has proper date/time fields.
 """
-import glob
+from diwg_dataset.common.dataset_collection import DatasetCollection
+from diwg_dataset.dataname.filename_dataset_batch_analysis import (
+    FilenameDatasetBatchAnalysis
+)
 from diwg_dataset.dataname.filename_dataset_date_time_information_in_granule_filenames import (
     FilenameDatasetDateTimeInformationInGranuleFilenames
 )
@@ -23,12 +26,22 @@ class FilenameDatasetCollectionDateTimeInformationInGranuleFilenames:
             dataset_pdt:str=None,
             dataset_pdt_group:str=None,
             dataset_datetime_fields:str=None,
-            dataset_datetime_fields_groups:str=None)->dict:
+            dataset_datetime_fields_groups:str=None,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            dataset_batch:bool=False)->dict:
         """
             Extracft datetime information from the granule filename.
             If no datetime parameters are passed, temporal extent will be assumed one date
             but interval if there is any date-time is automatically extracted.
             @param dataset_name_listfile: Full path to a list file of granule collection.
+            @param dataset_batch: detect the ISO 8601 tokens of all the filenames together
+                in columns, without workers and cache.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @param dataset_datetime: a RegEx pattern to extract temporal information. It can be
                 a pattern to retrieve one datetime or a temporal extent (start to end)
             @param dataset_datetime_group: a list of group names up to two elements used in 
@@ -96,7 +109,11 @@ class FilenameDatasetCollectionDateTimeInformationInGranuleFilenames:
             dataset_pdt=dataset_pdt,
             dataset_pdt_group=dataset_pdt_group,
             dataset_datetime_fields=dataset_datetime_fields,
-            dataset_datetime_fields_groups=dataset_datetime_fields_groups)
+            dataset_datetime_fields_groups=dataset_datetime_fields_groups,
+            dataset_workers=dataset_workers,
+            dataset_cache=dataset_cache,
+            dataset_cache_hash=dataset_cache_hash,
+            dataset_batch=dataset_batch)
         _datasets = _ret['datasets']
         _new_ds = list()
         _ret['datasets'] = _new_ds
@@ -122,12 +139,22 @@ class FilenameDatasetCollectionDateTimeInformationInGranuleFilenames:
             dataset_pdt:str=None,
             dataset_pdt_group:str=None,
             dataset_datetime_fields:str=None,
-            dataset_datetime_fields_groups:str=None)->dict:
+            dataset_datetime_fields_groups:str=None,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            dataset_batch:bool=False)->dict:
         """
             Extracft datetime information from the granule filename.
             If no datetime parameters are passed, temporal extent will be assumed one date
             but interval if there is any date-time is automatically extracted.
             @param dataset_name_listfile: Full path to a list file of granule collection.
+            @param dataset_batch: detect the ISO 8601 tokens of all the filenames together
+                in columns, without workers and cache.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @param dataset_datetime: a RegEx pattern to extract temporal information. It can be
                 a pattern to retrieve one datetime or a temporal extent (start to end)
             @param dataset_datetime_group: a list of group names up to two elements used in 
@@ -190,28 +217,61 @@ class FilenameDatasetCollectionDateTimeInformationInGranuleFilenames:
         _the_ret["collection_name"] = dataset_name_listfile
         _the_ret["datasets"] = list()
 
+        if dataset_batch:
+            try:
+                self._get_validate_batch(
+                    _the_ret,
+                    DatasetCollection(dataset_name_listfile).get_dataset_names(),
+                    dataset_datetime=dataset_datetime,
+                    dataset_datetime_group=dataset_datetime_group,
+                    dataset_pdt=dataset_pdt,
+                    dataset_pdt_group=dataset_pdt_group,
+                    dataset_datetime_fields=dataset_datetime_fields,
+                    dataset_datetime_fields_groups=dataset_datetime_fields_groups)
+            except Exception as err:
+                _the_ret["error"]=str(err)
+            return _the_ret
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dmp = FilenameDatasetDateTimeInformationInGranuleFilenames()
-                        _the_ret["datasets"].append(
-                            dmp.validate_dataname_date_time_information(
-                                dataset_name=_the_sfile,
-                                dataset_datetime=dataset_datetime,
-                                dataset_datetime_group=dataset_datetime_group,
-                                dataset_pdt=dataset_pdt,
-                                dataset_pdt_group=dataset_pdt_group,
-                                dataset_datetime_fields=dataset_datetime_fields,
-                                dataset_datetime_fields_groups=dataset_datetime_fields_groups))
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    FilenameDatasetDateTimeInformationInGranuleFilenames,
+                    "validate_dataname_date_time_information",
+                    dataset_datetime=dataset_datetime,
+                    dataset_datetime_group=dataset_datetime_group,
+                    dataset_pdt=dataset_pdt,
+                    dataset_pdt_group=dataset_pdt_group,
+                    dataset_datetime_fields=dataset_datetime_fields,
+                    dataset_datetime_fields_groups=dataset_datetime_fields_groups):
+                _the_ret["datasets"].append(_the_ds)
         except Exception as err:
             _the_ret["error"]=str(err)
 
         return _the_ret
+
+    def _get_validate_batch(
+            self, ret:dict, dataset_names:list,
+            dataset_datetime:str=None, **patterns):
+        """
+            Validate the filenames with the ISO 8601 tokens of all the filenames
+            detected in columns.
+        """
+        _the_batch = FilenameDatasetBatchAnalysis()
+        _the_columns = _the_batch.get_filenames(dataset_names)
+        _the_row_tokens = [None] * len(_the_columns["dataset_name"])
+        # the tokens are only auto-detected without a date-time pattern
+        if not dataset_datetime:
+            _the_row_tokens = _the_batch.get_row_tokens(
+                _the_batch.get_iso8601_tokens(_the_columns["filename"]),
+                len(_the_columns["dataset_name"]))
+        _the_checker = FilenameDatasetDateTimeInformationInGranuleFilenames()
+        for _the_name, _the_tokens in zip(
+                _the_columns["dataset_name"], _the_row_tokens):
+            ret["datasets"].append(
+                _the_checker.validate_dataname_date_time_information(
+                    dataset_name=_the_name,
+                    dataset_datetime=dataset_datetime,
+                    iso8601_tokens=_the_tokens,
+                    **patterns))
@@ -5,7 +5,13 @@
 
     filename unique.
 """
-import glob
+import json
+import sqlite3
+from collections import defaultdict
+from diwg_dataset.common.dataset_collection import DatasetCollection
+from diwg_dataset.dataname.filename_dataset_batch_analysis import (
+    FilenameDatasetBatchAnalysis
+)
 from diwg_dataset.dataname.filename_dataset_ensure_granule_filename_uniqueness_across_different_dataset_releases import (
     FilenameDatasetEnsureGranuleFilenameUniqueness
 )
@@ -21,10 +27,24 @@ class FilenameDatasetCollectionEnsureGranuleFilenameUniqueness:
             dataset_id:str=None,
             dataset_crid:str=None,
             dataset_datetime:str=None,
-            dataset_pdt:str=None)->dict:
+            dataset_pdt:str=None,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            dataset_uniqueness_db:str=None,
+            dataset_batch:bool=False)->dict:
         """
             Check the uniquess of filename in a collection over different releases.
             @param dataset_name_listfile: Full path to a file of granule collection.
+            @param dataset_uniqueness_db: SQLite file for screening the duplicates out of
+                memory, for collections too large to screen in memory. The table in the
+                file is replaced in each run.
+            @param dataset_batch: partition all the filenames together in columns, without
+                workers and cache. Only the duplicated datasets are given as dicts.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @param dataset_id: a unique dataset identifier
                 or a regex expression for such id to be extracted from the filename or 
                 to be matched in the filename. Multiple patterns are combined with "|".
@@ -56,18 +76,62 @@ class FilenameDatasetCollectionEnsureGranuleFilenameUniqueness:
                                     "datetime": "20200915T193000",
                                     "pdt":"__.h5")
                     }
+                ],
+            duplicate_groups: [
+                    {
+                        "filename":"SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5",
+                        "dataset_names":[
+                            "/some/path/SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5",
+                            "/other/path/SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5"
+                        ]
+                    }
                 ]
             }
         """
         _the_ret = dict()
         _the_ret["collection_name"] = dataset_name_listfile
         _the_ret["datasets"] = list()
+        _the_ret["duplicate_groups"] = list()
+        if dataset_batch and not dataset_uniqueness_db:
+            try:
+                self._screen_duplicates_batch(
+                    _the_ret,
+                    DatasetCollection(dataset_name_listfile).get_dataset_names(),
+                    dataset_id=dataset_id,
+                    dataset_crid=dataset_crid,
+                    dataset_datetime=dataset_datetime,
+                    dataset_pdt=dataset_pdt)
+            except Exception as err:
+                _the_ret["error"]=str(err)
+            return _the_ret
+        if dataset_uniqueness_db:
+            try:
+                _the_collection = DatasetCollection(
+                    dataset_name_listfile, dataset_workers=dataset_workers,
+                    dataset_cache=dataset_cache,
+                    dataset_cache_hash=dataset_cache_hash)
+                self._screen_duplicates_external(
+                    _the_ret,
+                    _the_collection.process_datasets(
+                        FilenameDatasetEnsureGranuleFilenameUniqueness,
+                        "get_dataname_partitions",
+                        dataset_id=dataset_id,
+                        dataset_crid=dataset_crid,
+                        dataset_datetime=dataset_datetime,
+                        dataset_pdt=dataset_pdt),
+                    dataset_uniqueness_db)
+            except Exception as err:
+                _the_ret["error"]=str(err)
+            return _the_ret
         _the_c = self.get_dataname_partitions(
             dataset_name_listfile=dataset_name_listfile,
             dataset_id=dataset_id,
             dataset_crid=dataset_crid,
             dataset_datetime=dataset_datetime,
-            dataset_pdt=dataset_pdt
+            dataset_pdt=dataset_pdt,
+            dataset_workers=dataset_workers,
+            dataset_cache=dataset_cache,
+            dataset_cache_hash=dataset_cache_hash
         )
         if "error" in _the_c:
             _the_ret["error"]=_the_c["error"]
@@ -77,31 +141,112 @@ class FilenameDatasetCollectionEnsureGranuleFilenameUniqueness:
 
     def _screen_duplicates(
             self, dup_ret:dict, dataset_list:dict):
-        _uniq_list = list()
-        _dup_set = set()
-
+        _the_groups = defaultdict(list)
         for k in dataset_list:
-            _the_f = k["partition"]["filename"]
-            if _the_f not in _uniq_list:
-                _uniq_list.append(_the_f)
-            else:
-                _dup_set.add(_the_f)
-        if not _dup_set:
-            return    
+            _the_f = k.get("partition", {}).get("filename")
+            if _the_f is None:
+                continue
+            _the_groups[_the_f].append(k["dataset_name"])
+        _dup_set = set(f for f, names in _the_groups.items() if len(names) > 1)
         for k in dataset_list:
-            _the_f = k["partition"]["filename"]
+            _the_f = k.get("partition", {}).get("filename")
+            if _the_f is None:
+                if "error" in k:
+                    dup_ret["datasets"].append(k)
+                continue
             if _the_f in _dup_set:
                 dup_ret["datasets"].append(k)
+        for _the_f, _the_names in _the_groups.items():
+            if _the_f in _dup_set:
+                dup_ret["duplicate_groups"].append(
+                    {"filename": _the_f, "dataset_names": _the_names})
+
+    def _screen_duplicates_batch(
+            self, dup_ret:dict, dataset_names:list, **patterns):
+        """
+            Screen the duplicates with the partitions of all the filenames
+            in columns.
+        """
+        _the_batch = FilenameDatasetBatchAnalysis()
+        _the_columns = _the_batch.get_partitions(dataset_names, **patterns)
+        _the_partition_keys = [k for k in _the_columns if k != "dataset_name"]
+        _the_dups = _the_batch.get_duplicate_rows(_the_columns["filename"])
+        _the_rows = sorted(_r for _rows in _the_dups.values() for _r in _rows)
+        for _the_row in _the_rows:
+            _the_ds = dict()
+            _the_ds["dataset_name"] = _the_columns["dataset_name"][_the_row]
+            _the_ds["partition"] = {
+                k: _the_columns[k][_the_row] for k in _the_partition_keys}
+            dup_ret["datasets"].append(_the_ds)
+        for _the_f, _the_f_rows in _the_dups.items():
+            dup_ret["duplicate_groups"].append(
+                {"filename": _the_f,
+                 "dataset_names": [_the_columns["dataset_name"][_r]
+                                   for _r in _the_f_rows]})
+
+    def _screen_duplicates_external(
+            self, dup_ret:dict, datasets, db_file:str):
+        """
+            Screen the duplicates with the partitions stored in a SQLite file
+            instead of in memory.
+        """
+        _the_con = sqlite3.connect(db_file)
+        try:
+            _the_con.execute("DROP TABLE IF EXISTS partitions")
+            _the_con.execute(
+                "CREATE TABLE partitions ("
+                "seq INTEGER PRIMARY KEY, "
+                "filename TEXT, "
+                "dataset_name TEXT, "
+                "dataset TEXT)")
+            for k in datasets:
+                _the_f = k.get("partition", {}).get("filename")
+                if _the_f is None:
+                    if "error" in k:
+                        dup_ret["datasets"].append(k)
+                    continue
+                _the_con.execute(
+                    "INSERT INTO partitions (filename, dataset_name, dataset) "
+                    "VALUES (?, ?, ?)",
+                    (_the_f, k["dataset_name"], json.dumps(k)))
+            _the_con.execute(
+                "CREATE INDEX partitions_filename ON partitions (filename)")
+            _the_con.commit()
+            _the_dup_sql = (
+                "SELECT filename FROM partitions "
+                "GROUP BY filename HAVING COUNT(*) > 1")
+            for (_the_dataset,) in _the_con.execute(
+                    "SELECT dataset FROM partitions "
+                    f"WHERE filename IN ({_the_dup_sql}) ORDER BY seq"):
+                dup_ret["datasets"].append(json.loads(_the_dataset))
+            _the_group = None
+            for _the_f, _the_name in _the_con.execute(
+                    "SELECT filename, dataset_name FROM partitions "
+                    f"WHERE filename IN ({_the_dup_sql}) "
+                    "ORDER BY MIN(seq) OVER (PARTITION BY filename), seq"):
+                if _the_group is None or _the_group["filename"] != _the_f:
+                    _the_group = {"filename": _the_f, "dataset_names": []}
+                    dup_ret["duplicate_groups"].append(_the_group)
+                _the_group["dataset_names"].append(_the_name)
+        finally:
+            _the_con.close()
 
     def get_dataname_partitions(
             self,dataset_name_listfile:str,
             dataset_id:str=None,
             dataset_crid:str=None,
             dataset_datetime:str=None,
-            dataset_pdt:str=None)->dict:
+            dataset_pdt:str=None,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False)->dict:
         """
             Retrieve file partitions of datasets (granules) in a collection.
             @param dataset_name_listfile: Full path to a file of granule collection.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @param dataset_id: a unique dataset identifier
                 or a regex expression for such id to be extracted from the filename or 
                 to be matched in the filename. Multiple patterns are combined with "|".
@@ -141,24 +286,18 @@ class FilenameDatasetCollectionEnsureGranuleFilenameUniqueness:
         _the_ret["datasets"] = list()
 
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dmp = FilenameDatasetEnsureGranuleFilenameUniqueness()
-                        _the_ret["datasets"].append(
-                            dmp.get_dataname_partitions(
-                                dataset_name=_the_sfile,
-                                dataset_id=dataset_id,
-                                dataset_crid=dataset_crid,
-                                dataset_datetime=dataset_datetime,
-                                dataset_pdt=dataset_pdt))
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    FilenameDatasetEnsureGranuleFilenameUniqueness,
+                    "get_dataname_partitions",
+                    dataset_id=dataset_id,
+                    dataset_crid=dataset_crid,
+                    dataset_datetime=dataset_datetime,
+                    dataset_pdt=dataset_pdt):
+                _the_ret["datasets"].append(_the_ds)
         except Exception as err:
             _the_ret["error"]=str(err)
 
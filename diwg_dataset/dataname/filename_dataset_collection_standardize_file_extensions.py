@@ -5,7 +5,11 @@
 
     verify if the dataset (granule) filename has proper extension.
 """
-import glob
+import copy
+from diwg_dataset.common.dataset_collection import DatasetCollection
+from diwg_dataset.dataname.filename_dataset_batch_analysis import (
+    FilenameDatasetBatchAnalysis
+)
 from diwg_dataset.dataname.filename_dataset_standardize_file_extensions import (
     FilenameDatasetStandardizeFileExtensions
 )
@@ -16,9 +20,24 @@ class FilenameDatasetCollectionStandardizeFileExtensions:
 
             https://wiki.earthdata.nasa.gov/pages/viewpage.action?pageId=182297715
     """
-    def validate_dataname_extension(self,dataset_name_listfile:str)->dict:
+    def validate_dataname_extension(
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            extension_mode:str="info",
+            dataset_batch:bool=False)->dict:
         """
             Retrieve file extensions of datasets (granules) in a collection.
+            @param dataset_batch: get the extensions of all the filenames together in
+                columns, and the format once for each granule file (for the
+                subdatasets of a granule), without workers and cache.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
+            @param extension_mode: "info" or "signature", see
+                FilenameDatasetStandardizeFileExtensions.get_dataname_extension.
             @return: 
             {
             collection_name: "thecollection_list.file",
@@ -42,7 +61,12 @@ class FilenameDatasetCollectionStandardizeFileExtensions:
             }
         """
         _ret = self.get_dataname_extension(
-            dataset_name_listfile=dataset_name_listfile)
+            dataset_name_listfile=dataset_name_listfile,
+            dataset_workers=dataset_workers,
+            dataset_cache=dataset_cache,
+            dataset_cache_hash=dataset_cache_hash,
+            extension_mode=extension_mode,
+            dataset_batch=dataset_batch)
         _datasets = _ret['datasets']
         _new_ds = list()
         _ret['datasets'] = _new_ds
@@ -62,9 +86,24 @@ class FilenameDatasetCollectionStandardizeFileExtensions:
 
         return _ret
 
-    def get_dataname_extension(self,dataset_name_listfile:str)->dict:
+    def get_dataname_extension(
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            extension_mode:str="info",
+            dataset_batch:bool=False)->dict:
         """
             Retrieve file extensions of datasets (granules) in a collection.
+            @param dataset_batch: get the extensions of all the filenames together in
+                columns, and the format once for each granule file (for the
+                subdatasets of a granule), without workers and cache.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
+            @param extension_mode: "info" or "signature", see
+                FilenameDatasetStandardizeFileExtensions.get_dataname_extension.
             @return: 
             {
             collection_name: "thecollection_list.file",
@@ -95,21 +134,44 @@ class FilenameDatasetCollectionStandardizeFileExtensions:
         _the_ret["collection_name"] = dataset_name_listfile
         _the_ret["datasets"] = list()
 
+        if dataset_batch:
+            try:
+                self._get_dataname_extension_batch(
+                    _the_ret,
+                    DatasetCollection(dataset_name_listfile).get_dataset_names(),
+                    extension_mode=extension_mode)
+            except Exception as err:
+                _the_ret["error"]=str(err)
+            return _the_ret
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dmp = FilenameDatasetStandardizeFileExtensions()
-                        _the_ret["datasets"].append(
-                            dmp.get_dataname_extension(_the_sfile))
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    FilenameDatasetStandardizeFileExtensions, "get_dataname_extension",
+                    extension_mode=extension_mode):
+                _the_ret["datasets"].append(_the_ds)
         except Exception as err:
             _the_ret["error"]=str(err)
 
         return _the_ret
+
+    def _get_dataname_extension_batch(
+            self, ret:dict, dataset_names:list,
+            extension_mode:str="info"):
+        """
+            Extensions of all the filenames in columns, with the format of each
+            granule file found once.
+        """
+        _the_columns = FilenameDatasetBatchAnalysis().get_extensions(dataset_names)
+        _the_checker = FilenameDatasetStandardizeFileExtensions()
+        _the_files = dict()
+        for _the_name, _the_file in zip(
+                _the_columns["dataset_name"], _the_columns["file"]):
+            if _the_file not in _the_files:
+                _the_files[_the_file] = _the_checker.get_dataname_extension(
+                    _the_file, extension_mode=extension_mode)
+            _the_ds = copy.deepcopy(_the_files[_the_file])
+            _the_ds["dataset_name"] = _the_name
+            ret["datasets"].append(_the_ds)
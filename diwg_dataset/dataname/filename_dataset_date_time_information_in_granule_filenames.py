@@ -8,7 +8,11 @@
 """
 import os
 import re
-import dateutil.parser as duparser
+from functools import lru_cache
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.common.lazy_module import LazyModule
+
+duparser = LazyModule("dateutil.parser")
 
 class FilenameDatasetDateTimeInformationInGranuleFilenames:
     """
@@ -23,6 +27,26 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
                     r"(?P<YYYY>(19|20)[0-9]{2})(?P<MM>0[1-9]|1[1,2])(?P<DD>0[1-9]|[12][0-9]|3[01])T(?P<hh>0[1-9]|[1-5][0-9])Z",r"(?P<YYYY>(19|20)[0-9]{2})(?P<MM>0[1-9]|1[1,2])(?P<DD>0[1-9]|[12][0-9]|3[01])",
                     r"(?P<YYYY>(19|20)[0-9]{2})(?P<MM>0[1-9]|1[1,2])",
                     r"(?P<YYYY>(19|20)[0-9]{2})"]
+    # All the formats of iso8601_regs in one nested pattern: each format
+    # extends the next one in the list, e.g. YYYYMMDD extends YYYYMM. The optional
+    # parts are greedy, so the first format (in iso8601_regs) matching at a
+    # position is found. The format is known from the last group matched.
+    _iso8601_nested_rest = (
+        r"(?:(?P<MM>0[1-9]|1[1,2])"
+        r"(?:(?P<DD>0[1-9]|[12][0-9]|3[01])"
+        r"(?:T(?P<hh>0[1-9]|[1-5][0-9])"
+        r"(?:(?P<mm>0[1-9]|[1-5][0-9])"
+        r"(?:(?P<ss>0[1-9]|[1-5][0-9])"
+        r"(?:[,.](?P<f>[0-9]+))?)?)?Z)?)?)?")
+    _iso8601_nested = r"(?:19|20)[0-9]{2}" + _iso8601_nested_rest
+    # Only the first digit of the year is consumed, so the tokens overlapping
+    # are still found and the scan can skip to the next '1' or '2'.
+    iso8601_scanner = re.compile(
+        r"(?:1(?=9)|2(?=0))(?=(?P<token>[0-9]{3}" + _iso8601_nested_rest + "))")
+    iso8601_token_classifier = re.compile(_iso8601_nested)
+    # group matched last -> index in iso8601_regs
+    iso8601_group_formats = (("f", 0), ("ss", 1), ("mm", 2), ("hh", 3),
+                             ("DD", 4), ("MM", 5))
 
     def validate_dataname_date_time_information(
             self, dataset_name:str,
@@ -31,7 +55,8 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
             dataset_pdt:str=None,
             dataset_pdt_group:str=None,
             dataset_datetime_fields:str=None,
-            dataset_datetime_fields_groups:str=None)->dict:
+            dataset_datetime_fields_groups:str=None,
+            iso8601_tokens:list=None)->dict:
         """
             Extracft datetime information from the granule filename.
             If no datetime parameters are passed, temporal extent will be assumed one date
@@ -56,6 +81,9 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
                 ",". For example, 'group1_0;;group3_1,group3_2' would be for reg1, there is one 
                 group1_0. For reg2, there is no group. For reg3, there are two groups
                 - group3_1 and group3_2.
+            @param iso8601_tokens: ISO 8601 tokens of the filename already found, e.g. by
+                FilenameDatasetBatchAnalysis.get_iso8601_tokens, as (start, end, format)
+                tuples from select_iso8601_tokens. None to scan the filename.
             @return: 
             {
                 "dataset_name":"/some/path/DeepBlue-SeaWiFS_L2_20101210T135954Z_v004-20130525T172725Z.h5",
@@ -95,7 +123,8 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
             dataset_pdt=dataset_pdt,
             dataset_pdt_group=dataset_pdt_group,
             dataset_datetime_fields=dataset_datetime_fields,
-            dataset_datetime_fields_groups=dataset_datetime_fields_groups)
+            dataset_datetime_fields_groups=dataset_datetime_fields_groups,
+            iso8601_tokens=iso8601_tokens)
         _datetime_info["valid"] = dict()
         _datetime_info["valid"]["skip"] = False
         # set skip to True if no date_info found in filename
@@ -207,23 +236,21 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
         """
             @return: order number in iso8601_regs. -1 if not detected.
         """
-        _ret = list()
-        for _i, _v in enumerate(self.iso8601_regs):
-            if self._regex_pattern_match(pattern=_v, token=token):
-                _ret.append(_i)
-        return _ret
+        # the formats are exclusive of each other on a whole token, so at most
+        # one is found.
+        _m = self.iso8601_token_classifier.fullmatch(token)
+        if _m:
+            return [self._get_iso8601_format(_m)]
+        return list()
 
-    def _regex_pattern_match(
-            self, pattern:str, token:str)->bool:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_compiled_pattern(pattern:str)->re.Pattern:
         """
-            Do an exact match by attaching '^' and '$'.
-            @return: order number in iso8601_regs. -1 if not detected.
+            Compiled pattern, cached for the patterns from the command line
+            (--dataset-datetime, --dataset-pdt, --dataset-datetime-fields).
         """
-        _p = re.compile("^"+pattern+"$")
-        _m = re.match(_p,token)
-        if _m:
-            return True
-        return False
+        return re.compile(pattern)
 
     def _validate_dataname_date_time_information_fields_order(
             self, datetime_info:dict):
@@ -405,7 +432,8 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
             dataset_pdt:str=None,
             dataset_pdt_group:str=None,
             dataset_datetime_fields:str=None,
-            dataset_datetime_fields_groups:str=None)->dict:
+            dataset_datetime_fields_groups:str=None,
+            iso8601_tokens:list=None)->dict:
         """
             Extracft datetime information from the granule filename.
             If no datetime parameters are passed, temporal extent will be assumed one date
@@ -430,6 +458,9 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
                 ",". For example, 'group1_0;;group3_1,group3_2' would be for reg1, there is one 
                 group1_0. For reg2, there is no group. For reg3, there are two groups
                 - group3_1 and group3_2.
+            @param iso8601_tokens: ISO 8601 tokens of the filename already found, e.g. by
+                FilenameDatasetBatchAnalysis.get_iso8601_tokens, as (start, end, format)
+                tuples from select_iso8601_tokens. None to scan the filename.
             @return: 
             {
                 "dataset_name":"/some/path/DeepBlue-SeaWiFS_L2_20101210T135954Z_v004-20130525T172725Z.h5",
@@ -474,7 +505,8 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
                 dataset_pdt=dataset_pdt,
                 dataset_pdt_group=dataset_pdt_group,
                 dataset_datetime_fields=dataset_datetime_fields,
-                dataset_datetime_fields_groups=dataset_datetime_fields_groups)
+                dataset_datetime_fields_groups=dataset_datetime_fields_groups,
+                iso8601_tokens=iso8601_tokens)
         except Exception as err:
             _the_ret["error"]=str(err)
 
@@ -489,7 +521,8 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
             dataset_pdt:str=None,
             dataset_pdt_group:str=None,
             dataset_datetime_fields:str=None,
-            dataset_datetime_fields_groups:str=None):
+            dataset_datetime_fields_groups:str=None,
+            iso8601_tokens:list=None):
         """
             @param datetime_info: [In/Out] Hold the date/time information extracted
                 from filename.
@@ -513,6 +546,9 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
                 ",". For example, 'group1_0;;group3_1,group3_2' would be for reg1, there is one 
                 group1_0. For reg2, there is no group. For reg3, there are two groups
                 - group3_1 and group3_2.
+            @param iso8601_tokens: ISO 8601 tokens of the filename already found, e.g. by
+                FilenameDatasetBatchAnalysis.get_iso8601_tokens, as (start, end, format)
+                tuples from select_iso8601_tokens. None to scan the filename.
             @return: 
             {
                 "dataset_name":"/some/path/DeepBlue-SeaWiFS_L2_20101210T135954Z_v004-20130525T172725Z.h5",
@@ -588,14 +624,15 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
         # auto-detect all ISO8601 pattern
         if not dataset_datetime:
             self._gdal_auto_extract_iso8601_dateinfo_from_filename(
-                datetime_info,filename)
+                datetime_info,filename,iso8601_tokens)
 
     def _gdal_auto_extract_iso8601_dateinfo_from_filename(
             self,
             datetime_info:dict,
-            filename:str):
+            filename:str,
+            iso8601_tokens:list=None):
         _fields = self._gdal_auto_detect_iso8601_dateinfo_from_filename(
-            filename=filename)
+            filename=filename, iso8601_tokens=iso8601_tokens)
         if len(_fields)>0:
             _f = _fields[0]
             _f["field_name"] = "temporal_begin"
@@ -625,7 +662,7 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
         return False
 
     def _gdal_auto_detect_iso8601_dateinfo_from_filename(
-            self, filename:str)->list[dict]:
+            self, filename:str, iso8601_tokens:list=None)->list[dict]:
         """
             Detect ISO8601 format using regex. One by one from the following
             list. Stop if any match is found. Only for years between 1900 and 2099.
@@ -640,30 +677,81 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
             YYYY-MM                     r'(?P<YYYY>(19|20)[0-9]{2})(?P<MM>0[1-9]|1[1,2])'
             YYYY                        r'(?P<YYYY>(19|20)[0-9]{2})'
         """
-        
-        for _regstr in self.iso8601_regs:
-            _match = self._gdal_extract_fields_from_filename_using_regex_groups(
-                pattern=_regstr,
-                group_names=None,
-                filename=filename)
-            if _match:
-                return _match
-        return list()
-    
+        if iso8601_tokens is None:
+            iso8601_tokens = self.select_iso8601_tokens(
+                self.scan_iso8601_tokens(filename))
+        _ret = list()
+        for _start, _end, _format in iso8601_tokens:
+            _t = dict()
+            _t["field_name"] = ""
+            _t["token"] = filename[_start:_end]
+            _t["start"] = _start
+            _t["end"] = _end
+            _ret.append(_t)
+        return _ret
+
+    def scan_iso8601_tokens(
+            self, text:str)->list[tuple]:
+        """
+            Scan a filename (or filenames joined by a separator that is not
+            part of a token, e.g. a new line) once for the date-time tokens
+            of all the formats in iso8601_regs.
+            @return: list of (start, end, format index), by start. At each
+                start, the first format (in iso8601_regs) matching is given.
+        """
+        _ret = list()
+        with DatasetProfiler.timer("regex"):
+            for _m in self.iso8601_scanner.finditer(text):
+                _ret.append((_m.start(), _m.end("token"),
+                             self._get_iso8601_format(_m)))
+        return _ret
+
+    def select_iso8601_tokens(
+            self, tokens:list)->list[tuple]:
+        """
+            Tokens of a filename used as its date-time information, as with
+            the formats of iso8601_regs tried one by one: the first format with
+            any match, and all its non-overlapping matches from the left.
+            @param tokens: scan_iso8601_tokens of one filename.
+            @return: list of (start, end, format index), by start.
+        """
+        _ret = list()
+        if not tokens:
+            return _ret
+        _the_format = min(_t[2] for _t in tokens)
+        _the_end = 0
+        for _start, _end, _format in tokens:
+            if _format == _the_format and _start >= _the_end:
+                _ret.append((_start, _end, _format))
+                _the_end = _end
+        return _ret
+
+    def _get_iso8601_format(self, iso8601_match)->int:
+        """
+            @return: order number in iso8601_regs of a match of the nested pattern.
+        """
+        for _g, _format in self.iso8601_group_formats:
+            if iso8601_match.group(_g) is not None:
+                return _format
+        return len(self.iso8601_regs) - 1
+
     def _gdal_extract_fields_from_filename_using_regex_groups(
-            self, pattern:str,
+            self, pattern,
             group_names:str,
             filename:str)->list[dict]:
-        _p = re.compile(pattern)
+        """
+            @param pattern: a regex string or a compiled pattern.
+        """
+        _p = pattern
+        if isinstance(pattern, str):
+            _p = self._get_compiled_pattern(pattern)
         _groups = list()
         if group_names:
             _groups = group_names.split(",")
-        _f = re.finditer(_p,filename)
         _ret = list()
-        if not _f:
-            return _ret
-        for _i in _f:
-            _ret += self._gdal_extract_allgroups(_i, _groups)
+        with DatasetProfiler.timer("regex"):
+            for _i in _p.finditer(filename):
+                _ret += self._gdal_extract_allgroups(_i, _groups)
         return _ret
 
     def _gdal_extract_allgroups(
@@ -693,8 +781,9 @@ class FilenameDatasetDateTimeInformationInGranuleFilenames:
             self, pattern:str,
             group_name:str,
             substring:str)->str:
-        _p = re.compile(pattern)
-        _f = re.search(_p,substring)
+        _p = self._get_compiled_pattern(pattern)
+        with DatasetProfiler.timer("regex"):
+            _f = _p.search(substring)
         if (_f and 
             group_name in _f.groupdict()):
             return _f[group_name]
@@ -8,6 +8,7 @@
 """
 import re
 import os
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
 
 class FilenameDatasetEnsureGranuleFilenameUniqueness:
     """
@@ -89,7 +90,8 @@ class FilenameDatasetEnsureGranuleFilenameUniqueness:
     def _gdal_extract_from_filename_using_regex(
             self, pattern:str, filename:str)->str:
         _p = re.compile(pattern)
-        _f = re.findall(_p,filename)
+        with DatasetProfiler.timer("regex"):
+            _f = re.findall(_p,filename)
         if _f:
             if len(_f) > 1:
                 print("Warning: ambiguous pattern for id: pattern="+
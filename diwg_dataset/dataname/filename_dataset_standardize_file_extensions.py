@@ -7,7 +7,13 @@
 
 """
 import os
-from osgeo import gdal
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.dataset_signature import DatasetSignature
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
 
 class FilenameDatasetStandardizeFileExtensions:
     """
@@ -16,9 +22,16 @@ class FilenameDatasetStandardizeFileExtensions:
 
             https://wiki.earthdata.nasa.gov/pages/viewpage.action?pageId=182297715
     """
-    def get_dataname_extension(self, dataset_name:str)->dict:
+    def get_dataname_extension(
+            self, dataset_name:str,
+            extension_mode:str="info")->dict:
         """
             Get filename exteion for the dataset.
+            @param extension_mode: "info" to get the driver and HDFEOSVersion from
+                gdal.Info, or "signature" to sniff them from the signature bytes of
+                the file without opening it with GDAL. Files that cannot be read
+                directly (e.g. /vsis3/), and HDF5 files without a netCDF-4 or
+                HDF-EOS marker in the bytes read, fall back to "info".
             @return: 
             {
                 "dataset_name":"example.nc",
@@ -38,9 +51,17 @@ class FilenameDatasetStandardizeFileExtensions:
         _the_ret["dataset_name"] = dataset_name
         _the_ret["extension"] = dict()
         try:
-            _the_info = gdal.Info(dataset_name, format="json",
-                                  listMDD=True,extraMDDomains=['all'],
-                                  reportProj4=True)
+            if extension_mode == "signature":
+                try:
+                    if self._get_file_extension_from_signature(
+                            dataset_name=dataset_name,
+                            ext_info=_the_ret):
+                        self._check_file_extension(_the_ret)
+                        return _the_ret
+                except OSError:
+                    _the_ret["extension"] = dict()
+            _the_info = DatasetMetadataSnapshot.get_snapshot(
+                dataset_name).get_info(dataset_name)
 
             self._gdal_get_file_extension(
                 dataset_name=dataset_name,
@@ -90,6 +111,23 @@ class FilenameDatasetStandardizeFileExtensions:
         else:
             _the_ext["valid"] = False
 
+    def _get_file_extension_from_signature(
+            self, dataset_name:str,
+            ext_info:dict)->bool:
+        """
+            @return: False if the format cannot be told from the signature
+                (HDF5 without netCDF-4 or HDF-EOS marker), nothing is set.
+        """
+        _the_file = DatasetMetadataSnapshot.parse_dataset_name(
+            dataset_name)[1] or dataset_name
+        _the_signature = DatasetSignature().get_signature(_the_file)
+        if not _the_signature.pop("complete"):
+            return False
+        _the_ext = ext_info["extension"]
+        _the_ext.update(_the_signature)
+        _the_ext["extension"] = os.path.splitext(_the_file)[1]
+        return True
+
     def _gdal_get_file_extension(
             self, dataset_name:str,
             ext_info:dict,
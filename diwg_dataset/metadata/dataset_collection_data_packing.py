@@ -1,7 +1,7 @@
 """
     Retrieve metadata on packing conventions in a dataset.
 """
-import glob
+from diwg_dataset.common.dataset_collection import DatasetCollection
 from diwg_dataset.metadata.dataset_data_packing import (
     DatasetMetaPacking
 )
@@ -11,9 +11,17 @@ class DatasetCollectionMetaPacking:
             Distinguish clearly between HDF and netCDF packing conventions
         
     """
-    def get_packing_metadata(self,dataset_name_listfile:str)->dict:
+    def get_packing_metadata(
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False)->dict:
         """
             Retrieve list of subdataset metadata.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @return:
             {
             collection_name: "thecollection_list.file",
@@ -42,19 +50,13 @@ class DatasetCollectionMetaPacking:
         _the_ret["datasets"] = list()
 
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dmp = DatasetMetaPacking()
-                        _the_ret["datasets"].append(
-                            dmp.get_packing_metadata(_the_sfile))
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    DatasetMetaPacking, "get_packing_metadata"):
+                _the_ret["datasets"].append(_the_ds)
         except Exception as err:
             _the_ret["error"]=str(err)
 
@@ -1,7 +1,7 @@
 """
     Retrieve all names of groups, variables, and attributes in a dataset.
 """
-import glob
+from diwg_dataset.common.dataset_collection import DatasetCollection
 from diwg_dataset.metadata.dataset_group_variable_attribute_name import (
     DatasetGroupVariableAttributeName
 )
@@ -11,9 +11,16 @@ class DatasetCollectionGroupVariableAttributeName:
             Character Set for User-Defined Group, Variable, and Attribute Names
     """
     def get_group_variable_attribute_names(
-            self,dataset_name_listfile:str)->dict:
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False)->dict:
         """
             Retrieve the metadata.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @return: 
             {
             collection_name: "thecollection_list.file",
@@ -32,19 +39,13 @@ class DatasetCollectionGroupVariableAttributeName:
         the_ret["collection_name"] = dataset_name_listfile
         the_ret["datasets"] = list()
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dgva = DatasetGroupVariableAttributeName()
-                        the_ret["datasets"].append(
-                            dgva.get_group_variable_attribute_names(_the_sfile))
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    DatasetGroupVariableAttributeName, "get_group_variable_attribute_names"):
+                the_ret["datasets"].append(_the_ds)
         except Exception as err:
             the_ret["error"]=str(err)
 
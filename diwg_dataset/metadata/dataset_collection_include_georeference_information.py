@@ -5,7 +5,7 @@
     Retrieve grid variables and check its grid_mapping/wkt info
     in earch grid dataset in a collection.
 """
-import glob
+from diwg_dataset.common.dataset_collection import DatasetCollection
 from diwg_dataset.metadata.dataset_include_georeference_information import (
     DatasetIncludeGeoreferenceInformation
 )
@@ -16,9 +16,20 @@ class DatasetCollectionIncludeGeoreferenceInformation:
 
             https://wiki.earthdata.nasa.gov/display/ESDSWG/Include+Georeference+Information+with+Geospatial+Coordinates
     """
-    def get_variables(self,dataset_name_listfile:str)->dict:
+    def get_variables(
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            georeference_mode:str="band")->dict:
         """
             Retrieve all the variables and their grid_mapping/wkt info.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
+            @param georeference_mode: "band" or "multidim", see
+                DatasetIncludeGeoreferenceInformation.get_variables.
             @return: 
             {
             collection_name: "thecollection_list.file",
@@ -66,19 +77,14 @@ class DatasetCollectionIncludeGeoreferenceInformation:
         _the_ret["datasets"] = list()
 
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dmp = DatasetIncludeGeoreferenceInformation()
-                        _the_ret["datasets"].append(
-                            dmp.get_variables(_the_sfile))
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    DatasetIncludeGeoreferenceInformation, "get_variables",
+                    georeference_mode=georeference_mode):
+                _the_ret["datasets"].append(_the_ds)
         except Exception as err:
             _the_ret["error"]=str(err)
 
@@ -2,7 +2,7 @@
     Retrieve all groups, variables, attributes
       and their coordinate attributes in a dataset.
 """
-import glob
+from diwg_dataset.common.dataset_collection import DatasetCollection
 from diwg_dataset.metadata.dataset_keep_coordinate_values_in_coordinate_variables import (
     DatasetKeepCoordValuesInCoordVariables
 )
@@ -12,12 +12,20 @@ class DatasetCollectionKeepCoordValuesInCoordVariables:
             Keep Coordinate Values in Coordinate Variables
     """
     def get_coordinates_values_in_groups_variables_attributes(
-            self,dataset_name_listfile:str)->dict:
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            group_date_search:str="fast")->dict:
         """
             Retrieve all coordinates and find its location in groups, variables, or attributes.
             This function utilizes gdalmdiminfo to retrieve groups, variables, attributes,
              which should only work with dataset with multi-dimensional arrays, 
              i.e. netcdf, hdf, hdfeos.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
             @return: 
             {
             collection_name: "thecollection_list.file",
@@ -87,20 +95,15 @@ class DatasetCollectionKeepCoordValuesInCoordVariables:
         _the_ret["datasets"] = list()
 
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dmp = DatasetKeepCoordValuesInCoordVariables()
-                        _the_ret["datasets"].append(
-                            dmp.get_coordinates_values_in_groups_variables_attributes(
-                                _the_sfile))
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    DatasetKeepCoordValuesInCoordVariables,
+                    "get_coordinates_values_in_groups_variables_attributes",
+                    group_date_search=group_date_search):
+                _the_ret["datasets"].append(_the_ds)
         except Exception as err:
             _the_ret["error"]=str(err)
 
@@ -1,7 +1,7 @@
 """
     Retrieve metadata on packing conventions in a dataset.
 """
-import glob
+from diwg_dataset.common.dataset_collection import DatasetCollection
 from diwg_dataset.metadata.dataset_variable_physical_units import (
     DatasetVariablePhysicalUnits
 )
@@ -10,9 +10,20 @@ class DatasetCollectionVariablePhysicalUnits:
         This class is for testing:
             Use the Units Attribute Only for Variables with Physical Units
     """
-    def get_variable_units(self,dataset_name_listfile:str)->dict:
+    def get_variable_units(
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            units_mode:str="band")->dict:
         """
             Retrieve all the variables and their units.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
+            @param units_mode: "band" or "multidim", see
+                DatasetVariablePhysicalUnits.get_variable_units.
             @return: 
             {
             collection_name: "thecollection_list.file",
@@ -36,19 +47,14 @@ class DatasetCollectionVariablePhysicalUnits:
         _the_ret["datasets"] = list()
 
         try:
-            with open(dataset_name_listfile, "r",encoding="utf-8") as _the_file:
-                _the_lines = _the_file.readlines()
-            for _line in _the_lines:
-                _the_line = _line.strip()
-                if _the_line:
-                    _the_sfiles = glob.glob(_the_line)
-                    # in case of a single GDAL dataset
-                    if len(_the_sfiles) == 0:
-                        _the_sfiles = [_the_line]
-                    for _the_sfile in _the_sfiles:
-                        dmp = DatasetVariablePhysicalUnits()
-                        _the_ret["datasets"].append(
-                            dmp.get_variable_units(_the_sfile))
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            for _the_ds in _the_collection.process_datasets(
+                    DatasetVariablePhysicalUnits, "get_variable_units",
+                    units_mode=units_mode):
+                _the_ret["datasets"].append(_the_ds)
         except Exception as err:
             _the_ret["error"]=str(err)
 
@@ -0,0 +1,259 @@
+"""
+    Check the units of variables across the datasets in a collection.
+"""
+from collections import Counter, defaultdict
+from diwg_dataset.common.dataset_collection import DatasetCollection
+from diwg_dataset.metadata.dataset_variable_physical_units import (
+    DatasetVariablePhysicalUnits
+)
+class DatasetCollectionVariableUnitsConsistency:
+    """
+        This class is for testing:
+            Consistent Units Attribute Value for Variables Across One Data Collection
+
+        The datasets are compared as they are processed, by variable fullname
+        lookups. Only the discrepancies are kept; with the majority reference,
+        the datasets of each units key of a variable are kept in a bitmap.
+    """
+    def get_units_consistency(
+            self,dataset_name_listfile:str,
+            dataset_workers:int=1,
+            dataset_cache:str=None,
+            dataset_cache_hash:bool=False,
+            units_mode:str="band",
+            units_reference:str="first")->dict:
+        """
+            Compare the units of variables across the datasets.
+            @param dataset_workers: number of worker processes for the granules
+                in the collection. 1 to process the granules one by one.
+            @param dataset_cache: SQLite file to cache the results of granules between runs.
+            @param dataset_cache_hash: add the content hash of granule to the cache key.
+            @param units_mode: "band" or "multidim", see
+                DatasetVariablePhysicalUnits.get_variable_units.
+            @param units_reference: "first" to compare with the first dataset
+                without error, or "majority" to compare with the units used by
+                most datasets for each variable. In "majority", a variable is
+                expected in every dataset if more than half of the datasets
+                have it.
+            @return:
+            {
+            collection_name: "thecollection_list.file",
+            error: "Error message if there is error",
+            units_reference: "first",
+            reference_dataset: "example1.nc",
+            datasets_count: 2,
+            discrepancies: [{
+                "dataset_name":"example2.nc",
+                "errors":[
+                        {
+                        "dataset_name": 'NETCDF:"example2.nc"://group1/variable1',
+                        "error": "Inconsistent units - '[m]' vs '[mm]'",
+                        "units": ["m"],
+                        "reference_units": ["mm"]
+                        }
+                    ]
+                }]
+            }
+        """
+        _the_ret = dict()
+        _the_ret["collection_name"] = dataset_name_listfile
+        _the_ret["units_reference"] = units_reference
+        _the_ret["datasets_count"] = 0
+        _the_ret["discrepancies"] = list()
+
+        try:
+            _the_collection = DatasetCollection(
+                dataset_name_listfile, dataset_workers=dataset_workers,
+                dataset_cache=dataset_cache,
+                dataset_cache_hash=dataset_cache_hash)
+            _the_datasets = _the_collection.process_datasets(
+                DatasetVariablePhysicalUnits, "get_variable_units",
+                units_mode=units_mode)
+            if units_reference == "majority":
+                self._check_with_majority(_the_ret, _the_datasets)
+            else:
+                self._check_with_first(_the_ret, _the_datasets)
+        except Exception as err:
+            _the_ret["error"]=str(err)
+
+        return _the_ret
+
+    def _check_with_first(self, ret:dict, datasets):
+        _the_ref = None
+        for dataset in datasets:
+            ret["datasets_count"] += 1
+            if "error" in dataset:
+                ret["discrepancies"].append(self._get_dataset_error(dataset))
+                continue
+            _the_units, _the_ambiguous = self._get_units_index(dataset)
+            if _the_ref is None:
+                _the_ref = _the_units
+                ret["reference_dataset"] = dataset["dataset_name"]
+                # the duplicated fullnames of the reference itself
+                test_results = [
+                    self._get_missing_error(dataset["dataset_name"], _v_name)
+                    for _v_name in _the_units if _v_name in _the_ambiguous]
+                if test_results:
+                    _the_o = dict()
+                    _the_o["dataset_name"]=dataset["dataset_name"]
+                    _the_o["errors"]=test_results
+                    ret["discrepancies"].append(_the_o)
+                continue
+            test_results = list()
+            for _r_v_name, _r_var in _the_ref.items():
+                _the_var = _the_units.get(_r_v_name)
+                if _the_var is None or _r_v_name in _the_ambiguous:
+                    test_results.append(self._get_missing_error(
+                        dataset["dataset_name"], _r_v_name))
+                elif _the_var["key"] != _r_var["key"]:
+                    test_results.append(self._get_units_error(
+                        _the_var, _r_var["units"]))
+            if test_results:
+                _the_o = dict()
+                _the_o["dataset_name"]=dataset["dataset_name"]
+                _the_o["errors"]=test_results
+                ret["discrepancies"].append(_the_o)
+
+    def _check_with_majority(self, ret:dict, datasets):
+        _the_names = list()
+        # per dataset (index): errors, or the general error of the dataset
+        _the_results = defaultdict(list)
+        _the_ds_errors = dict()
+        # per dataset (index): prefix of the variable paths (path = prefix +
+        # fullname), and the paths of the variables not following it
+        _the_prefixes = list()
+        _the_paths = dict()
+        # per variable fullname: counter of units keys, units of each key, and
+        # a bitmap of the datasets (index) with each key
+        _the_counts = defaultdict(Counter)
+        _the_key_units = defaultdict(dict)
+        _the_bitmaps = defaultdict(dict)
+        _the_presence = Counter()
+        # (index, fullname) of the variables duplicated in a dataset
+        _the_ambiguous_vars = set()
+        _the_ok_count = 0
+        for dataset in datasets:
+            _the_index = len(_the_names)
+            _the_names.append(dataset.get("dataset_name"))
+            _the_prefixes.append("")
+            ret["datasets_count"] += 1
+            if "error" in dataset:
+                _the_ds_errors[_the_index] = self._get_dataset_error(dataset)
+                continue
+            _the_ok_count += 1
+            _the_units, _the_ambiguous = self._get_units_index(dataset)
+            for _v_name, _the_var in _the_units.items():
+                if _v_name in _the_ambiguous:
+                    _the_ambiguous_vars.add((_the_index, _v_name))
+                    _the_results[_the_index].append(
+                        self._get_missing_error(dataset["dataset_name"], _v_name))
+                    continue
+                _the_key = _the_var["key"]
+                _the_presence[_v_name] += 1
+                _the_counts[_v_name][_the_key] += 1
+                _the_key_units[_v_name].setdefault(_the_key, _the_var["units"])
+                self._set_bit(
+                    _the_bitmaps[_v_name].setdefault(_the_key, bytearray()),
+                    _the_index)
+                if not _the_var["path"].endswith(_v_name):
+                    _the_paths[(_the_index, _v_name)] = _the_var["path"]
+                elif not _the_prefixes[_the_index]:
+                    _the_prefixes[_the_index] = _the_var["path"][:-len(_v_name)]
+                elif _the_var["path"] != f"{_the_prefixes[_the_index]}{_v_name}":
+                    _the_paths[(_the_index, _v_name)] = _the_var["path"]
+
+        for _v_name, _the_count in _the_counts.items():
+            _the_majority_key = _the_count.most_common(1)[0][0]
+            _the_majority_units = _the_key_units[_v_name][_the_majority_key]
+            for _the_key, _the_bitmap in _the_bitmaps[_v_name].items():
+                if _the_key == _the_majority_key:
+                    continue
+                for _the_index in self._get_bits(_the_bitmap):
+                    _the_var = {
+                        "path": _the_paths.get(
+                            (_the_index, _v_name),
+                            f"{_the_prefixes[_the_index]}{_v_name}"),
+                        "units": _the_key_units[_v_name][_the_key],
+                        "key": _the_key}
+                    _the_results[_the_index].append(self._get_units_error(
+                        _the_var, _the_majority_units))
+            if _the_presence[_v_name] * 2 > _the_ok_count:
+                _the_bitmap_list = list(_the_bitmaps[_v_name].values())
+                for _the_index, _the_name in enumerate(_the_names):
+                    if (_the_index not in _the_ds_errors
+                        and (_the_index, _v_name) not in _the_ambiguous_vars
+                        and not any(self._get_bit(_b, _the_index)
+                                    for _b in _the_bitmap_list)):
+                        _the_results[_the_index].append(
+                            self._get_missing_error(_the_name, _v_name))
+
+        for _the_index in sorted(set(_the_results) | set(_the_ds_errors)):
+            if _the_index in _the_ds_errors:
+                ret["discrepancies"].append(_the_ds_errors[_the_index])
+                continue
+            _the_o = dict()
+            _the_o["dataset_name"]=_the_names[_the_index]
+            _the_o["errors"]=_the_results[_the_index]
+            ret["discrepancies"].append(_the_o)
+
+    @staticmethod
+    def _set_bit(bitmap:bytearray, index:int):
+        _the_byte = index >> 3
+        if _the_byte >= len(bitmap):
+            bitmap.extend(bytes(_the_byte + 1 - len(bitmap)))
+        bitmap[_the_byte] |= 1 << (index & 7)
+
+    @staticmethod
+    def _get_bit(bitmap:bytearray, index:int)->bool:
+        _the_byte = index >> 3
+        return _the_byte < len(bitmap) and bool(bitmap[_the_byte] & (1 << (index & 7)))
+
+    @staticmethod
+    def _get_bits(bitmap:bytearray):
+        for _the_byte, _the_value in enumerate(bitmap):
+            while _the_value:
+                _the_low = _the_value & -_the_value
+                yield (_the_byte << 3) + _the_low.bit_length() - 1
+                _the_value ^= _the_low
+
+    def _get_units_index(self, dataset:dict)->tuple:
+        """
+            return:
+            (units by variable fullname, set of ambiguous fullnames)
+        """
+        _the_units = dict()
+        _the_ambiguous = set()
+        for _the_var in dataset['variables']:
+            _v_name = _the_var['fullname']
+            if _v_name in _the_units:
+                _the_ambiguous.add(_v_name)
+                continue
+            _the_units[_v_name] = {
+                "path": _the_var["path"],
+                "units": _the_var["units"],
+                "key": ','.join(map(str,_the_var['units']))
+            }
+        return _the_units, _the_ambiguous
+
+    def _get_units_error(self, variable:dict, ref_units:list)->dict:
+        _the_o = dict()
+        _the_o["dataset_name"]=variable["path"]
+        _the_o["error"]=(
+            f"Inconsistent units - '[{variable['key']}]' "
+            f"vs '[{','.join(map(str,ref_units))}]'")
+        _the_o["units"]=variable["units"]
+        _the_o["reference_units"]=ref_units
+        return _the_o
+
+    def _get_missing_error(self, dataset_name:str, variable_name:str)->dict:
+        _the_o = dict()
+        _the_o["dataset_name"]=dataset_name
+        _the_o["error"]=(
+            f"No matching or ambiguous var - '{variable_name}'")
+        return _the_o
+
+    def _get_dataset_error(self, dataset:dict)->dict:
+        _the_dict = dict()
+        _the_dict["error"]=dataset["error"]
+        _the_dict["dataset_name"]=dataset["dataset_name"]
+        return _the_dict
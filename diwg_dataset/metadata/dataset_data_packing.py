@@ -1,7 +1,12 @@
 """
     Retrieve metadata on packing conventions in a dataset.
 """
-from osgeo import gdal
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
 
 class DatasetMetaPacking:
     """
@@ -38,33 +43,30 @@ class DatasetMetaPacking:
         _the_ret["subdatasets"]=list()
 
         try:
-            with gdal.Open(dataset_name, gdal.GA_ReadOnly) as the_ds:
-                if not isinstance(the_ds, gdal.Dataset):
-                    _the_ret["error"] = "Failed at opening the dataset."
-                    return _the_ret
-
-                _the_info = gdal.Info(the_ds, format="json")
+            _the_snapshot = DatasetMetadataSnapshot.get_snapshot(dataset_name)
+            _the_info = _the_snapshot.get_info(dataset_name)
 
-                # loop through all subdatasets
-                _the_subdatasets = self._gdal_get_subdatasets(_the_info)
+            # loop through all subdatasets
+            _the_subdatasets = self._gdal_get_subdatasets(_the_info)
 
-                for _the_sd_name in _the_subdatasets:
-                    _s_metadata_packing = dict()
-                    _s_metadata_packing["name"] = _the_sd_name
-                    with gdal.Open(_the_sd_name, gdal.GA_ReadOnly) as the_sds:
-                        if not isinstance(the_sds, gdal.Dataset):
-                            _s_metadata_packing["error"] = "Failed at opening the subdataset."
-                        else:
-                            self._gdal_get_subdataset_metadata_packing(
-                                _s_metadata_packing, the_sds)
-                        _the_ret['subdatasets'].append(_s_metadata_packing)
-
-                if the_ds.RasterCount>0:
-                    _the_root = dict()
-                    _the_root["name"] = dataset_name
+            for _the_sd_name in _the_subdatasets:
+                _s_metadata_packing = dict()
+                _s_metadata_packing["name"] = _the_sd_name
+                try:
+                    _the_sd_info = _the_snapshot.get_info(_the_sd_name)
                     self._gdal_get_subdataset_metadata_packing(
-                        _the_root, the_ds)
-                    _the_ret['subdatasets'].append(_the_root)
+                        _s_metadata_packing, _the_sd_info)
+                except Exception as err:
+                    _s_metadata_packing["error"] = (
+                        f"Failed at opening the subdataset. {err}")
+                _the_ret['subdatasets'].append(_s_metadata_packing)
+
+            if 'bands' in _the_info and len(_the_info['bands'])>0:
+                _the_root = dict()
+                _the_root["name"] = dataset_name
+                self._gdal_get_subdataset_metadata_packing(
+                    _the_root, _the_info)
+                _the_ret['subdatasets'].append(_the_root)
 
         except Exception as err:
             _the_ret["error"]=str(err)
@@ -83,8 +85,11 @@ class DatasetMetaPacking:
         return _the_ret
 
     def _gdal_get_subdataset_metadata_packing(
-            self, metadata_packing:dict, dataset:gdal.Dataset):
-        the_metadata = dataset.GetMetadata()
+            self, metadata_packing:dict, dataset_info:dict):
+        the_metadata = dict()
+        if ('metadata' in dataset_info
+            and '' in dataset_info['metadata']):
+            the_metadata = dataset_info['metadata']['']
         #scale_factor
         the_scale_factors = [(k,v) for k,v in the_metadata.items()
                                 if k.endswith("scale_factor")]
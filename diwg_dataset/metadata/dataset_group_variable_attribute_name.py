@@ -3,13 +3,24 @@
 """
 import re
 import string
-from osgeo import gdal
+from functools import lru_cache
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
 
 class DatasetGroupVariableAttributeName:
     """
         This class is for testing:
             Character Set for User-Defined Group, Variable, and Attribute Names
+
+        The names are validated with diwg_dataset.common.name_validation.
     """
+    # a metadata item with whitespace in its name is not an attribute
+    whitespace_pattern = re.compile(f"[{re.escape(string.whitespace)}]")
+
     def get_group_variable_attribute_names(self,dataset_name:str)->dict:
         """
             Retrieve the metadata.
@@ -33,17 +44,13 @@ class DatasetGroupVariableAttributeName:
         _the_ret_gva_names["attribute_names"] = _the_a_names
 
         try:
-            with gdal.Open(dataset_name, gdal.GA_ReadOnly) as _the_ds:
-                if not isinstance(_the_ds, gdal.Dataset):
-                    _the_ret_gva_names["error"] = "Failed at opening the dataset."
-                    return _the_ret_gva_names
+            _the_info = DatasetMetadataSnapshot.get_snapshot(
+                dataset_name).get_info(dataset_name)
 
-                _the_info = gdal.Info(_the_ds, format="json")
-
-                self._gdal_get_group_variable(
-                    _the_ret_gva_names,
-                    dataset_name,_the_info
-                )
+            self._gdal_get_group_variable(
+                _the_ret_gva_names,
+                dataset_name,_the_info
+            )
         except Exception as err:
             _the_ret_gva_names["error"]=str(err)
 
@@ -60,10 +67,8 @@ class DatasetGroupVariableAttributeName:
         _the_subdatasets = self._gdal_get_subdatasets(dataset_info)
 
         for ds_name in _the_subdatasets:
-            _the_ds = gdal.Open(ds_name, gdal.GA_ReadOnly)
-            if not isinstance(_the_ds, gdal.Dataset):
-                continue
-            _the_info = gdal.Info(_the_ds, format="json")
+            _the_info = DatasetMetadataSnapshot.get_snapshot(
+                ds_name).get_info(ds_name)
             self._gdal_get_group_variable(
                 group_varable_attribute,ds_name,_the_info
             )
@@ -86,13 +91,12 @@ class DatasetGroupVariableAttributeName:
     def _gdal_add_one_attribute(
             self, group_varable_attribute:dict,
             attribute_key:str, attribute_value:str):
-        _the_parts = [attribute_key]
         if '#' in attribute_key:
             _the_parts = self._gdal_attribute_key_split(
-                attribute_key, regex_pattern='#')
+                attribute_key, separator='#')
         else:
             _the_parts = self._gdal_attribute_key_split(
-                attribute_key, regex_pattern='_')
+                attribute_key, separator='_')
         _the_values = self._gdal_attribute_value_parse(
             attribute_value)
         if len(_the_values)>0:
@@ -141,17 +145,22 @@ class DatasetGroupVariableAttributeName:
 
     def _gdal_attribute_name_has_whitespace(
             self, attribute_name:str)->bool:
-        return any([c in attribute_name for c in string.whitespace])        
+        return self.whitespace_pattern.search(attribute_name) is not None
 
     def _gdal_non_attribute_name_has_special_prefix(
             self, attribute_name:str, prefix:str = "^[+]")->bool:
-        _the_p = re.compile(prefix)
+        _the_p = self._get_compiled_pattern(prefix)
         if _the_p.match(attribute_name):
             return True
         return False
 
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _get_compiled_pattern(pattern:str)->re.Pattern:
+        return re.compile(pattern)
+
     def _gdal_attribute_key_split(
-            self, attribute_key:str, regex_pattern:str='_')->list:
+            self, attribute_key:str, separator:str='_')->list:
         """
             Break a attribute key by split with '_' or '#'.
             If '__' will be separated by first '_' and the rest will be
@@ -162,43 +171,16 @@ class DatasetGroupVariableAttributeName:
         _the_ret = []
         _str = attribute_key
         while len(_str) > 0:
-            #_ss = re.split('#|_', _str[1:], 1)
-            _skip_str, _skip_index = self._gdal_attribute_key_skip_index(_str,regex_pattern)
-            _ss = re.split(regex_pattern, _str[_skip_index:], 1)
-            if len(_ss) <= 1 :
-                _the_ret.append(_str)
-                _str = ''
-                break
-            elif len(_ss[1]) <= 1 :
+            # leading separators are kept as prefix of the part
+            _the_rest = _str.lstrip(separator)
+            _skip_str = _str[:len(_str)-len(_the_rest)]
+            _ss = _the_rest.split(separator, 1)
+            if len(_ss) <= 1 or len(_ss[1]) <= 1:
                 _the_ret.append(_str)
-                _str = ''
                 break
-            else:
-                _the_ret.append(f"{_skip_str}{_ss[0]}")
-                _str = _ss[1]
+            _the_ret.append(f"{_skip_str}{_ss[0]}")
+            _str = _ss[1]
         return _the_ret
-
-    def _gdal_attribute_key_skip_index(self,attribute_key:str, regex_pattern:str='_')->tuple:
-        """
-            return:
-            prefix, skip_index
-        """
-        if not attribute_key:
-            return 0
-        _index = 0
-        _loop = True
-        _str = attribute_key
-        _prefix = ''
-        while _loop:
-            _the_strs = re.split(regex_pattern, _str, 1)
-            if len(_the_strs[0]) == 0:
-                _index +=1
-                _prefix += _str[0:1]
-                _str = _str[1:]
-            else:
-                _loop = False
-                break
-        return _prefix, _index
     
     def _gdal_get_subdatasets(self, dataset_info):
         _the_ret = []
@@ -6,9 +6,13 @@
     in a grid dataset.
 
 """
-import re
-import string
-from osgeo import gdal
+from diwg_dataset.common.dataset_metadata_index import DatasetMetadataIndex
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
 
 class DatasetIncludeGeoreferenceInformation:
     """
@@ -17,9 +21,18 @@ class DatasetIncludeGeoreferenceInformation:
 
             https://wiki.earthdata.nasa.gov/display/ESDSWG/Include+Georeference+Information+with+Geospatial+Coordinates
     """
-    def get_variables(self,dataset_name:str)->dict:
+    def get_variables(
+            self,dataset_name:str,
+            georeference_mode:str="band")->dict:
         """
             Retrieve the metadata.
+            @param georeference_mode: "band" to read the grid_mapping of each
+                variable from the band metadata of gdal.Info on each subdataset,
+                or "multidim" to read the attributes of all variables from the
+                single gdal.MultiDimInfo of the granule, with a sorted-key index
+                for the attributes of the grid_mapping variables.
+                Variables not found in the multidimensional arrays fall back
+                to "band".
             @return: 
             {
                 "dataset_name":"example.nc",
@@ -63,13 +76,24 @@ class DatasetIncludeGeoreferenceInformation:
         _the_variables["variables"] = list()
 
         try:
-            _the_info = gdal.Info(dataset_name, format="json",
-                                  listMDD=True,extraMDDomains=['all'],
-                                  reportProj4=True)
+            _the_info = DatasetMetadataSnapshot.get_snapshot(
+                dataset_name).get_info(dataset_name)
+
+            _the_attribute_index = None
+            if georeference_mode == "multidim":
+                try:
+                    _the_snapshot = DatasetMetadataSnapshot.get_snapshot(
+                        dataset_name)
+                    _the_attribute_index = (
+                        _the_snapshot.get_array_index(),
+                        _the_snapshot.get_attribute_index())
+                except Exception:
+                    _the_attribute_index = None
 
             self._gdal_get_variables(
                 _the_variables,
-                dataset_name,_the_info)
+                dataset_name,_the_info,
+                set(), _the_attribute_index)
         except Exception as err:
             _the_variables["error"]=str(err)
 
@@ -78,7 +102,9 @@ class DatasetIncludeGeoreferenceInformation:
     def _gdal_get_variables(
         self, g_variables:dict,
         dataset_name:str,
-        dataset_info:dict):
+        dataset_info:dict,
+        seen:set,
+        attribute_index:tuple=None):
         """
             @g_variables:
             {
@@ -119,6 +145,9 @@ class DatasetIncludeGeoreferenceInformation:
             Note: 'fullpath' - string represenation of parent path useful for gdal where
                             space in group may replaced with "_".
                    'parent_group' - a list of parent groups.
+            @seen: keys of the variables already in g_variables.
+            @attribute_index: (array index, attribute index) of the granule
+                snapshot for "multidim", or None for "band".
         """
         (_the_format,
         _the_file,
@@ -136,28 +165,81 @@ class DatasetIncludeGeoreferenceInformation:
             (_has_grid_mapping,
              _has_wkt,
              _has_grid_mapping_name) = self._gdal_check_grid_mapping_wkt(
-                dataset_info,the_o)
+                dataset_name,dataset_info,the_o)
             the_o['has_grid_mapping'] = _has_grid_mapping
             the_o['has_grid_mapping_name'] = _has_grid_mapping_name
             the_o['has_crs_wkt'] = _has_wkt
-            if the_o not in g_variables['variables']:
-                g_variables['variables'].append(the_o)
-            
+            self._add_variable(g_variables, the_o, seen)
 
         # loop through all subdatasets
         _the_subdatasets = self._gdal_get_subdatasets(dataset_info)
         for ds_name in _the_subdatasets:
-            _the_info = gdal.Info(ds_name, format="json",
-                                listMDD=True,extraMDDomains=['all'],
-                                reportProj4=True)
+            if (attribute_index is not None
+                and self._gdal_add_multidim_variable(
+                    g_variables, ds_name, seen, attribute_index)):
+                continue
+            _the_info = DatasetMetadataSnapshot.get_snapshot(
+                ds_name).get_info(ds_name)
             self._gdal_get_variables(
-                g_variables,ds_name,_the_info
+                g_variables,ds_name,_the_info,seen
             )
 
+    def _add_variable(self, g_variables:dict, var_obj:dict, seen:set):
+        _the_key = (var_obj['fullpath'], var_obj['name'])
+        if _the_key not in seen:
+            seen.add(_the_key)
+            g_variables['variables'].append(var_obj)
+
+    def _gdal_add_multidim_variable(
+            self, g_variables:dict,
+            dataset_name:str,
+            seen:set,
+            attribute_index:tuple)->bool:
+        """
+            Add the variable of a subdataset from the attribute index of the
+            granule, without gdal.Info on the subdataset.
+            @return: False if the variable is not in the multidimensional
+                arrays (the caller falls back to gdal.Info).
+        """
+        (_the_array_index, _the_attributes) = attribute_index
+        (_the_format,
+        _the_file,
+        _the_groups,
+        _the_var
+         ) = self._gdal_parse_variables_groups_from_dataset_name(
+            dataset_name)
+        _the_path = self._gdal_form_gv_path(_the_groups,_the_var).lstrip('/')
+        if not _the_path or _the_path not in _the_array_index:
+            return False
+        the_o = dict()
+        the_o['fullpath'] = "/".join(_the_groups)
+        the_o['parent_path'] = _the_groups
+        the_o['name'] = _the_var
+        the_o['has_grid_mapping'] = False
+        the_o['has_grid_mapping_name'] = False
+        the_o['has_crs_wkt'] = False
+        _gm_var_name = _the_attributes.get(f'{_the_path}#grid_mapping')
+        if _gm_var_name:
+            the_o['has_grid_mapping'] = True
+            _gm_var_name = str(_gm_var_name)
+            if _gm_var_name.startswith('/'):
+                _gm_path = _gm_var_name.lstrip('/')
+            else:
+                _gm_path = self._gdal_form_gv_path(
+                    _the_groups, _gm_var_name).lstrip('/')
+            _gm_var = _the_attributes.get_prefix(f'{_gm_path}#')
+            the_o['has_grid_mapping_name'] = 'grid_mapping_name' in _gm_var
+            the_o['has_crs_wkt'] = 'crs_wkt' in _gm_var
+        self._add_variable(g_variables, the_o, seen)
+        return True
+
     def _gdal_check_grid_mapping_wkt(
-            self, dataset_info:dict,
+            self, dataset_name:str,
+            dataset_info:dict,
             var_obj:dict)->tuple:
         """
+            The attributes of the grid_mapping variable are looked up in the
+            metadata index of the dataset, built once per dataset_info.
             @return
             (<exist-grid-mapping, <provide-wkt>, <has-grid-mapping-name>)
         """
@@ -166,7 +248,7 @@ class DatasetIncludeGeoreferenceInformation:
         _has_grid_mapping_name = False
         if ('bands' not in dataset_info or
             not dataset_info['bands']):
-            return (_has_grid_mapping, _has_wkt)
+            return (_has_grid_mapping, _has_wkt, _has_grid_mapping_name)
 
         # using band 1 to extract info
         band1 = dataset_info['bands'][0]
@@ -178,18 +260,14 @@ class DatasetIncludeGeoreferenceInformation:
 
         if ("grid_mapping" not in band1_meta
             or not band1_meta['grid_mapping']):
-            return (_has_grid_mapping, _has_wkt)
+            return (_has_grid_mapping, _has_wkt, _has_grid_mapping_name)
         _has_grid_mapping = True
         _gm_var_name = band1_meta['grid_mapping']
 
         # find the variable and get its attributes
-        meta_info = dict()
-        if 'metadata' in dataset_info:
-            meta_info = dataset_info['metadata']
-        if '' in meta_info:
-            meta_info = meta_info['']
         _gm_var = self._gdal_ret_attributes_for_var(
-            meta_info,
+            DatasetMetadataSnapshot.get_snapshot(
+                dataset_name).get_metadata_index(dataset_name),
             var_obj,_gm_var_name)
         # Check if 'grid_mapping_name" in: not valid grid_mapping 
         # possibly not grid data???)
@@ -201,13 +279,13 @@ class DatasetIncludeGeoreferenceInformation:
         return (_has_grid_mapping, _has_wkt, _has_grid_mapping_name)
 
     def _gdal_ret_attributes_for_var(
-            self,meta_data:dict,
+            self,meta_data:DatasetMetadataIndex,
             var_obj:dict,
             search_var_name:str,
             sep_str:str='#')->dict:
         """
             Paramters:
-                meta_data(dict): one level dict
+                meta_data(DatasetMetadataIndex): index of a one level dict
                 var_obj(dict): variable object
                 search_var_name(str): grid_mapping variable name
                 sep_str(str): Speartor used in gdalinfo. Netcdf, '#', others: '_'.
@@ -222,13 +300,7 @@ class DatasetIncludeGeoreferenceInformation:
             _var_fullpath = var_obj['fullpath']
             if _var_fullpath:
                 _search_var_name = f'{_var_fullpath}/{search_var_name}'
-        _search_var_name = f'{_search_var_name}{sep_str}'
-        for k in meta_data:
-            if k.startswith(_search_var_name):
-                att_value = meta_data[k]
-                att_name = k.split(_search_var_name,1)[1]
-                the_ret[att_name] = att_value
-        return the_ret
+        return meta_data.get_prefix(f'{_search_var_name}{sep_str}')
 
     def _gdal_get_subdatasets(self, dataset_info:dict)->list:
         _the_ret = []
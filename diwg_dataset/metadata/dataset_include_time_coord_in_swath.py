@@ -2,10 +2,13 @@
     Retrieve all variables and their coordinate attributes in a dataset.
     "include_time" is set true if it has coord ending with "time" (case-insensitive)
 """
-import re
-import json
-import string
-from osgeo import gdal
+from diwg_dataset.common.dataset_handle_pool import DatasetHandlePool
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
 
 class DatasetIncludeTimeCoordInSwath:
     """
@@ -18,6 +21,9 @@ class DatasetIncludeTimeCoordInSwath:
             Retrieve all the variables with dimensions and coordinates.
             This function utilizes gdalmdiminfo to retrieve variables, which should only
             work with dataset with multi-dimensional arrays, i.e. netcdf, hdf, hdfeos.
+            For a subdataset name, only the group path of its variable is opened with
+            the multidimensional API (unless gdalmdiminfo of the file is already in
+            the snapshot); "time_variables" are still those of the whole file.
             @return: 
             {
                 "dataset_name":"example.nc",
@@ -48,18 +54,37 @@ class DatasetIncludeTimeCoordInSwath:
             ) = self._gdal_parse_variables_groups_from_dataset_name(dataset_name)
             _gv_str = self._gdal_form_gv_path(_the_groups,_the_var)
 
-            _the_md_info = gdal.MultiDimInfo(_the_file)
+            _the_snapshot = DatasetMetadataSnapshot.get_snapshot(dataset_name)
+            _the_found = False
+            if _the_var and not _the_snapshot.has_multidim_info():
+                try:
+                    _the_found = self._gdal_get_one_variable_with_dims(
+                        _the_variables,
+                        _the_file,
+                        _the_groups,
+                        _the_var
+                    )
+                except Exception:
+                    _the_variables["variables"] = list()
+                    _the_found = False
 
-            if _the_md_info:
-                self._gdal_get_variables_with_dims(
-                    _the_variables,
-                    _the_file,
-                    _the_md_info
-                )
-            self._gdal_find_and_add_time_variables(_the_variables)
-            _the_vars = _the_variables['variables']
-            _the_variables['variables'] = [k for k in _the_vars if k[
-                'fullname'].startswith(_gv_str)]
+            if not _the_found:
+                _the_md_info = _the_snapshot.get_multidim_info()
+
+                if _the_md_info:
+                    self._gdal_get_variables_with_dims(
+                        _the_variables,
+                        _the_file,
+                        _the_md_info
+                    )
+                self._gdal_find_and_add_time_variables(_the_variables)
+                _the_vars = _the_variables['variables']
+                # the variable, or the variables in a group, not the siblings
+                # with the same prefix (e.g. //group/var10 for //group/var1)
+                if _gv_str:
+                    _the_variables['variables'] = [
+                        k for k in _the_vars if k['fullname'] == _gv_str
+                        or k['fullname'].startswith(f"{_gv_str}/")]
             self._gdal_verify_variable_include_time_coord(_the_variables)
 
         except Exception as err:
@@ -88,6 +113,64 @@ class DatasetIncludeTimeCoordInSwath:
                 return True
         return False
 
+    def _gdal_get_one_variable_with_dims(
+            self, group_variables:dict,
+            filename:str,
+            groups:list,
+            var_name:str)->bool:
+        """
+            Add the variable of a subdataset name, opening only the groups on
+            its path, and the time variables of the file from the array names.
+            @return: False if the variable is not an array in the file (the
+                caller falls back to gdalmdiminfo of the whole file).
+        """
+        _the_ds = DatasetHandlePool.open(filename, multidim=True)
+        _the_root = _the_ds.GetRootGroup()
+        _the_group = _the_root
+        for grp in groups:
+            if not grp:
+                continue
+            _the_group = self._gdal_open_sub_group(_the_group, grp)
+            if _the_group is None:
+                return False
+        if var_name not in (_the_group.GetMDArrayNames() or []):
+            return False
+        _the_array = _the_group.OpenMDArray(var_name)
+        the_format = _the_ds.GetDriver().ShortName.upper()
+        the_o = dict()
+        the_o["fullname"] = self._gdal_form_gv_path(groups,var_name)
+        the_o["path"] = f'{the_format}:"{filename}":{the_o["fullname"]}'
+        the_o["dimensions"] = [
+            d.GetFullName() for d in _the_array.GetDimensions() or []]
+        the_o['coordinates'] = list()
+        _the_attr = _the_array.GetAttribute('coordinates')
+        if _the_attr is not None:
+            the_o['coordinates'] = _the_attr.ReadAsString().split(' ')
+        group_variables['variables'].append(the_o)
+
+        _the_times = list()
+        self._gdal_add_time_variable_names(_the_times, "/", _the_root)
+        group_variables['time_variables'] = _the_times
+        return True
+
+    def _gdal_open_sub_group(self, group, group_name:str):
+        # group names in gdal paths have whitespaces replaced by '_'
+        for grp in group.GetGroupNames() or []:
+            if grp.replace(" ", "_") == group_name:
+                return group.OpenGroup(grp)
+        return None
+
+    def _gdal_add_time_variable_names(
+            self, time_variables:list, group_path:str, group):
+        for ar in group.GetMDArrayNames() or []:
+            if ar.lower().endswith('time'):
+                time_variables.append(f"{group_path}/{ar}")
+        for grp in group.GetGroupNames() or []:
+            the_sgrp = grp.replace(" ", "_")
+            self._gdal_add_time_variable_names(
+                time_variables, f"{group_path}/{the_sgrp}",
+                group.OpenGroup(grp))
+
     def _gdal_get_variables_with_dims(
             self, group_variables:dict,
             filename:str,
@@ -4,24 +4,51 @@
     
 """
 import re
-import json
-import string
 import copy
-from dateparser.search import search_dates
-from osgeo import gdal
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
 
 class DatasetKeepCoordValuesInCoordVariables:
     """
         This class is for testing:
             Keep Coordinate Values in Coordinate Variables
     """
+    # Dates in group paths, in one pass. Each alternative is anchored on
+    # digits or path separators, so a path is scanned in linear time:
+    #   - 2010-12-10, 2010_12_10, 2010.12.10, 20101210
+    #   - year and day of year: 2010344, 2010-344, 2010_344
+    #   - hierarchical: /2010/12/10, /2010/12, /2010
+    #   - a whole group named by a day, month or year number: Day_001,
+    #     doy-344, Month12, Year2010
+    # The numbered dates must not be followed by a letter or a digit, so
+    # grid and swath names with resolutions (e.g. MODIS_Grid_16DAY_250m_500m_VI,
+    # Swath_2019_250m) are not dates.
+    group_date_pattern = re.compile(
+        r"(?<![0-9])(?:19|20)[0-9]{2}"
+        r"(?:(?P<sep>[-_.]?)(?:0[1-9]|1[0-2])(?P=sep)(?:0[1-9]|[12][0-9]|3[01])"
+        r"|[-_.]?(?:00[1-9]|0[1-9][0-9]|[12][0-9]{2}|3[0-5][0-9]|36[0-6]))(?![0-9a-z])"
+        r"|(?:^|/)(?:19|20)[0-9]{2}(?:/(?:0?[1-9]|1[0-2])(?:/(?:0?[1-9]|[12][0-9]|3[01]))?)?(?=/|$)"
+        r"|(?:^|/)(?:(?:day|doy|julian_?day)[-_]?[0-9]{3}"
+        r"|month[-_]?(?:0?[1-9]|1[0-2])|year[-_]?(?:19|20)[0-9]{2})(?=/|$)",
+        re.IGNORECASE)
+
     def get_coordinates_values_in_groups_variables_attributes(
-            self,dataset_name:str)->dict:
+            self,dataset_name:str,
+            group_date_search:str="fast")->dict:
         """
             Retrieve all coordinates and find its location in groups, variables, or attributes.
             This function utilizes gdalmdiminfo to retrieve groups, variables, attributes,
              which should only work with dataset with multi-dimensional arrays, 
              i.e. netcdf, hdf, hdfeos.
+            @param group_date_search: how dates are detected in the group paths
+                when there is no time coordinate. "fast" uses group_date_pattern;
+                "dateparser" also tries dateparser on the paths without a match
+                (much slower, for unusual date formats).
             @return: 
             {
                 "dataset_name":"example.nc",
@@ -91,33 +118,52 @@ class DatasetKeepCoordValuesInCoordVariables:
         _gva_coords['coords_in_attributes'] = [k for k in grp_var_attrs[
             'coordinates'] if k['type'] == 'attribute']
         self._scan_groups_for_date_time(
-            grp_var_attrs,_gva_coords)
+            grp_var_attrs,_gva_coords, group_date_search)
         return _gva_coords
 
     def _scan_groups_for_date_time(
             self, grp_var_attrs:dict,
-            gva_coords):
+            gva_coords:dict, group_date_search:str="fast"):
         """
-            Scan group for date/time in certain format.
-            Used dateparser to search for dates.
+            Scan the group paths for date/time, if there is no time
+            coordinate. The groups found are added as coordinates in groups
+            of type 'group_detected'.
         """
         _time_coords = [k for k in gva_coords[
             'coordinates'] if k['name'].lower() == 'time']
         if len(_time_coords) > 0:
             return
+        the_seen = {self._get_coordinate_key(k) for k in gva_coords['coordinates']}
         for grp in grp_var_attrs['groups']:
-            the_f_path = copy.deepcopy(grp['fullpath'])
-            the_f_path.replace('/', " ").replace("_", " ")
-            times = search_dates(the_f_path)
-            if not times:
+            the_f_path = f"{grp['fullpath']}/{grp['name']}"
+            if not self._has_date_in_group_path(the_f_path, group_date_search):
                 continue
             the_o = dict()
             the_o['fullpath'] = grp['fullpath']
             the_o['parent_path'] = grp['parent_path']
             the_o['type'] = 'group_detected'
             the_o['name'] = grp['name']
-            if the_o not in gva_coords:
-                gva_coords.append(the_o)
+            the_key = self._get_coordinate_key(the_o)
+            if the_key not in the_seen:
+                the_seen.add(the_key)
+                gva_coords['coordinates'].append(the_o)
+                gva_coords['coords_in_groups'].append(the_o)
+                gva_coords['coords_not_in_variables'].append(the_o)
+
+    def _has_date_in_group_path(
+            self, group_path:str, group_date_search:str="fast")->bool:
+        with DatasetProfiler.timer("regex"):
+            if self.group_date_pattern.search(group_path):
+                return True
+        if group_date_search != "dateparser":
+            return False
+        # imported here: dateparser is slow to import
+        from dateparser.search import search_dates
+        the_words = group_path.replace('/', " ").replace("_", " ").strip()
+        if not the_words:
+            return False
+        return bool(DatasetProfiler.call(
+            "dateparser.search_dates", search_dates, the_words))
 
     def get_groups_variables_attributes_and_coordinates(
             self,dataset_name:str)->dict:
@@ -200,7 +246,8 @@ class DatasetKeepCoordValuesInCoordVariables:
             ) = self._gdal_parse_variables_groups_from_dataset_name(dataset_name)
             _gv_str = self._gdal_form_gv_path(_the_groups,_the_var)
 
-            _the_md_info = gdal.MultiDimInfo(_the_file)
+            _the_md_info = DatasetMetadataSnapshot.get_snapshot(
+                dataset_name).get_multidim_info()
 
             if _the_md_info:
                 self._gdal_extract_groups_variables_attributes(
@@ -234,22 +281,76 @@ class DatasetKeepCoordValuesInCoordVariables:
                                   'lon',
                                   'longitude',
                                   'time']
+        the_seen = {self._get_coordinate_key(k) for k in grp_var_attrs['coordinates']}
         for crd in _candidate_coordinates:
-            the_coords = self._gdal_scan_coordinates_attributes(
-                grp_var_attrs,crd)
-            for c in the_coords:
-                if c not in grp_var_attrs['coordinates']:
-                    grp_var_attrs['coordinates'].append(c)
-            the_coords = self._gdal_scan_coordinates_variables(
-                grp_var_attrs,crd)
-            for c in the_coords:
-                if c not in grp_var_attrs['coordinates']:
-                    grp_var_attrs['coordinates'].append(c)
-            the_coords = self._gdal_scan_coordinates_groups(
-                grp_var_attrs,crd)
-            for c in the_coords:
-                if c not in grp_var_attrs['coordinates']:
-                    grp_var_attrs['coordinates'].append(c)
+            for the_coords in (
+                    self._gdal_scan_coordinates_attributes(grp_var_attrs,crd),
+                    self._gdal_scan_coordinates_variables(grp_var_attrs,crd),
+                    self._gdal_scan_coordinates_groups(grp_var_attrs,crd)):
+                self._add_coordinates(grp_var_attrs, the_coords, the_seen)
+
+    def _add_coordinates(
+            self, grp_var_attrs:dict, coords:list, seen:set):
+        """
+            Add the coordinates not in seen (keys of _get_coordinate_key).
+        """
+        for c in coords:
+            the_key = self._get_coordinate_key(c)
+            if the_key not in seen:
+                seen.add(the_key)
+                grp_var_attrs['coordinates'].append(c)
+
+    def _get_coordinate_key(self, coord:dict)->tuple:
+        """
+            Hashable key of a coordinate, equal for equal coordinate dicts.
+        """
+        return (coord['fullpath'], tuple(coord['parent_path']),
+                coord['name'], coord['type'])
+
+    def _get_coordinate_index(self, grp_var_attrs:dict)->dict:
+        """
+            Index of the attributes, variables and groups by lower-case name,
+            in the form of coordinates. It is built once for the lists of
+            grp_var_attrs (get_groups_variables_attributes_and_coordinates),
+            so a coordinate name is resolved without scanning them.
+            @return:
+            {
+                "attribute": {
+                    "coord2": [{
+                        "fullpath":"/group1/variable1",
+                        "parent_path":["","group1","variable1"],
+                        "type":"attribute",
+                        "name":"coord2"}]
+                    },
+                "variable": {...},
+                "group": {...}
+            }
+        """
+        if getattr(self, "_coordinate_index_source", None) is grp_var_attrs:
+            return self._coordinate_index
+        the_index = {"attribute": dict(), "variable": dict(), "group": dict()}
+        for att in grp_var_attrs['attributes']:
+            the_o = dict()
+            the_o['fullpath'] = att['fullpath']
+            the_o['parent_path'] = att['parent_path']
+            if 'variable' in att:
+                the_var = att['variable']
+                the_o['fullpath'] = f"{att['fullpath']}/{the_var}"
+                the_o['parent_path'] = att['parent_path'] + [the_var]
+            the_o['name'] = att['name']
+            the_o['type'] = 'attribute'
+            the_index['attribute'].setdefault(att['name'].lower(), []).append(the_o)
+        for the_type, the_key in (('variable', 'variables'), ('group', 'groups')):
+            for c_item in grp_var_attrs[the_key]:
+                the_o = dict()
+                the_o['fullpath'] = c_item['fullpath']
+                the_o['parent_path'] = c_item['parent_path']
+                the_o['name'] = c_item['name']
+                the_o['type'] = the_type
+                the_index[the_type].setdefault(c_item['name'].lower(), []).append(the_o)
+        self._coordinate_index = the_index
+        self._coordinate_index_source = grp_var_attrs
+        return the_index
 
     def _gdal_scan_coordinates_attributes(
             self, grp_var_attrs:dict,
@@ -261,23 +362,8 @@ class DatasetKeepCoordValuesInCoordVariables:
                 "type":"attribute",
                 "name":"coord2"},
         """
-        the_ret = list()
-        coord_name_l = coord_name.lower()
-        for att in grp_var_attrs['attributes']:
-            if att['name'].lower() == coord_name_l:
-                the_o = dict()
-                the_f_path = att['fullpath']
-                the_p_path = att['parent_path']
-                if 'variable' in att:
-                    the_var = att['variable']
-                    the_f_path = f'{the_f_path}/{the_var}'
-                    the_p_path.append(the_var)
-                the_o['fullpath'] = the_f_path
-                the_o['parent_path'] = the_p_path
-                the_o['name'] = att['name']
-                the_o['type'] = 'attribute'
-                the_ret.append(the_o)
-        return the_ret
+        return list(self._get_coordinate_index(grp_var_attrs)[
+            'attribute'].get(coord_name.lower(), []))
 
     def _gdal_scan_coordinates_variables(
             self, grp_var_attrs:dict,
@@ -289,17 +375,8 @@ class DatasetKeepCoordValuesInCoordVariables:
                 "type":"variable",
                 "name":"coord2"},
         """
-        coord_name_l = coord_name.lower()
-        the_ret = list()
-        for c_var in grp_var_attrs['variables']:
-            if c_var['name'].lower() == coord_name_l:
-                the_o = dict()
-                the_o['fullpath'] = c_var['fullpath']
-                the_o['parent_path'] = c_var['parent_path']
-                the_o['name'] = c_var['name']
-                the_o['type'] = 'variable'
-                the_ret.append(the_o)
-        return the_ret
+        return list(self._get_coordinate_index(grp_var_attrs)[
+            'variable'].get(coord_name.lower(), []))
 
     def _gdal_scan_coordinates_groups(
             self, grp_var_attrs:dict,
@@ -311,22 +388,14 @@ class DatasetKeepCoordValuesInCoordVariables:
                 "type":"group",
                 "name":"coord2"},
         """
-        the_ret = list()
-        coord_name_l = coord_name.lower()
-        for c_grp in grp_var_attrs['groups']:
-            if c_grp['name'].lower() == coord_name_l:
-                the_o = dict()
-                the_o['fullpath'] = c_grp['fullpath']
-                the_o['parent_path'] = c_grp['parent_path']
-                the_o['name'] = c_grp['name']
-                the_o['type'] = 'group'
-                the_ret.append(the_o)
-        return the_ret
+        return list(self._get_coordinate_index(grp_var_attrs)[
+            'group'].get(coord_name.lower(), []))
 
 
     def _gdal_extract_coordinates(
             self, grp_var_attrs:dict,
             dataset_info:dict):
+        the_seen = {self._get_coordinate_key(k) for k in grp_var_attrs['coordinates']}
         for att in grp_var_attrs['attributes']:
             # only look at 'coordinates' under variable ?
             if 'variable' not in att:
@@ -337,9 +406,7 @@ class DatasetKeepCoordValuesInCoordVariables:
             the_coords = self._gdal_retrieve_attribute_value_from_multidim_info(
                 grp_var_attrs,
                 dataset_info, att)
-            for c in the_coords:
-                if c not in grp_var_attrs['coordinates']:
-                    grp_var_attrs['coordinates'].append(c)
+            self._add_coordinates(grp_var_attrs, the_coords, the_seen)
 
     def _gdal_retrieve_attribute_value_from_multidim_info(
             self, grp_var_attrs:dict,
@@ -380,7 +447,7 @@ class DatasetKeepCoordValuesInCoordVariables:
             # if not from root, use the relative path to attr
             if the_cs[0] != '':
                 the_c_fullpath = attr['fullpath']
-                the_c_parent_path = attr['parent_path']
+                the_c_parent_path = list(attr['parent_path'])
             else:
                 the_cs = the_cs[1:]
             if len(the_cs) < 1:
@@ -3,17 +3,31 @@
 """
 import re
 import json
-import string
-from osgeo import gdal
+import time
+from diwg_dataset.common.dataset_handle_pool import DatasetHandlePool
+from diwg_dataset.common.dataset_metadata_snapshot import (
+    DatasetMetadataSnapshot
+)
+from diwg_dataset.common.lazy_module import LazyModule
+
+gdal = LazyModule("osgeo.gdal")
 
 class DatasetVariablePhysicalUnits:
     """
         This class is for testing:
             Use the Units Attribute Only for Variables with Physical Units
     """
-    def get_variable_units(self,dataset_name:str)->dict:
+    def get_variable_units(
+            self,dataset_name:str,
+            units_mode:str="band")->dict:
         """
             Retrieve all the variables and their units.
+            @param units_mode: "band" to read units from the band metadata of
+                gdal.Info on each variable (one entry per band), or "multidim" to
+                read the units attributes of all variables from the single
+                gdal.MultiDimInfo of the granule (one entry per variable).
+                Variables not found in the multidimensional arrays fall back
+                to "band".
             @return: 
             {
                 "dataset_name":"example.nc",
@@ -25,42 +39,73 @@ class DatasetVariablePhysicalUnits:
                         "name": "variable1",
                         "units":["mm"]
                         }
-                    ]
+                    ],
+                "timing": {
+                    "units_mode": "multidim",
+                    "variables_seconds": 0.1,
+                    "units_seconds": 0.02
+                }
             }
         """
         gdal.UseExceptions()
+        _the_start = time.perf_counter()
         _the_variables = self.get_variables(dataset_name)
-        _the_variable_units = self._gdal_add_units_to_variables(
-            _the_variables)
+        _the_timing = dict()
+        _the_timing["units_mode"] = units_mode
+        _the_timing["variables_seconds"] = time.perf_counter() - _the_start
+        _the_start = time.perf_counter()
+        if units_mode == "multidim":
+            _the_variable_units = self._gdal_add_multidim_units_to_variables(
+                dataset_name, _the_variables)
+        else:
+            _the_variable_units = self._gdal_add_units_to_variables(
+                _the_variables)
+        _the_timing["units_seconds"] = time.perf_counter() - _the_start
+        _the_variable_units["timing"] = _the_timing
         return _the_variable_units
 
     def _gdal_add_units_to_variables(
             self,variables:dict)->dict:
         for _the_v in variables['variables']:
             self._gdal_add_units_to_one_variable(_the_v)
-            _the_new_v = self._gdal_add_units_to_one_variable(_the_v)
+        return variables
+
+    def _gdal_add_multidim_units_to_variables(
+            self, dataset_name:str, variables:dict)->dict:
+        try:
+            _the_array_index = DatasetMetadataSnapshot.get_snapshot(
+                dataset_name).get_array_index()
+        except Exception:
+            return self._gdal_add_units_to_variables(variables)
+        for _the_v in variables['variables']:
+            _the_array = _the_array_index.get(_the_v['fullname'].lstrip('/'))
+            if _the_array is None:
+                self._gdal_add_units_to_one_variable(_the_v)
+                continue
+            _the_v['units'] = [
+                _the_array.get('attributes', {}).get('units')]
         return variables
     
     def _gdal_add_units_to_one_variable(
             self, variable:dict)->dict:
         variable['units']=[]
         try:
-            with gdal.Open(variable['path'], gdal.GA_ReadOnly) as the_ds:
-                the_info = gdal.Info(the_ds, format="json")
-                #the_info['bands'][0]['metadata']['']['units']
-                if 'bands' not in the_info:
-                    return variable
-                if len(the_info['bands'])<1:
-                    return variable
-                for band in the_info['bands']:
-                    if (('metadata' in band)
-                        and ('' in band['metadata'])
-                        and ('units' in band['metadata'][''])
-                        ):
-                        variable['units'].append(
-                            band['metadata']['']['units'])
-                    else:
-                        variable['units'].append(None)
+            the_info = DatasetMetadataSnapshot.get_snapshot(
+                variable['path']).get_info(variable['path'])
+            #the_info['bands'][0]['metadata']['']['units']
+            if 'bands' not in the_info:
+                return variable
+            if len(the_info['bands'])<1:
+                return variable
+            for band in the_info['bands']:
+                if (('metadata' in band)
+                    and ('' in band['metadata'])
+                    and ('units' in band['metadata'][''])
+                    ):
+                    variable['units'].append(
+                        band['metadata']['']['units'])
+                else:
+                    variable['units'].append(None)
         except Exception as err:
             print("error: ", str(err))
         return variable
@@ -86,13 +131,8 @@ class DatasetVariablePhysicalUnits:
         _the_variables["variables"] = set()
 
         try:
-            _the_info = None
-            with gdal.Open(dataset_name, gdal.GA_ReadOnly) as _the_ds:
-                if not isinstance(_the_ds, gdal.Dataset):
-                    _the_variables["error"] = "Failed at opening the dataset."
-                    return _the_variables
-
-                _the_info = gdal.Info(_the_ds, format="json")
+            _the_info = DatasetMetadataSnapshot.get_snapshot(
+                dataset_name).get_info(dataset_name)
 
             if _the_info:
                 self._gdal_get_variables(
@@ -126,11 +166,8 @@ class DatasetVariablePhysicalUnits:
         _the_subdatasets = self._gdal_get_subdatasets(dataset_info)
 
         for ds_name in _the_subdatasets:
-            _the_info = None
-            with gdal.Open(ds_name, gdal.GA_ReadOnly) as _the_ds:
-                if not isinstance(_the_ds, gdal.Dataset):
-                    continue
-                _the_info = gdal.Info(_the_ds, format="json")
+            _the_info = DatasetMetadataSnapshot.get_snapshot(
+                ds_name).get_info(ds_name)
             if _the_info:
                 self._gdal_get_variables(
                     group_variables,ds_name,_the_info
@@ -191,14 +228,23 @@ class DatasetVariablePhysicalUnits:
             ds_format:str, ds_filename:str, ds_group_variable:str,
             var_candidate:str,group_path:str):
         """
-            This function actually trys to open the variable, which
-            makes it very stlow.
+            Look up the variable in the index of arrays from gdal.MultiDimInfo
+            of the granule. Drivers without multidimensional API (e.g. HDF4)
+            fall back to trying to open the variable, which is very slow.
         """
         try:
+            _the_array_index = None
             _the_ds_format = ds_format
+            try:
+                _the_snapshot = DatasetMetadataSnapshot.get_snapshot(ds_filename)
+                _the_array_index = _the_snapshot.get_array_index()
+                if not _the_ds_format:
+                    _the_ds_format = _the_snapshot.get_driver_name()
+            except Exception:
+                _the_array_index = None
             if not _the_ds_format:
-                with gdal.Open(ds_filename, gdal.GA_ReadOnly) as _the_ds:
-                    _the_ds_format=_the_ds.GetDriver().ShortName.upper()
+                _the_ds = DatasetHandlePool.open(ds_filename)
+                _the_ds_format=_the_ds.GetDriver().ShortName.upper()
             _the_ds_group = ""
             if "/" in ds_group_variable.lstrip('/'):
                 _dsgs = ds_group_variable.lstrip('/').rsplit("/",1)
@@ -213,25 +259,21 @@ class DatasetVariablePhysicalUnits:
             if len(group_path)>0:
                 group_path = f"{group_path}/"
 
-
-            _the_test_ds = f'{_the_ds_format}:"{ds_filename}"://{_the_ds_group}{var_candidate}'
-            if self._gdal_test_dataset(_the_test_ds):
-                _the_var = dict()
-                _the_var['path']=_the_test_ds
-                _the_var['fullname']=f'//{_the_ds_group}{var_candidate}'
-                _the_var['name']=var_candidate
-                _the_var_jsonstr = json.dumps(_the_var)
-                group_variables['variables'].add(_the_var_jsonstr)
-            else:
-                #2nd try with the path from metadata
-                _the_test_ds = f'{_the_ds_format}:"{ds_filename}"://{group_path}{var_candidate}'
-                if self._gdal_test_dataset(_the_test_ds):
+            #1st try with the group of the dataset, 2nd with the path from metadata
+            for _the_group in (_the_ds_group, group_path):
+                _the_test_ds = f'{_the_ds_format}:"{ds_filename}"://{_the_group}{var_candidate}'
+                if _the_array_index is not None:
+                    _the_found = f"{_the_group}{var_candidate}" in _the_array_index
+                else:
+                    _the_found = self._gdal_test_dataset(_the_test_ds)
+                if _the_found:
                     _the_var = dict()
                     _the_var['path']=_the_test_ds
-                    _the_var['fullname']=f'//{group_path}{var_candidate}'
+                    _the_var['fullname']=f'//{_the_group}{var_candidate}'
                     _the_var['name']=var_candidate
                     _the_var_jsonstr = json.dumps(_the_var)
                     group_variables['variables'].add(_the_var_jsonstr)
+                    break
 
         except Exception:
             #print("Error: ", str(err))
@@ -240,9 +282,9 @@ class DatasetVariablePhysicalUnits:
 
     def _gdal_test_dataset(self,dataset_name:str)->bool:
         try:
-            with gdal.Open(dataset_name,gdal.GA_ReadOnly) as the_ds:
-                if isinstance(the_ds, gdal.Dataset):
-                    return True
+            the_ds = DatasetHandlePool.open(dataset_name)
+            if isinstance(the_ds, gdal.Dataset):
+                return True
             return False
         except Exception:
             #print("Warning:", str(err))
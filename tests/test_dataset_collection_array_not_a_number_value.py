@@ -0,0 +1,179 @@
+"""
+    Not-a-Number (NaN) Value
+    (Recommendation 3.7 in ESDS-RFC-036v1.2)
+
+    https://wiki.earthdata.nasa.gov/display/ESDSWG/Not-a-Number+%28NaN%29+Value
+"""
+import json
+import pytest
+from diwg_dataset.data.dataset_collection_not_a_number_value import (
+    DatasetCollectionNotANumberValue)
+
+def setup_module(module):
+    """Setup at the module level"""
+    print("setup module level")
+
+
+def teardown_module(module):
+    """Setup at the module level"""
+    print("teardown module level")
+
+@pytest.fixture(scope="class")
+def dataset_collection(request):
+    """
+        Retrieve the dataset-name from the command line options.
+        Expect the following
+        the_ret_dataset = 
+            {
+            collection_name: "thecollection_list.file",
+            error: "Error message if there is error",
+            datasets: [{
+                "dataset_name": "test_dataset.nc",
+                "error": "add error here if there is a general error",
+                "variables":[{
+                    "fullname":"/group1/variable1",
+                    "error":"message for error if error exists",
+                    "data_type": "Float32",
+                    "_FillValue": -9999.0,
+                    "missing_value": None,
+                    "count": 1036800,
+                    "nan_count": 12,
+                    "fill_value_count": 3400,
+                    "chunk_count": 4
+                }]
+            }]
+            }
+    """
+    #setup - class
+    the_dataset_name=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_chunk_memory=request.config.getoption("--dataset-chunk-memory")
+    the_sample_fraction=request.config.getoption("--dataset-sample-chunks")
+    the_sample_escalate=request.config.getoption("--dataset-sample-escalate")
+    the_dataset_sample_fraction=request.config.getoption("--dataset-sample-granules")
+    the_dmp = DatasetCollectionNotANumberValue()
+    the_ret_dataset = the_dmp.get_nan_values(
+        the_dataset_name,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        max_chunk_memory=the_chunk_memory,
+        dataset_sample_fraction=the_dataset_sample_fraction,
+        sample_fraction=the_sample_fraction,
+        sample_escalate=the_sample_escalate)
+    # return the_database_name
+    yield the_ret_dataset
+    # teardown - class
+    the_ret_dataset = None
+    the_dmp = None
+
+
+@pytest.mark.skip_dataset_collection_noneexistence
+class TestClassDatasetCollectionNotANumberValue:
+    """
+        This test class is for compliance check against the recommendation on
+        Not-a-Number (NaN) Value
+        (Recommendation 3.7 in ESDS-RFC-036v1.2)
+
+        https://wiki.earthdata.nasa.gov/display/ESDSWG/Not-a-Number+%28NaN%29+Value
+    """
+    def setup_class(self):
+        """
+            Setup at the class level.
+        """
+        pass
+
+    def test_dataset_nan_not_used_as_fill_value(self, dataset_collection):
+        """
+            Test that NaN is not used for _FillValue or missing_value.
+        """
+        self._check_collection(
+            dataset_collection,
+            self._process_one_dataset_nan_not_used_as_fill_value)
+
+    def test_dataset_has_no_nan_values(self, dataset_collection):
+        """
+            Test that the floating-point variables have no NaN values.
+        """
+        self._check_collection(
+            dataset_collection,
+            self._process_one_dataset_has_no_nan_values)
+
+    def _check_collection(self, dataset_collection:dict, process_one_dataset):
+        if "error" in dataset_collection:
+            _the_o = dict()
+            _the_o["collection_name"]=dataset_collection['collection_name']
+            _the_o["error"]=dataset_collection['error']
+            _the_reason = json.dumps(_the_o)
+            pytest.xfail(_the_reason)
+        _test_results = list()
+        for dataset in dataset_collection["datasets"]:
+            _the_result = process_one_dataset(dataset)
+            if _the_result:
+                _test_results.append(_the_result)
+        _the_o = dict()
+        _the_o["collection_name"]=dataset_collection["collection_name"]
+        if "sampling" in dataset_collection:
+            _the_o["sampling"]=dataset_collection["sampling"]
+        _the_o["errors"]=_test_results
+        text_except_message = json.dumps(_the_o)
+        assert len(_test_results) == 0, text_except_message
+
+    def _process_one_dataset_nan_not_used_as_fill_value(self, dataset:dict)->dict:
+        if "error" in dataset:
+            _the_o = dict()
+            _the_o["dataset_name"]=dataset['dataset_name']
+            _the_o["error"]=dataset['error']
+            return _the_o
+        test_results = list()
+        for variable in dataset['variables']:
+            for _the_attr in ("_FillValue", "missing_value"):
+                if variable.get(_the_attr) == "NaN":
+                    _the_o = dict()
+                    _the_o['variable']=variable["fullname"]
+                    _the_o['error']=f"NaN used as {_the_attr}"
+                    test_results.append(_the_o)
+        if len(test_results) == 0:
+            return None
+        _the_o = dict()
+        _the_o["dataset_name"]=dataset["dataset_name"]
+        _the_o["errors"]=test_results
+        return _the_o
+
+    def _process_one_dataset_has_no_nan_values(self, dataset:dict)->dict:
+        if "error" in dataset:
+            _the_o = dict()
+            _the_o["dataset_name"]=dataset['dataset_name']
+            _the_o["error"]=dataset['error']
+            return _the_o
+        test_results = list()
+        for variable in dataset['variables']:
+            if "error" in variable:
+                _the_o = dict()
+                _the_o['variable']=variable["fullname"]
+                _the_o['error']=variable['error']
+                test_results.append(_the_o)
+                continue
+            if variable["nan_count"] > 0:
+                _the_o = dict()
+                _the_o['variable']=variable["fullname"]
+                _the_o['error']=(f"Found {variable['nan_count']} NaN values "
+                                 f"in {variable['count']} values")
+                if "nan_fraction" in variable.get("sampling", {}):
+                    _the_o['error'] += (
+                        " read in a sample of the chunks - estimated NaN fraction: "
+                        f"{self._format_bounds(variable['sampling']['nan_fraction'])}")
+                test_results.append(_the_o)
+        if len(test_results) == 0:
+            return None
+        _the_o = dict()
+        _the_o["dataset_name"]=dataset["dataset_name"]
+        _the_o["errors"]=test_results
+        return _the_o
+
+    def _format_bounds(self, bounds:dict)->str:
+        return (f"{bounds['estimate']:.3g} "
+                f"[{bounds['lower']:.3g}, {bounds['upper']:.3g}] "
+                f"at {bounds['confidence']:.0%} confidence")
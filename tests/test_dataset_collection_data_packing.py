@@ -47,8 +47,15 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_name=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
     the_dmp = DatasetCollectionMetaPacking()
-    the_ret_dataset = the_dmp.get_packing_metadata(the_dataset_name)
+    the_ret_dataset = the_dmp.get_packing_metadata(
+        the_dataset_name,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
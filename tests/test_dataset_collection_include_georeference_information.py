@@ -4,10 +4,8 @@
     https://wiki.earthdata.nasa.gov/display/ESDSWG/Include+Georeference+Information+with+Geospatial+Coordinates
 
 """
-import re
 import json
 import pytest
-import cfunits
 
 from diwg_dataset.metadata.dataset_collection_include_georeference_information import (
     DatasetCollectionIncludeGeoreferenceInformation)
@@ -68,8 +66,17 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_georeference_mode=request.config.getoption("--dataset-georeference-mode")
     the_dmp = DatasetCollectionIncludeGeoreferenceInformation()
-    the_ret_dataset = the_dmp.get_variables(the_dataset_collection_filename)
+    the_ret_dataset = the_dmp.get_variables(
+        the_dataset_collection_filename,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        georeference_mode=the_georeference_mode)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
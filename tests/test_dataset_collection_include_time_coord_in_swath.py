@@ -4,10 +4,8 @@ Include Time Coordinate in Swath Structured Data
 https://wiki.earthdata.nasa.gov/display/ESDSWG/Include+Time+Coordinate+in+Swath+Structured+Data
 
 """
-import re
 import json
 import pytest
-import cfunits
 
 from diwg_dataset.metadata.dataset_collection_include_time_coord_in_swath import (
     DatasetCollectionIncludeTimeCoordInSwath)
@@ -49,8 +47,15 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
     the_dmp = DatasetCollectionIncludeTimeCoordInSwath()
-    the_ret_dataset = the_dmp.get_variables_with_dims(the_dataset_collection_filename)
+    the_ret_dataset = the_dmp.get_variables_with_dims(
+        the_dataset_collection_filename,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -4,10 +4,8 @@ Keep Coordinate Values in Coordinate Variables
 https://wiki.earthdata.nasa.gov/display/ESDSWG/Keep+Coordinate+Values+in+Coordinate+Variables
 
 """
-import re
 import json
 import pytest
-import cfunits
 
 from diwg_dataset.metadata.dataset_collection_keep_coordinate_values_in_coordinate_variables import (
     DatasetCollectionKeepCoordValuesInCoordVariables)
@@ -92,9 +90,17 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_group_date_search=request.config.getoption("--dataset-group-date-search")
     the_dmp = DatasetCollectionKeepCoordValuesInCoordVariables()
     the_ret_dataset = the_dmp.get_coordinates_values_in_groups_variables_attributes(
-        the_dataset_collection_filename)
+        the_dataset_collection_filename,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        group_date_search=the_group_date_search)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -4,11 +4,10 @@ Use the Units Attribute Only for Variables with Physical Units
 https://wiki.earthdata.nasa.gov/pages/viewpage.action?pageId=182296347
 
 """
-import re
 import json
 import pytest
-import cfunits
 
+from diwg_dataset.common.units_validation import UnitsValidation
 from diwg_dataset.metadata.dataset_collection_variable_physical_units import (
     DatasetCollectionVariablePhysicalUnits)
 
@@ -46,8 +45,17 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_units_mode=request.config.getoption("--dataset-units-mode")
     the_dmp = DatasetCollectionVariablePhysicalUnits()
-    the_ret_dataset = the_dmp.get_variable_units(the_dataset_collection_filename)
+    the_ret_dataset = the_dmp.get_variable_units(
+        the_dataset_collection_filename,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        units_mode=the_units_mode)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -88,7 +96,7 @@ class TestClassDatasetCollectionVariableUnits:
         pass
 
     def test_variable_units(
-            self, dataset_collection):
+            self, dataset_collection, units_validation):
         """
             Test units consistency across datasets.
             Intermediate test_results: A list of failed test results where each test result is 
@@ -110,7 +118,7 @@ class TestClassDatasetCollectionVariableUnits:
             pytest.xfail(_the_reason)
         _test_results = list()
         for dataset in dataset_collection["datasets"]:
-            _the_result = self._process_one_dataset(dataset)
+            _the_result = self._process_one_dataset(dataset, units_validation)
             if _the_result:
                 _test_results.append(_the_result)
         _the_o = dict()
@@ -120,7 +128,7 @@ class TestClassDatasetCollectionVariableUnits:
         assert len(_test_results) == 0, text_except_message
 
     def _process_one_dataset(
-            self, dataset):
+            self, dataset, units_validation:UnitsValidation):
         """
             Test units of variables in a dataset following CF convention.
             Intermediate test_results: A list of failed test results where each test result is 
@@ -139,7 +147,7 @@ class TestClassDatasetCollectionVariableUnits:
             self._check_variable_units_1(
                 test_results,_the_var)
             self._check_variable_units_2(
-                test_results,_the_var)
+                test_results,_the_var,units_validation)
         _the_o = dict()
         _the_o["dataset_name"]=dataset["dataset_name"]
         _the_o["errors"]=test_results
@@ -176,13 +184,13 @@ class TestClassDatasetCollectionVariableUnits:
                 test_results.append(_the_o)
 
     def _check_variable_units_2(
-            self,test_results:list,variable:dict):
+            self,test_results:list,variable:dict,
+            units_validation:UnitsValidation):
         """
         Values of the units attribute should be supported by the UDUNITS-2 library.
         """
         for sunit in variable['units']:
-            _tu = cfunits.Units(sunit)
-            if not _tu.isvalid:
+            if not units_validation.is_valid(sunit):
                 _the_o = dict()
                 _the_o["variable_name"]=variable["fullname"]
                 _the_o["error"]=("Units attribute value is not supported by "
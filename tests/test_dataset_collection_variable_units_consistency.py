@@ -3,12 +3,12 @@ Consistent Units Attribute Value for Variables Across One Data Collection
 
 https://wiki.earthdata.nasa.gov/display/ESDSWG/Consistent+Units+Attribute+Value+for+Variables+Across+One+Data+Collection
 """
-import re
 import json
 import pytest
 
-from diwg_dataset.metadata.dataset_collection_variable_physical_units import (
-    DatasetCollectionVariablePhysicalUnits)
+from diwg_dataset.common.units_validation import UnitsValidation
+from diwg_dataset.metadata.dataset_collection_variable_units_consistency import (
+    DatasetCollectionVariableUnitsConsistency)
 
 def setup_module(module):
     """Setup at the module level"""
@@ -28,15 +28,17 @@ def dataset_collection(request):
             {
             collection_name: "thecollection_list.file",
             error: "Error message if there is error",
-            datasets: [{
-                "dataset_name":"example.nc",
-                "error":"message for error if error exists",
-                "variables":[
+            units_reference: "first",
+            reference_dataset: "example1.nc",
+            datasets_count: 2,
+            discrepancies: [{
+                "dataset_name":"example2.nc",
+                "errors":[
                         {
-                        "path": 'NETCDF:"somevariable.nc"://group1/variable1',
-                        "fullname":"//group1/variable1",
-                        "name": "variable1",
-                        "units":["mm"]
+                        "dataset_name": 'NETCDF:"example2.nc"://group1/variable1',
+                        "error": "Inconsistent units - '[m]' vs '[mm]'",
+                        "units": ["m"],
+                        "reference_units": ["mm"]
                         }
                     ]
                 }]
@@ -44,8 +46,19 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
-    the_dmp = DatasetCollectionVariablePhysicalUnits()
-    the_ret_dataset = the_dmp.get_variable_units(the_dataset_collection_filename)
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_units_mode=request.config.getoption("--dataset-units-mode")
+    the_units_reference=request.config.getoption("--dataset-units-reference")
+    the_dmp = DatasetCollectionVariableUnitsConsistency()
+    the_ret_dataset = the_dmp.get_units_consistency(
+        the_dataset_collection_filename,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        units_mode=the_units_mode,
+        units_reference=the_units_reference)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -69,15 +82,17 @@ class TestClassDatasetCollectionVarialeUnitsConsistency:
                 {
                 collection_name: "thecollection_list.file",
                 error: "Error message if there is error",
-                datasets: [{
-                    "dataset_name":"example.nc",
-                    "error":"message for error if error exists",
-                    "variables":[
+                units_reference: "first",
+                reference_dataset: "example1.nc",
+                datasets_count: 2,
+                discrepancies: [{
+                    "dataset_name":"example2.nc",
+                    "errors":[
                             {
-                            "path": 'NETCDF:"somevariable.nc"://group1/variable1',
-                            "fullname":"//group1/variable1",
-                            "name": "variable1",
-                            "units":["mm"]
+                            "dataset_name": 'NETCDF:"example2.nc"://group1/variable1',
+                            "error": "Inconsistent units - '[m]' vs '[mm]'",
+                            "units": ["m"],
+                            "reference_units": ["mm"]
                             }
                         ]
                     }]
@@ -86,13 +101,14 @@ class TestClassDatasetCollectionVarialeUnitsConsistency:
         pass
 
     def test_units_consistency(
-            self, dataset_collection):
+            self, dataset_collection, units_validation):
         """
             Test units consistency across datasets.
             Intermediate test_results: A list of failed test results where each test result is 
             an object:
-                * Test type (group, variable, or attribute)
-                * Test name
+                * dataset_name: error dataset
+                * error: general error of the dataset, or
+                * errors: list of inconsistent or missing variables
         """
         if "error" in dataset_collection:
             _the_o = dict()
@@ -100,65 +116,92 @@ class TestClassDatasetCollectionVarialeUnitsConsistency:
             _the_o["error"]=dataset_collection['error']
             _the_reason = json.dumps(_the_o)
             pytest.xfail(_the_reason)
-        if len(dataset_collection['datasets'])<1:
+        if dataset_collection['datasets_count']<1:
             _the_o = dict()
             _the_o["collection_name"]=dataset_collection['collection_name']
             _the_o["error"]="Empty collection"
             _the_reason = json.dumps(_the_o)
             pytest.xfail(_the_reason)
         _test_results = list()
-        _the_ref_ds = dataset_collection["datasets"][0]
-        for dataset in dataset_collection["datasets"]:
-            _the_result = self._process_one_dataset(dataset, _the_ref_ds)
-            if _the_result:
-                _test_results.append(_the_result)
+        for _the_result in dataset_collection["discrepancies"]:
+            for _the_error in _the_result.get("errors", []):
+                self._mark_equivalent_units(_the_error, units_validation)
+            _test_results.append(_the_result)
         _the_o = dict()
         _the_o["collection_name"]=dataset_collection["collection_name"]
+        _the_o["units_reference"]=dataset_collection["units_reference"]
         _the_o["errors"]=_test_results
         text_except_message = json.dumps(_the_o)
         assert len(_test_results) == 0, text_except_message
 
+    def _mark_equivalent_units(
+            self, error:dict, units_validation:UnitsValidation):
+        """
+            Note the units differing only in spelling, e.g. 'm/s' vs 'm s-1'.
+        """
+        if "units" not in error:
+            return
+        _the_units = error["units"]
+        _the_ref_units = error["reference_units"]
+        if len(_the_units) != len(_the_ref_units):
+            return
+        for _u, _r_u in zip(_the_units, _the_ref_units):
+            if not units_validation.is_equivalent(_u, _r_u):
+                return
+        error["error"] += " (equivalent in UDUNITS-2)"
+
+
+def get_units_dataset(dataset_name:str, variables:list)->dict:
+    """
+        Result of DatasetVariablePhysicalUnits.get_variable_units for a dataset
+        with variables of (fullname, units).
+    """
+    return {
+        "dataset_name": dataset_name,
+        "variables": [
+            {"fullname": _v_name,
+             "path": f'NETCDF:"{dataset_name}":{_v_name}',
+             "units": [_units]}
+            for _v_name, _units in variables]}
 
-    def _process_one_dataset(self,dataset:dict, ref_dataset:dict)->dict:
+
+class TestClassUnitsConsistencyAmbiguousVariables:
+    """
+        Test the variables duplicated in a dataset (same fullname).
+    """
+    def get_errors(self, ret:dict)->dict:
+        return {_d["dataset_name"]: [_e["error"] for _e in _d.get("errors", [])]
+                for _d in ret["discrepancies"]}
+
+    @pytest.mark.parametrize("check", ["_check_with_first", "_check_with_majority"])
+    def test_ambiguous_in_reference(self, check):
         """
-            Test units consistency across datasets.
-            Intermediate test_results: A list of failed test results where each test result is 
-            an dict with the following attributes:
-                * dataset_name: error dataset(with variable path)
-                * error: error message
+            Test that the duplicated variables of the first dataset are reported.
         """
-        #dataset = self.ds
-        if "error" in dataset:
-            _the_dict = dict()
-            _the_dict["error"]=dataset["error"]
-            _the_dict["dataset_name"]=dataset["path"]
-            return _the_dict
-        test_results = list()
-        # test variable units
-        for _r_var in ref_dataset['variables']:
-            _r_v_name = _r_var['fullname']
-            the_var = [k for k in dataset['variables'] if k['fullname'] == _r_v_name]
-            if len(the_var) == 1:
-                _u = ','.join(map(str,the_var[0]['units']))
-                _r_u = ','.join(map(str,_r_var['units']))
-                if _u != _r_u:
-                    _the_o = dict()
-                    _the_o["dataset_name"]=the_var[0]["path"]
-                    _the_o["error"]=(
-                        f"Inconsistent units - '[{_u}]' "
-                        f"vs '[{_r_u}]'")
-                    test_results.append(_the_o)
-            else:
-                _the_o = dict()
-                _the_o["dataset_name"]=dataset["dataset_name"]
-                _the_o["error"]=(
-                    f"No matching or ambiguous var - '{_r_v_name}'")
-                test_results.append(_the_o)
+        the_datasets = [
+            get_units_dataset("example1.nc", [("//v1", "m"), ("//v1", "m"), ("//v2", "K")]),
+            get_units_dataset("example2.nc", [("//v1", "m"), ("//v2", "K")]),
+            get_units_dataset("example3.nc", [("//v1", "m"), ("//v2", "K")]),
+        ]
+        the_ret = {"datasets_count": 0, "discrepancies": list()}
+        getattr(DatasetCollectionVariableUnitsConsistency(), check)(
+            the_ret, iter(the_datasets))
+        assert self.get_errors(the_ret) == {
+            "example1.nc": ["No matching or ambiguous var - '//v1'"]}
 
-        _the_o = dict()
-        _the_o["dataset_name"]=dataset["dataset_name"]
-        _the_o["errors"]=test_results
-        if len(test_results) == 0:
-            return None
-        else:
-            return _the_o
+    @pytest.mark.parametrize("check", ["_check_with_first", "_check_with_majority"])
+    def test_ambiguous_in_other_dataset(self, check):
+        """
+            Test that the duplicated variables of another dataset are reported
+            once.
+        """
+        the_datasets = [
+            get_units_dataset("example1.nc", [("//v1", "m"), ("//v2", "K")]),
+            get_units_dataset("example2.nc", [("//v1", "m"), ("//v2", "K"), ("//v2", "K")]),
+            get_units_dataset("example3.nc", [("//v1", "m"), ("//v2", "K")]),
+        ]
+        the_ret = {"datasets_count": 0, "discrepancies": list()}
+        getattr(DatasetCollectionVariableUnitsConsistency(), check)(
+            the_ret, iter(the_datasets))
+        assert self.get_errors(the_ret) == {
+            "example2.nc": ["No matching or ambiguous var - '//v2'"]}
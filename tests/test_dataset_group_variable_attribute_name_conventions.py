@@ -4,12 +4,12 @@ Character Set for User-Defined Group, Variable, and Attribute Names
 https://wiki.earthdata.nasa.gov/display/ESDSWG/Character+Set+for+User-Defined+Group%2C+Variable%2C+and+Attribute+Names
 
 """
-import re
 import json
 import pytest
 
 from diwg_dataset.metadata.dataset_group_variable_attribute_name import (
     DatasetGroupVariableAttributeName)
+from diwg_dataset.common.name_validation import get_invalid_names
 
 def setup_module(module):
     """Setup at the module level"""
@@ -81,38 +81,8 @@ class TestClassDatasetGroupVariableAttributeNameConvention:
             _the_dict["dataset_name"]=dataset["dataset_name"]
             _the_reason = json.dumps(_the_dict)
             pytest.xfail(_the_reason)
-        test_results = list()
-        cf_regex = re.compile(r'^[A-Za-z][A-Za-z0-9_]*$')
-        # test group names
-        _the_group=list()
-        for name in dataset["group_names"]:
-            if cf_regex.match(name) is None:
-                _the_group.append(name)
-        if len(_the_group)>0:
-            _the_o = dict()
-            _the_o["type"]="group"
-            _the_o["invalid_values"]=_the_group
-            test_results.append(_the_o)
-        # test variable names
-        _the_variable=list()
-        for name in dataset["variable_names"]:
-            if cf_regex.match(name) is None:
-                _the_variable.append(name)
-        if len(_the_variable)>0:
-            _the_o = dict()
-            _the_o["type"]="variable"
-            _the_o["invalid_values"]=_the_variable
-            test_results.append(_the_o)
-        # test attribute names
-        _the_attribute=list()
-        for name in dataset["attribute_names"]:
-            if cf_regex.match(name) is None:
-                _the_attribute.append(name)
-        if len(_the_attribute)>0:
-            _the_o = dict()
-            _the_o["type"]="attribute"
-            _the_o["invalid_values"]=_the_attribute
-            test_results.append(_the_o)
+        # test group, variable and attribute names
+        test_results = get_invalid_names(dataset)
         _the_o = dict()
         _the_o["dataset_name"]=dataset["dataset_name"]
         _the_o["errors"]=test_results
@@ -0,0 +1,62 @@
+"""
+    Handles of the pool in the worker processes of a collection run.
+
+    The handles are stand-ins for gdal datasets: no GDAL and no dataset option
+    is needed.
+"""
+from collections import OrderedDict
+import pytest
+
+from diwg_dataset.common.dataset_collection import init_worker
+from diwg_dataset.common.dataset_handle_pool import DatasetHandlePool
+from diwg_dataset.common.dataset_io_profile import DatasetIOProfile
+
+class ParentHandle:
+    """
+        Handle opened in the parent process, recording if it is closed.
+    """
+    def __init__(self):
+        self.closed = False
+
+    def Close(self):
+        self.closed = True
+
+
+@pytest.fixture(scope="function")
+def parent_pool(monkeypatch):
+    """
+        Pool with the handles of the parent process, as inherited by a forked
+        worker. The pool and the I/O profile are restored after the test.
+        the_ret = [ParentHandle, ParentHandle]
+    """
+    the_handles = [ParentHandle(), ParentHandle()]
+    monkeypatch.setattr(DatasetHandlePool, "_handles", OrderedDict(
+        ((("example.nc", False), the_handles[0]),
+         (("example.nc", True), the_handles[1]))))
+    monkeypatch.setattr(DatasetHandlePool, "max_handles", DatasetHandlePool.max_handles)
+    monkeypatch.setattr(DatasetIOProfile, "name", DatasetIOProfile.name)
+    monkeypatch.setattr(DatasetIOProfile, "_settings", DatasetIOProfile._settings)
+    yield the_handles
+
+
+class TestClassDatasetHandlePool:
+    """
+        Set up of the pool in a worker process.
+    """
+    def test_init_worker_drops_parent_handles(self, parent_pool):
+        """
+            Test that the handles inherited from the parent are dropped from
+            the pool of the worker without being closed.
+        """
+        init_worker("default", [], 4)
+        assert DatasetHandlePool.get_open_count() == 0
+        assert DatasetHandlePool.max_handles == 4
+        assert not any(_h.closed for _h in parent_pool)
+
+    def test_clear_closes_handles(self, parent_pool):
+        """
+            Test that clear() closes the handles of the process.
+        """
+        DatasetHandlePool.clear()
+        assert DatasetHandlePool.get_open_count() == 0
+        assert all(_h.closed for _h in parent_pool)
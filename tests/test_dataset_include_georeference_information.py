@@ -4,10 +4,8 @@
     https://wiki.earthdata.nasa.gov/display/ESDSWG/Include+Georeference+Information+with+Geospatial+Coordinates
 
 """
-import re
 import json
 import pytest
-import cfunits
 
 from diwg_dataset.metadata.dataset_include_georeference_information import (
     DatasetIncludeGeoreferenceInformation)
@@ -61,8 +59,10 @@ def dataset(request):
     """
     #setup - class
     the_dataset_name=request.config.getoption("--dataset-name")
+    the_georeference_mode=request.config.getoption("--dataset-georeference-mode")
     the_dmp = DatasetIncludeGeoreferenceInformation()
-    the_ret_dataset = the_dmp.get_variables(the_dataset_name)
+    the_ret_dataset = the_dmp.get_variables(
+        the_dataset_name, georeference_mode=the_georeference_mode)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
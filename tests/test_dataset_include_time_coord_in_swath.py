@@ -4,10 +4,8 @@ Include Time Coordinate in Swath Structured Data
 https://wiki.earthdata.nasa.gov/display/ESDSWG/Include+Time+Coordinate+in+Swath+Structured+Data
 
 """
-import re
 import json
 import pytest
-import cfunits
 
 from diwg_dataset.metadata.dataset_include_time_coord_in_swath import (
     DatasetIncludeTimeCoordInSwath)
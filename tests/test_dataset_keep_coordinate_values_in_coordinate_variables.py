@@ -4,10 +4,8 @@ Keep Coordinate Values in Coordinate Variables
 https://wiki.earthdata.nasa.gov/display/ESDSWG/Keep+Coordinate+Values+in+Coordinate+Variables
 
 """
-import re
 import json
 import pytest
-import cfunits
 
 from diwg_dataset.metadata.dataset_keep_coordinate_values_in_coordinate_variables import (
     DatasetKeepCoordValuesInCoordVariables)
@@ -86,9 +84,10 @@ def dataset(request):
     """
     #setup - class
     the_dataset_name=request.config.getoption("--dataset-name")
+    the_group_date_search=request.config.getoption("--dataset-group-date-search")
     the_dmp = DatasetKeepCoordValuesInCoordVariables()
     the_ret_dataset = the_dmp.get_coordinates_values_in_groups_variables_attributes(
-         the_dataset_name)
+         the_dataset_name, group_date_search=the_group_date_search)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -214,3 +213,50 @@ class TestClassDatasetKeepCoordValuesInCoordVariables:
         _the_o["errors"]=test_results
         test_except_message = json.dumps(_the_o)
         assert len(test_results) == 0, test_except_message
+
+
+class TestClassGroupDatePattern:
+    """
+        Dates in group paths, used when a dataset has no time coordinate.
+        No dataset is needed.
+    """
+    @pytest.mark.parametrize("group_path", [
+        "/HDFEOS/GRIDS/MODIS_Grid_8Day_1km_LST",
+        "/HDFEOS/GRIDS/MODIS_Grid_16DAY_250m_500m_VI",
+        "/HDFEOS/GRIDS/MODIS_Grid_Daily_1km_LST",
+        "/HDFEOS/GRIDS/MODIS_Grid_Month_6km_LST",
+        "/HDFEOS/SWATHS/Swath_2019_250m",
+        "/HDFEOS/SWATHS/MODIS_SWATH_Type_L2/Geolocation_Fields",
+        "/group_Day_1",
+    ])
+    def test_group_path_without_date(self, group_path):
+        """
+            Test grid and swath names that are not dates.
+        """
+        the_checker = DatasetKeepCoordValuesInCoordVariables()
+        assert not the_checker._has_date_in_group_path(group_path)
+
+    @pytest.mark.parametrize("group_path", [
+        "/observations_2010-12-10",
+        "/observations_2010_12_10",
+        "/observations_2010.12.10/data",
+        "/observations_20101210",
+        "/2010344",
+        "/observations_2010-344",
+        "/observations_2010_344",
+        "/granule_A2010344",
+        "/2010/12/10",
+        "/2010/12",
+        "/2010",
+        "/Day_001",
+        "/doy-344",
+        "/julian_day344",
+        "/Month12",
+        "/Year2010/data",
+    ])
+    def test_group_path_with_date(self, group_path):
+        """
+            Test the documented date forms.
+        """
+        the_checker = DatasetKeepCoordValuesInCoordVariables()
+        assert the_checker._has_date_in_group_path(group_path)
@@ -0,0 +1,84 @@
+"""
+    Attribution of the profiled operations (--dataset-profile) to the test
+    modules.
+
+    The single-granule checks run in class-scoped fixtures, so the operations
+    timed in the setup of a test must be recorded under its module name.
+"""
+import csv
+import os
+import shutil
+import subprocess
+import sys
+import pytest
+
+# test module run with the profile, in a new pytest session
+profiled_test_module = '''
+import pytest
+from diwg_dataset.common.dataset_profiler import DatasetProfiler
+
+@pytest.fixture(scope="class")
+def dataset(request):
+    with DatasetProfiler.timer("fixture_operation"):
+        pass
+    yield dict()
+
+class TestClassProfiled:
+    def test_profiled(self, dataset):
+        with DatasetProfiler.timer("call_operation"):
+            pass
+'''
+
+@pytest.fixture(scope="function")
+def profile_records(tmp_path):
+    """
+        Run the profiled test module with --dataset-profile in a new pytest
+        session, with the conftest of the compliance tests.
+        the_ret =
+            [
+                {"checker": "test_profiled", "granule": "example.nc",
+                 "operation": "fixture_operation", "count": "1", "seconds": "0.000001"},
+                ...
+            ]
+    """
+    the_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    shutil.copy(os.path.join(the_root, "conftest.py"), tmp_path / "conftest.py")
+    (tmp_path / "test_profiled.py").write_text(profiled_test_module)
+    the_profile = tmp_path / "profile.csv"
+    the_env = dict(os.environ)
+    the_env["PYTHONPATH"] = os.pathsep.join(
+        [the_root] + [_p for _p in [the_env.get("PYTHONPATH")] if _p])
+    subprocess.run(
+        [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+         "test_profiled.py", "--dataset-name=example.nc",
+         f"--dataset-profile={the_profile}"],
+        cwd=tmp_path, env=the_env, capture_output=True, text=True, check=True)
+    with open(the_profile, encoding="utf-8", newline="") as _the_file:
+        yield list(csv.DictReader(_the_file))
+
+
+class TestClassDatasetProfiler:
+    """
+        Attribution of the profiled operations to the test modules.
+    """
+    def test_fixture_operation_in_test_module(self, profile_records):
+        """
+            Test that an operation timed in a class-scoped fixture is recorded
+            under the test module and the dataset.
+        """
+        the_records = [_r for _r in profile_records
+                       if _r["operation"] == "fixture_operation"]
+        assert len(the_records) == 1, profile_records
+        assert the_records[0]["checker"] == "test_profiled"
+        assert the_records[0]["granule"] == "example.nc"
+
+    def test_call_operation_in_test_module(self, profile_records):
+        """
+            Test that an operation timed in the test call is recorded under
+            the test module and the dataset.
+        """
+        the_records = [_r for _r in profile_records
+                       if _r["operation"] == "call_operation"]
+        assert len(the_records) == 1, profile_records
+        assert the_records[0]["checker"] == "test_profiled"
+        assert the_records[0]["granule"] == "example.nc"
@@ -0,0 +1,97 @@
+"""
+    Format of a granule file from its signature bytes, used by the file
+    extension test with --dataset-extension-mode=signature.
+
+    The files are built from bytes: no GDAL and no dataset option is needed.
+"""
+import pytest
+
+from diwg_dataset.common.dataset_signature import DatasetSignature
+
+@pytest.fixture(scope="function")
+def write_granule(tmp_path):
+    """
+        Write the bytes of a granule file.
+        the_ret = write_granule("example.nc", b"CDF\\x01...") -> "/tmp/.../example.nc"
+    """
+    def the_write(filename:str, content:bytes)->str:
+        the_path = tmp_path / filename
+        the_path.write_bytes(content)
+        return str(the_path)
+    yield the_write
+
+
+class TestClassDatasetSignature:
+    """
+        Sniffing of the format of granule files.
+    """
+    def test_netcdf_classic(self, write_granule):
+        """
+            Test classic and 64-bit offset netCDF files.
+        """
+        for the_signature in (b"CDF\x01", b"CDF\x02", b"CDF\x05"):
+            the_file = write_granule("example.nc", the_signature + bytes(100))
+            the_ret = DatasetSignature().get_signature(the_file)
+            assert the_ret["driver_short_name"] == "netCDF"
+            assert the_ret["complete"]
+
+    def test_hdf4(self, write_granule):
+        """
+            Test an HDF4 file with an HDF-EOS 2 version.
+        """
+        the_file = write_granule(
+            "example.hdf",
+            DatasetSignature.hdf4_signature + bytes(100) + b"HDFEOS_V2.19" + bytes(10))
+        the_ret = DatasetSignature().get_signature(the_file)
+        assert the_ret["driver_short_name"] == "HDF4"
+        assert the_ret["HDFEOSVersion"] == "HDFEOS_V2.19"
+
+    def test_hdf5_user_block(self, write_granule):
+        """
+            Test an HDF5 file with the superblock after a 1024 bytes user block.
+        """
+        the_file = write_granule(
+            "example.h5",
+            bytes(1024) + DatasetSignature.hdf5_signature + bytes(100)
+            + b"HDFEOS_5.1.15" + bytes(10))
+        the_ret = DatasetSignature().get_signature(the_file)
+        assert the_ret["driver_short_name"] == "HDF5"
+        assert the_ret["HDFEOSVersion"] == "HDFEOS_5.1.15"
+        assert the_ret["complete"]
+
+    def test_netcdf4_marker_in_tail(self, write_granule):
+        """
+            Test a netCDF-4 file with _NCProperties after the bytes read at
+            the head of the file.
+        """
+        the_file = write_granule(
+            "example.nc",
+            DatasetSignature.hdf5_signature
+            + bytes(DatasetSignature.marker_bytes + 4096)
+            + DatasetSignature.netcdf4_marker + bytes(100))
+        the_ret = DatasetSignature().get_signature(the_file)
+        assert the_ret["driver_short_name"] == "netCDF"
+        assert the_ret["complete"]
+
+    def test_hdf5_without_marker(self, write_granule):
+        """
+            Test that an HDF5 file without any marker in the bytes read is not
+            reported as complete.
+        """
+        the_file = write_granule(
+            "example.h5",
+            DatasetSignature.hdf5_signature
+            + bytes(3 * DatasetSignature.marker_bytes)
+            + DatasetSignature.netcdf4_marker
+            + bytes(3 * DatasetSignature.marker_bytes))
+        the_ret = DatasetSignature().get_signature(the_file)
+        assert the_ret["driver_short_name"] == "HDF5"
+        assert not the_ret["complete"]
+
+    def test_not_recognized(self, write_granule):
+        """
+            Test a file in another format.
+        """
+        the_file = write_granule("example.txt", b"not a granule" + bytes(100))
+        the_ret = DatasetSignature().get_signature(the_file)
+        assert the_ret["driver_short_name"] == ""
@@ -4,11 +4,10 @@ Use the Units Attribute Only for Variables with Physical Units
 https://wiki.earthdata.nasa.gov/pages/viewpage.action?pageId=182296347
 
 """
-import re
 import json
 import pytest
-import cfunits
 
+from diwg_dataset.common.units_validation import UnitsValidation
 from diwg_dataset.metadata.dataset_variable_physical_units import (
     DatasetVariablePhysicalUnits)
 
@@ -42,8 +41,10 @@ def dataset(request):
     """
     #setup - class
     the_dataset_name=request.config.getoption("--dataset-name")
+    the_units_mode=request.config.getoption("--dataset-units-mode")
     the_dmp = DatasetVariablePhysicalUnits()
-    the_ret_dataset = the_dmp.get_variable_units(the_dataset_name)
+    the_ret_dataset = the_dmp.get_variable_units(
+        the_dataset_name, units_mode=the_units_mode)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -80,7 +81,7 @@ class TestClassDatasetVariableUnits:
         pass
 
     def test_variable_units(
-            self, dataset):
+            self, dataset, units_validation):
         """
             Test units of variables in a dataset following CF convention.
             Intermediate test_results: A list of failed test results where each test result is 
@@ -100,7 +101,7 @@ class TestClassDatasetVariableUnits:
             self._check_variable_units_1(
                 test_results,_the_var)
             self._check_variable_units_2(
-                test_results,_the_var)
+                test_results,_the_var,units_validation)
         _the_o = dict()
         _the_o["dataset_name"]=dataset["dataset_name"]
         _the_o["errors"]=test_results
@@ -135,13 +136,13 @@ class TestClassDatasetVariableUnits:
                 test_results.append(_the_o)
 
     def _check_variable_units_2(
-            self,test_results:list,variable:dict):
+            self,test_results:list,variable:dict,
+            units_validation:UnitsValidation):
         """
         Values of the units attribute should be supported by the UDUNITS-2 library.
         """
         for sunit in variable['units']:
-            _tu = cfunits.Units(sunit)
-            if not _tu.isvalid:
+            if not units_validation.is_valid(sunit):
                 _the_o = dict()
                 _the_o["variable_name"]=variable["fullname"]
                 _the_o["error"]=("Units attribute value is not supported by "
@@ -0,0 +1,125 @@
+"""
+    Batch analysis of granule filenames (--dataset-batch) against the checks
+    of the granules one by one, on the same dataset list.
+
+    The granules are only named in the list file: no dataset option is needed.
+"""
+import pytest
+
+from diwg_dataset.dataname.filename_dataset_batch_analysis import (
+    FilenameDatasetBatchAnalysis)
+from diwg_dataset.dataname.filename_dataset_collection_adopt_semantically_rich_dataset_release_identifiers import (
+    FilenameDatasetCollectionAdoptSemanticallyRichDatasetReleaseIdentifiers)
+from diwg_dataset.dataname.filename_dataset_collection_date_time_information_in_granule_filenames import (
+    FilenameDatasetCollectionDateTimeInformationInGranuleFilenames)
+from diwg_dataset.dataname.filename_dataset_collection_standardize_file_extensions import (
+    FilenameDatasetCollectionStandardizeFileExtensions)
+from diwg_dataset.dataname.filename_dataset_date_time_information_in_granule_filenames import (
+    FilenameDatasetDateTimeInformationInGranuleFilenames)
+
+# filenames with several, overlapping, or no date-time tokens
+batch_filenames = [
+    "DeepBlue-SeaWiFS_L2_20101210T135954Z_v004-20130525T172725Z.h5",
+    "SMAP_L4_SM_gph_20200915T193000_Vv5014_001.h5",
+    "SMAP_L4_SM_gph_20200915T223000_Vv5014.h5",
+    "no_date_in_filename.nc",
+    "MOD11A2.A2010344.h09v05.061.2021041221548.hdf",
+    "example_2010_v2.nc",
+    "3B-DAY.MS.MRG.3IMERG.20101210-S000000-E235959.V06.nc4",
+    "20101210_20101211.nc",
+]
+
+crid_patterns = {
+    "dataset_crid": r"V[a-z]?[0-9]+_?[0-9]*",
+    "dataset_crid_major": r"V(?P<major>[a-z]?[0-9]+)",
+    "dataset_crid_major_group": "major",
+    "dataset_crid_minor": r"_(?P<minor>[0-9]+)",
+    "dataset_crid_minor_group": "minor",
+    "dataset_crid_patch": r"(?P<patch>[0-9]+)$",
+    "dataset_crid_patch_group": "patch",
+}
+
+@pytest.fixture(scope="function")
+def dataset_name_listfile(tmp_path):
+    """
+        List file of the batch filenames under a directory.
+        the_ret = "/tmp/.../datacollection.lst"
+    """
+    the_names = [str(tmp_path / _f) for _f in batch_filenames]
+    the_list = tmp_path / "datacollection.lst"
+    the_list.write_text("\n".join(the_names) + "\n")
+    yield str(the_list)
+
+
+class TestClassFilenameDatasetBatchAnalysis:
+    """
+        Batch results against the results of the granules one by one.
+    """
+    def test_iso8601_tokens(self):
+        """
+            Test that the tokens detected in all the filenames together are
+            those detected in each filename.
+        """
+        the_batch = FilenameDatasetBatchAnalysis()
+        the_tokens = the_batch.get_iso8601_tokens(batch_filenames)
+        the_checker = FilenameDatasetDateTimeInformationInGranuleFilenames()
+        for the_row, the_filename in enumerate(batch_filenames):
+            the_info = the_checker.get_dataname_date_time_information(the_filename)
+            the_expected = [(_f["token"], _f["start"], _f["end"])
+                            for _f in the_info["temporal_extent"]
+                            + the_info["date_time_fields"]]
+            the_found = [
+                (the_tokens["token"][_i], the_tokens["start"][_i], the_tokens["end"][_i])
+                for _i, _r in enumerate(the_tokens["row"]) if _r == the_row]
+            assert the_found == the_expected, the_filename
+
+    def test_iso8601_tokens_rows(self):
+        """
+            Test the rows of the tokens of filenames without any token.
+        """
+        the_batch = FilenameDatasetBatchAnalysis()
+        the_filenames = ["no_date.nc", "no_date.nc", "example_20101210.nc", "no_date.nc"]
+        the_tokens = the_batch.get_iso8601_tokens(the_filenames)
+        assert the_tokens["row"] == [2]
+        assert the_tokens["token"] == ["20101210"]
+        assert the_batch.get_row_tokens(the_tokens, len(the_filenames)) == [
+            [], [], [(8, 16, 4)], []]
+
+    def test_date_time_information(self, dataset_name_listfile):
+        """
+            Test the date-time check of the collection in batch.
+        """
+        pytest.importorskip("dateutil")
+        the_dmp = FilenameDatasetCollectionDateTimeInformationInGranuleFilenames()
+        the_ret = the_dmp.get_validate_dataname_date_time_information(
+            dataset_name_listfile)
+        the_ret_batch = the_dmp.get_validate_dataname_date_time_information(
+            dataset_name_listfile, dataset_batch=True)
+        assert the_ret_batch == the_ret
+
+    def test_crid_partitions(self, dataset_name_listfile):
+        """
+            Test the CRID check of the collection in batch.
+        """
+        the_dmp = FilenameDatasetCollectionAdoptSemanticallyRichDatasetReleaseIdentifiers()
+        the_ret = the_dmp.validate_dataname_crid_partitions(
+            dataset_name_listfile, **crid_patterns)
+        the_ret_batch = the_dmp.validate_dataname_crid_partitions(
+            dataset_name_listfile, dataset_batch=True, **crid_patterns)
+        assert the_ret["datasets"]
+        assert the_ret_batch == the_ret
+
+    def test_extensions(self, tmp_path, dataset_name_listfile):
+        """
+            Test the extension check of the collection in batch, with the
+            format sniffed from the signature bytes.
+        """
+        pytest.importorskip("osgeo.gdal")
+        for _f in batch_filenames:
+            (tmp_path / _f).write_bytes(b"CDF\x01" + bytes(100))
+        the_dmp = FilenameDatasetCollectionStandardizeFileExtensions()
+        the_ret = the_dmp.get_dataname_extension(
+            dataset_name_listfile, extension_mode="signature")
+        the_ret_batch = the_dmp.get_dataname_extension(
+            dataset_name_listfile, extension_mode="signature", dataset_batch=True)
+        assert the_ret_batch == the_ret
@@ -3,7 +3,6 @@
 
     Partition filename and verify if all parts (major, minor, and patch) of crid exist.
 """
-import re
 import json
 import pytest
 
@@ -56,6 +55,10 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_dataset_batch=request.config.getoption("--dataset-batch")
     the_dataset_crid=request.config.getoption("--dataset-crid")
     the_dataset_crid_major=request.config.getoption("--dataset-crid-major")
     the_dataset_crid_major_group=request.config.getoption("--dataset-crid-major-group")
@@ -72,7 +75,11 @@ def dataset_collection(request):
         dataset_crid_minor=the_dataset_crid_minor,
         dataset_crid_minor_group=the_dataset_crid_minor_group,
         dataset_crid_patch=the_dataset_crid_patch,
-        dataset_crid_patch_group=the_dataset_crid_patch_group)
+        dataset_crid_patch_group=the_dataset_crid_patch_group,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        dataset_batch=the_dataset_batch)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -2,7 +2,6 @@
     Date-Time Information in Granule Filenames
 
 """
-import re
 import json
 import pytest
 
@@ -66,6 +65,10 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_dataset_batch=request.config.getoption("--dataset-batch")
     the_dataset_datetime=request.config.getoption("--dataset-datetime")
     the_dataset_datetime_group=request.config.getoption("--dataset-datetime-group")
     the_dataset_pdt=request.config.getoption("--dataset-pdt")
@@ -80,7 +83,11 @@ def dataset_collection(request):
         dataset_pdt=the_dataset_pdt,
         dataset_pdt_group=the_dataset_pdt_group,
         dataset_datetime_fields=the_dataset_datetime_fields,
-        dataset_datetime_fields_groups=the_dataset_datetime_fields_groups)
+        dataset_datetime_fields_groups=the_dataset_datetime_fields_groups,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        dataset_batch=the_dataset_batch)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -3,7 +3,6 @@
 
     https://wiki.earthdata.nasa.gov/display/ESDSWG/Ensure+Granule%27s+Filename+Uniqueness+Across+Different+Dataset+Releases
 """
-import re
 import json
 import pytest
 
@@ -45,6 +44,11 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_dataset_uniqueness_db=request.config.getoption("--dataset-uniqueness-db")
+    the_dataset_batch=request.config.getoption("--dataset-batch")
     the_dataset_identifier=request.config.getoption("--dataset-id")
     the_dataset_crid=request.config.getoption("--dataset-crid")
     the_dataset_datetime=request.config.getoption("--dataset-datetime")
@@ -55,7 +59,12 @@ def dataset_collection(request):
         dataset_id=the_dataset_identifier,
         dataset_crid=the_dataset_crid,
         dataset_datetime=the_dataset_datetime,
-        dataset_pdt=the_dataset_pdt)
+        dataset_pdt=the_dataset_pdt,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        dataset_uniqueness_db=the_dataset_uniqueness_db,
+        dataset_batch=the_dataset_batch)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -111,9 +120,12 @@ class TestClassFilenameDatasetCollectionEnsureGranuleFilenameUniqueness:
             _the_o["error"]=dataset_collection['error']
             _the_reason = json.dumps(_the_o)
             pytest.xfail(_the_reason)
+        _the_groups = dict()
+        for _the_group in dataset_collection.get("duplicate_groups", []):
+            _the_groups[_the_group["filename"]] = _the_group["dataset_names"]
         _test_results = list()
         for dataset in dataset_collection["datasets"]:
-            _the_result = self._process_one_dataset(dataset)
+            _the_result = self._process_one_dataset(dataset, _the_groups)
             if _the_result:
                 _test_results.append(_the_result)
         _the_o = dict()
@@ -123,7 +135,7 @@ class TestClassFilenameDatasetCollectionEnsureGranuleFilenameUniqueness:
         assert len(_test_results) == 0, text_except_message
 
 
-    def _process_one_dataset(self,dataset:dict)->dict:
+    def _process_one_dataset(self,dataset:dict, duplicate_groups:dict)->dict:
         """
             Test unique filename across different releases.
             Intermediate test_results: A list of failed test results where each test result is 
@@ -135,7 +147,7 @@ class TestClassFilenameDatasetCollectionEnsureGranuleFilenameUniqueness:
         if "error" in dataset:
             _the_dict = dict()
             _the_dict["error"]=dataset["error"]
-            _the_dict["dataset_name"]=dataset["path"]
+            _the_dict["dataset_name"]=dataset["dataset_name"]
             return _the_dict
         test_results = list()
         # test variable units
@@ -143,6 +155,10 @@ class TestClassFilenameDatasetCollectionEnsureGranuleFilenameUniqueness:
         _the_o["dataset_name"]=dataset["dataset_name"]
         _the_o["error"]=("Duplicated filename: "
                             + dataset['partition']['filename'])
+        _the_others = [k for k in duplicate_groups.get(
+            dataset['partition']['filename'], []) if k != dataset["dataset_name"]]
+        if _the_others:
+            _the_o["error"] += " - also in: " + ", ".join(_the_others)
         test_results.append(_the_o)
 
         _the_o = dict()
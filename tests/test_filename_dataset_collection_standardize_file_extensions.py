@@ -6,10 +6,8 @@
     verify if the dataset (granule) filename in a collection has proper extension.
 
 """
-import re
 import json
 import pytest
-import cfunits
 
 from diwg_dataset.dataname.filename_dataset_collection_standardize_file_extensions import (
     FilenameDatasetCollectionStandardizeFileExtensions)
@@ -52,8 +50,19 @@ def dataset_collection(request):
     """
     #setup - class
     the_dataset_collection_filename=request.config.getoption("--dataset-name-list")
+    the_dataset_workers=request.config.getoption("--dataset-workers")
+    the_dataset_cache=request.config.getoption("--dataset-cache")
+    the_dataset_cache_hash=request.config.getoption("--dataset-cache-hash")
+    the_extension_mode=request.config.getoption("--dataset-extension-mode")
+    the_dataset_batch=request.config.getoption("--dataset-batch")
     the_dmp = FilenameDatasetCollectionStandardizeFileExtensions()
-    the_ret_dataset = the_dmp.validate_dataname_extension(the_dataset_collection_filename)
+    the_ret_dataset = the_dmp.validate_dataname_extension(
+        the_dataset_collection_filename,
+        dataset_workers=the_dataset_workers,
+        dataset_cache=the_dataset_cache,
+        dataset_cache_hash=the_dataset_cache_hash,
+        extension_mode=the_extension_mode,
+        dataset_batch=the_dataset_batch)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
@@ -41,8 +41,10 @@ def dataset(request):
     """
     #setup - class
     the_dataset_name=request.config.getoption("--dataset-name")
+    the_extension_mode=request.config.getoption("--dataset-extension-mode")
     the_dmp = FilenameDatasetStandardizeFileExtensions()
-    the_ret_dataset = the_dmp.get_dataname_extension(the_dataset_name)
+    the_ret_dataset = the_dmp.get_dataname_extension(
+        the_dataset_name, extension_mode=the_extension_mode)
     # return the_database_name
     yield the_ret_dataset
     # teardown - class
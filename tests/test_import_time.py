@@ -0,0 +1,77 @@
+"""
+Start time of the compliance tests
+
+The test modules are imported by pytest at collection, even for the tests
+that are skipped or deselected. GDAL, NumPy, cfunits (UDUNITS-2) and
+dateparser must only be imported when a test uses them.
+"""
+import os
+import subprocess
+import sys
+import pytest
+
+# modules that must not be imported at collection
+heavy_modules = ("osgeo", "numpy", "cfunits", "dateparser", "dateutil")
+
+@pytest.fixture(scope="class")
+def import_time(request):
+    """
+        Import all the test modules in a new interpreter with
+        python -X importtime.
+        the_ret =
+            {
+                "budget": 0.5,
+                "seconds": 0.12,
+                "imported": ["tests", "tests.test_dataset_data_packing", ...]
+            }
+        seconds is the time spent importing the test modules and diwg_dataset,
+        after pytest.
+    """
+    the_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    the_modules = sorted(
+        f"tests.{os.path.splitext(_f)[0]}"
+        for _f in os.listdir(os.path.join(the_root, "tests"))
+        if _f.startswith("test_") and _f.endswith(".py"))
+    the_code = "import pytest\n" + "".join(f"import {_m}\n" for _m in the_modules)
+    the_proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", the_code],
+        cwd=the_root, capture_output=True, text=True, check=True)
+    the_ret = dict()
+    the_ret["budget"] = request.config.getoption("--import-time-budget")
+    the_ret["seconds"] = 0.0
+    the_ret["imported"] = list()
+    for the_line in the_proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not the_line.startswith("import time:") or "|" not in the_line:
+            continue
+        the_fields = the_line.split("|")
+        the_name = the_fields[2]
+        if not the_fields[1].strip().isdigit():
+            continue
+        the_ret["imported"].append(the_name.strip())
+        # top level imports only: the cumulative time includes the nested ones
+        if the_name.startswith(" ") and not the_name.startswith("  "):
+            if the_name.strip().split(".")[0] in ("tests", "diwg_dataset"):
+                the_ret["seconds"] += int(the_fields[1]) / 1e6
+    yield the_ret
+
+@pytest.mark.skip_import_time_budget_noneexistence
+class TestClassImportTime:
+    """
+        Start time of the compliance tests.
+    """
+    def test_heavy_modules_not_imported(self, import_time):
+        """
+            Test that no heavy dependency is imported with the test modules.
+        """
+        the_heavy = sorted({_m for _m in import_time["imported"]
+                            if _m.split(".")[0] in heavy_modules})
+        assert len(the_heavy) == 0, f"Imported at collection: {the_heavy}"
+
+    def test_import_time_within_budget(self, import_time):
+        """
+            Test that the test modules are imported within the budget.
+        """
+        assert import_time["seconds"] <= import_time["budget"], (
+            f"Test modules imported in {import_time['seconds']:.3f} s, "
+            f"budget {import_time['budget']:.3f} s")